@@ -0,0 +1,56 @@
+"""food_entries.updated_at, sync_tombstones and /sync indexes
+
+Revision ID: a9c4e2f7b1d3
+Revises: e1a7c3d9f5b2
+Create Date: 2026-10-17 09:41:12.603518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e2f7b1d3'
+down_revision: Union[str, Sequence[str], None] = 'e1a7c3d9f5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('food_entries', sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True))
+    # existing rows: last known change is their creation
+    op.execute("UPDATE food_entries SET updated_at = created_at WHERE created_at IS NOT NULL")
+
+    op.create_table('sync_tombstones',
+    sa.Column('tombstone_id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.String(length=128), nullable=False),
+    sa.Column('table_name', sa.String(length=32), nullable=False),
+    sa.Column('row_id', sa.String(length=36), nullable=False),
+    sa.Column('deleted_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('tombstone_id')
+    )
+    op.create_index('ix_sync_tombstones_user_table_deleted', 'sync_tombstones', ['user_id', 'table_name', 'deleted_at'], unique=False)
+
+    op.create_index('ix_food_entries_user_updated', 'food_entries', ['user_id', 'updated_at'], unique=False)
+    op.create_index('ix_weight_entries_user_updated', 'weight_entries', ['user_id', 'updated_at'], unique=False)
+    op.create_index('ix_workout_sessions_user_updated', 'workout_sessions', ['user_id', 'updated_at'], unique=False)
+    op.create_index('ix_exercise_entries_user_updated', 'exercise_entries', ['user_id', 'updated_at'], unique=False)
+    op.create_index('ix_recipes_user_updated', 'recipes', ['user_id', 'updated_at'], unique=False)
+    op.create_index('ix_meal_plans_user_updated', 'meal_plans', ['user_id', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_meal_plans_user_updated', table_name='meal_plans')
+    op.drop_index('ix_recipes_user_updated', table_name='recipes')
+    op.drop_index('ix_exercise_entries_user_updated', table_name='exercise_entries')
+    op.drop_index('ix_workout_sessions_user_updated', table_name='workout_sessions')
+    op.drop_index('ix_weight_entries_user_updated', table_name='weight_entries')
+    op.drop_index('ix_food_entries_user_updated', table_name='food_entries')
+
+    op.drop_index('ix_sync_tombstones_user_table_deleted', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    op.drop_column('food_entries', 'updated_at')
@@ -0,0 +1,94 @@
+"""food_payloads: provider payloads deduplicated by food_api_id
+
+Revision ID: b7d1f3a5c9e8
+Revises: a9c4e2f7b1d3
+Create Date: 2026-10-17 13:18:55.240917
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1f3a5c9e8'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e2f7b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('food_payloads',
+    sa.Column('food_api_id', sa.String(length=128), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('food_api_id')
+    )
+    # one payload per provider food (first row wins), then drop the copies
+    op.execute(
+        """
+        INSERT IGNORE INTO food_payloads (food_api_id, payload)
+        SELECT food_api_id, raw FROM food_entries
+        WHERE food_api_id IS NOT NULL AND raw IS NOT NULL AND JSON_TYPE(raw) <> 'NULL'
+        """
+    )
+    op.execute(
+        """
+        UPDATE food_entries e JOIN food_payloads p ON p.food_api_id = e.food_api_id
+        SET e.raw = NULL
+        WHERE e.raw IS NOT NULL
+        """
+    )
+
+    # recipe ingredients: same, row by row (JSON lists)
+    bind = op.get_bind()
+    recipes = sa.table('recipes', sa.column('recipe_id', sa.String), sa.column('ingredients', sa.JSON))
+    for recipe_id, ingredients in bind.execute(sa.select(recipes.c.recipe_id, recipes.c.ingredients)).all():
+        if isinstance(ingredients, str):
+            ingredients = json.loads(ingredients)
+        moved = False
+        for ing in ingredients or []:
+            if isinstance(ing, dict) and ing.get("food_api_id") and ing.get("raw") is not None:
+                bind.execute(
+                    sa.text("INSERT IGNORE INTO food_payloads (food_api_id, payload) VALUES (:id, :payload)"),
+                    {"id": str(ing["food_api_id"]), "payload": json.dumps(ing.pop("raw"))},
+                )
+                moved = True
+        if moved:
+            bind.execute(
+                recipes.update().where(recipes.c.recipe_id == recipe_id).values(ingredients=ingredients)
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        UPDATE food_entries e JOIN food_payloads p ON p.food_api_id = e.food_api_id
+        SET e.raw = p.payload
+        WHERE e.raw IS NULL
+        """
+    )
+    bind = op.get_bind()
+    payloads = {
+        r.food_api_id: r.payload
+        for r in bind.execute(sa.text("SELECT food_api_id, payload FROM food_payloads"))
+    }
+    recipes = sa.table('recipes', sa.column('recipe_id', sa.String), sa.column('ingredients', sa.JSON))
+    for recipe_id, ingredients in bind.execute(sa.select(recipes.c.recipe_id, recipes.c.ingredients)).all():
+        if isinstance(ingredients, str):
+            ingredients = json.loads(ingredients)
+        restored = False
+        for ing in ingredients or []:
+            payload = payloads.get(str(ing.get("food_api_id"))) if isinstance(ing, dict) else None
+            if payload is not None and "raw" not in ing:
+                ing["raw"] = json.loads(payload) if isinstance(payload, str) else payload
+                restored = True
+        if restored:
+            bind.execute(
+                recipes.update().where(recipes.c.recipe_id == recipe_id).values(ingredients=ingredients)
+            )
+    op.drop_table('food_payloads')
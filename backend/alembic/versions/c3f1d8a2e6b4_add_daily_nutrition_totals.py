@@ -0,0 +1,50 @@
+"""add daily_nutrition_totals
+
+Revision ID: c3f1d8a2e6b4
+Revises: b5a21c54a3c3
+Create Date: 2026-10-16 10:12:41.418263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1d8a2e6b4'
+down_revision: Union[str, Sequence[str], None] = 'b5a21c54a3c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_nutrition_totals',
+    sa.Column('user_id', sa.String(length=128), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('calories', sa.Integer(), nullable=False),
+    sa.Column('protein_g', sa.Float(), nullable=False),
+    sa.Column('carbs_g', sa.Float(), nullable=False),
+    sa.Column('fats_g', sa.Float(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('user_id', 'date')
+    )
+    # backfill from existing entries
+    op.execute(
+        """
+        INSERT INTO daily_nutrition_totals
+            (user_id, date, calories, protein_g, carbs_g, fats_g, entry_count)
+        SELECT user_id, date,
+               COALESCE(SUM(calories), 0), COALESCE(SUM(protein_g), 0),
+               COALESCE(SUM(carbs_g), 0), COALESCE(SUM(fats_g), 0), COUNT(*)
+        FROM food_entries
+        GROUP BY user_id, date
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_nutrition_totals')
@@ -0,0 +1,52 @@
+"""foods catalog and food_entries.food_id
+
+Revision ID: c5e8a1d4f2b6
+Revises: b7d1f3a5c9e8
+Create Date: 2026-10-17 16:07:31.852049
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a1d4f2b6'
+down_revision: Union[str, Sequence[str], None] = 'b7d1f3a5c9e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('foods',
+    sa.Column('food_id', sa.String(length=36), nullable=False),
+    sa.Column('source', sa.String(length=16), nullable=False),
+    sa.Column('source_id', sa.String(length=255), nullable=False),
+    sa.Column('user_id', sa.String(length=128), nullable=True),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('name_key', sa.String(length=255), nullable=False),
+    sa.Column('brand', sa.String(length=255), nullable=True),
+    sa.Column('ref_quantity', sa.Float(), nullable=False),
+    sa.Column('ref_unit', sa.String(length=32), nullable=False),
+    sa.Column('calories', sa.Float(), nullable=True),
+    sa.Column('protein_g', sa.Float(), nullable=True),
+    sa.Column('carbs_g', sa.Float(), nullable=True),
+    sa.Column('fats_g', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('food_id')
+    )
+    op.create_index('ix_foods_source_source_id', 'foods', ['source', 'source_id'], unique=True)
+    op.create_index('ix_foods_name_key', 'foods', ['name_key'], unique=False)
+    op.add_column('food_entries', sa.Column('food_id', sa.String(length=36), nullable=True))
+    # catalog rows for foods already logged (and entry links) come from
+    # food_payloads: python -m app.services.food_catalog
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('food_entries', 'food_id')
+    op.drop_index('ix_foods_name_key', table_name='foods')
+    op.drop_index('ix_foods_source_source_id', table_name='foods')
+    op.drop_table('foods')
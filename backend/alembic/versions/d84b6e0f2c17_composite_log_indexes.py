@@ -0,0 +1,56 @@
+"""composite (user_id, date) indexes on log tables
+
+Revision ID: d84b6e0f2c17
+Revises: c3f1d8a2e6b4
+Create Date: 2026-10-16 11:03:27.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd84b6e0f2c17'
+down_revision: Union[str, Sequence[str], None] = 'c3f1d8a2e6b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # composites first so no query is left without an index in between
+    op.create_index('ix_food_entries_user_date_meal', 'food_entries', ['user_id', 'date', 'meal_type'], unique=False)
+    op.create_index('ix_food_entries_user_date_consumed', 'food_entries', ['user_id', 'date', 'consumed_at'], unique=False)
+    op.create_index('ix_weight_entries_user_date', 'weight_entries', ['user_id', sa.text('date DESC')], unique=False)
+    op.create_index('ix_workout_sessions_user_date', 'workout_sessions', ['user_id', 'date'], unique=False)
+    op.create_index('ix_exercise_entries_session_user_created', 'exercise_entries', ['session_id', 'user_id', 'created_at'], unique=False)
+
+    # single-column indexes now covered by a composite prefix (or never used alone)
+    op.drop_index(op.f('ix_food_entries_user_id'), table_name='food_entries')
+    op.drop_index(op.f('ix_food_entries_date'), table_name='food_entries')
+    op.drop_index(op.f('ix_food_entries_meal_type'), table_name='food_entries')
+    op.drop_index(op.f('ix_weight_entries_user_id'), table_name='weight_entries')
+    op.drop_index(op.f('ix_weight_entries_date'), table_name='weight_entries')
+    op.drop_index(op.f('ix_workout_sessions_user_id'), table_name='workout_sessions')
+    op.drop_index(op.f('ix_workout_sessions_date'), table_name='workout_sessions')
+    op.drop_index(op.f('ix_exercise_entries_session_id'), table_name='exercise_entries')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_exercise_entries_session_id'), 'exercise_entries', ['session_id'], unique=False)
+    op.create_index(op.f('ix_workout_sessions_date'), 'workout_sessions', ['date'], unique=False)
+    op.create_index(op.f('ix_workout_sessions_user_id'), 'workout_sessions', ['user_id'], unique=False)
+    op.create_index(op.f('ix_weight_entries_date'), 'weight_entries', ['date'], unique=False)
+    op.create_index(op.f('ix_weight_entries_user_id'), 'weight_entries', ['user_id'], unique=False)
+    op.create_index(op.f('ix_food_entries_meal_type'), 'food_entries', ['meal_type'], unique=False)
+    op.create_index(op.f('ix_food_entries_date'), 'food_entries', ['date'], unique=False)
+    op.create_index(op.f('ix_food_entries_user_id'), 'food_entries', ['user_id'], unique=False)
+
+    op.drop_index('ix_exercise_entries_session_user_created', table_name='exercise_entries')
+    op.drop_index('ix_workout_sessions_user_date', table_name='workout_sessions')
+    op.drop_index('ix_weight_entries_user_date', table_name='weight_entries')
+    op.drop_index('ix_food_entries_user_date_consumed', table_name='food_entries')
+    op.drop_index('ix_food_entries_user_date_meal', table_name='food_entries')
@@ -0,0 +1,40 @@
+"""add event_outbox
+
+Revision ID: e1a7c3d9f5b2
+Revises: d84b6e0f2c17
+Create Date: 2026-10-16 13:20:05.271904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c3d9f5b2'
+down_revision: Union[str, Sequence[str], None] = 'd84b6e0f2c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_outbox',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('event_type', sa.String(length=64), nullable=False),
+    sa.Column('aggregate_id', sa.String(length=128), nullable=True),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    # users_projection.last_event_at is compared against sub-second write fences
+    sa.Column('created_at', sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql'), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.String(length=1024), nullable=True),
+    sa.Column('parked_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_outbox')
@@ -1,12 +1,22 @@
-from fastapi import Depends
+from datetime import date
+from functools import lru_cache
+import hashlib
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.services.dashboard_service import DashboardService
+from app.core.config import settings
+from app.core.database import get_async_db, get_db, get_mongo_db
+from app.services.dashboard_read_model import DashboardReadModel
+from app.services.dashboard_service import AsyncDashboardService, DashboardService
+from app.services.diary_service import AsyncDiaryService
 from app.services.food_service import FoodAPIClient
-from app.services.food_log_service import FoodLogService
+from app.services.food_log_service import AsyncFoodLogService, FoodLogService
 from app.services.meal_service import MealService
+from app.services.meal_snap_analyzer import MealSnapAnalyzer
 from app.services.nutrition_service import NutritionService
 from app.services.onboarding_service import OnboardingService
+from app.services.response_cache import get_response_cache
+from app.services.user_read_model import UserReadModel
 from app.services.user_service import UserService
 from app.services.weight_service import WeightService
 from app.auth.deps import Principal, get_current_user
@@ -20,6 +30,13 @@ def get_onboarding_service(db: Session = Depends(get_db)) -> OnboardingService:
     """Dependency to get the OnboardingService instance."""
     return OnboardingService(db)
 
+def get_user_read_model(
+    user_service: UserService = Depends(get_user_service),
+    onboarding_service: OnboardingService = Depends(get_onboarding_service),
+) -> UserReadModel:
+    """users_projection-backed reads with MySQL fallback (Mongo resolved lazily)."""
+    return UserReadModel(get_mongo_db, user_service, onboarding_service)
+
 def get_nutrition_service(db: Session = Depends(get_db)) -> NutritionService:
     """Dependency to get the NutritionService instance."""
     return NutritionService(db)
@@ -44,9 +61,73 @@ def get_dashboard_service(db: Session = Depends(get_db)) -> DashboardService:
 def get_meal_service(db: Session = Depends(get_db)) -> MealService:
     return MealService(db)
 
+# --- async (AsyncSession) variants for the hot read/log paths ---
+def get_async_food_log_service(db: AsyncSession = Depends(get_async_db)) -> AsyncFoodLogService:
+    return AsyncFoodLogService(db)
+
+def get_async_dashboard_service(db: AsyncSession = Depends(get_async_db)) -> AsyncDashboardService:
+    return AsyncDashboardService(db)
+
+def get_dashboard_read_model() -> DashboardReadModel:
+    """dashboards-backed home reads (Mongo resolved lazily; None = use SQL)."""
+    return DashboardReadModel(get_mongo_db)
+
+def get_async_diary_service(db: AsyncSession = Depends(get_async_db)) -> AsyncDiaryService:
+    return AsyncDiaryService(db)
+
+@lru_cache(maxsize=1)
+def get_meal_snap_analyzer() -> MealSnapAnalyzer:
+    """One analyzer (genai client + concurrency slots) per process."""
+    return MealSnapAnalyzer(
+        api_key=settings.GEMINI_API_KEY,
+        max_concurrency=settings.SNAP_MAX_CONCURRENCY,
+        attempt_timeout=settings.SNAP_ATTEMPT_TIMEOUT_S,
+        queue_timeout=settings.SNAP_QUEUE_TIMEOUT_S,
+    )
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # weak comparison: W/"x" matches "x"
+    wanted = etag.removeprefix("W/")
+    return any(
+        tag.strip() == "*" or tag.strip().removeprefix("W/") == wanted
+        for tag in if_none_match.split(",")
+    )
+
+def user_etag(
+    request: Request,
+    response: Response,
+    user: Principal = Depends(get_current_user),
+) -> str | None:
+    """
+    Conditional GET for per-user reads. The ETag hashes the user's data version
+    (bumped on every committed write, see response_cache) with the URL and
+    today's date (several endpoints default to today). A matching
+    If-None-Match ends the request with 304 before any aggregation runs.
+
+    Only emitted when the version store is shared by every worker (redis): with
+    the per-process "local" backend another worker's write wouldn't change this
+    worker's version, and it would answer 304 on stale data.
+    """
+    cache = get_response_cache()
+    if not cache.shared:
+        return None
+    version = cache.data_version(user.uid)
+    if version is None:
+        return None
+    seed = f"{version}:{date.today().isoformat()}:{request.url.path}?{request.url.query}"
+    etag = f'W/"{hashlib.blake2b(seed.encode(), digest_size=12).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return etag
+
 __all__ = [
     "get_user_service",
     "get_onboarding_service",
+    "get_user_read_model",
     "get_nutrition_service",
     "get_food_service",
     "get_food_log_service",
@@ -54,7 +135,14 @@ __all__ = [
     "get_workout_service",
     "get_dashboard_service",
     "get_meal_service",
+    "get_async_food_log_service",
+    "get_async_dashboard_service",
+    "get_dashboard_read_model",
+    "get_async_diary_service",
+    "get_meal_snap_analyzer",
+    "user_etag",
     "get_db",
+    "get_async_db",
     "Principal",
     "get_current_user",
 ]
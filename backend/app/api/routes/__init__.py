@@ -14,3 +14,5 @@ from .progress import router as progress_router
 from .diary import router as diary_router
 from .meal_plans import router as meal_plans_router
 from .snap_meal import router as snap_meal_router
+from .export import router as export_router
+from .sync import router as sync_router
@@ -1,11 +1,16 @@
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from starlette.concurrency import run_in_threadpool
 
 from app.auth.deps import Principal, get_current_user
-from app.api.deps import get_dashboard_service
-from app.services.dashboard_service import DashboardService
+from app.api.deps import get_async_dashboard_service, get_dashboard_read_model, get_dashboard_service, user_etag
+from app.services.dashboard_read_model import DashboardReadModel
+from app.services.user_read_model import MYSQL, PROJECTION
+from app.services.dashboard_service import AsyncDashboardService, DashboardService, home_stage_timer
 
-router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+# every route is a per-user GET: conditional on the user's data version
+router = APIRouter(prefix="/dashboard", tags=["dashboard"], dependencies=[Depends(user_etag)])
 
 
 @router.get("/", summary="Daily dashboard (targets + intake + progress)")
@@ -21,47 +26,66 @@ def daily_dashboard(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/home")
-def get_home_dashboard(
+async def get_home_dashboard(
+    response: Response,
     user: Principal = Depends(get_current_user),
-    svc: DashboardService = Depends(get_dashboard_service),
+    svc: AsyncDashboardService = Depends(get_async_dashboard_service),
+    read_model: DashboardReadModel = Depends(get_dashboard_read_model),
 ):
-    try:
-        return svc.get_home_dashboard(user.uid)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    timer = home_stage_timer()
+    with timer.stage("projection"):
+        data = await run_in_threadpool(read_model.get_home, user.uid)
+    source = PROJECTION
+    if data is None:
+        source = MYSQL
+        try:
+            data = await svc.get_home_dashboard(user.uid, timer=timer)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e), headers={"X-Read-Source": source})
+    # per-stage DB timings, visible in browser devtools
+    response.headers["Server-Timing"] = timer.server_timing()
+    response.headers["X-Read-Source"] = source
+    if source == PROJECTION:
+        # the projection may trail writes made through other workers; don't
+        # let a client pin that under the current version
+        for header in ("ETag", "Cache-Control"):
+            if header in response.headers:
+                del response.headers[header]
+    return data
 
 @router.get("/weekly", summary="Weekly summary for last completed week (Mon-Sun) or specified week_start (YYYY-MM-DD = monday)")
-def weekly_dashboard(
+async def weekly_dashboard(
     week_start: date | None = Query(None, description="Monday of the week to fetch. If omitted returns last completed week."),
     user: Principal = Depends(get_current_user),
-    svc: DashboardService = Depends(get_dashboard_service),
+    svc: AsyncDashboardService = Depends(get_async_dashboard_service),
 ):
     try:
-        return svc.get_weekly_summary(user.uid, week_monday=week_start)
+        return await svc.get_weekly_summary(user.uid, week_monday=week_start)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/monthly", summary="Monthly summary for last completed month or specified month_start")
-def monthly_dashboard(
+async def monthly_dashboard(
     month_start: date | None = Query(None, description="Any date in the month to fetch (YYYY-MM-DD). If omitted returns last completed month."),
     user: Principal = Depends(get_current_user),
-    svc: DashboardService = Depends(get_dashboard_service),
+    svc: AsyncDashboardService = Depends(get_async_dashboard_service),
 ):
     try:
-        return svc.get_monthly_summary(user.uid, month_start=month_start)
+        return await svc.get_monthly_summary(user.uid, month_start=month_start)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/timeseries", summary="Arbitrary time-series for range (charting)")
-def timeseries(
+async def timeseries(
     start: date = Query(..., description="Start date (YYYY-MM-DD)"),
     end: date = Query(..., description="End date (YYYY-MM-DD)"),
+    layout: Literal["rows", "columns"] = Query("rows", description="rows: one object per day; columns: parallel per-day arrays with rolling means and weight trend"),
     user: Principal = Depends(get_current_user),
-    svc: DashboardService = Depends(get_dashboard_service),
+    svc: AsyncDashboardService = Depends(get_async_dashboard_service),
 ):
     try:
-        return svc.get_time_series(user.uid, start, end)
+        return await svc.get_time_series(user.uid, start, end, layout=layout)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,22 +1,21 @@
 from datetime import date
 from fastapi import APIRouter, Depends, Query, HTTPException
 
-from app.api.deps import get_db
+from app.api.deps import get_async_diary_service, user_etag
 from app.auth.deps import get_current_user, Principal
-from app.services.diary_service import DiaryService
+from app.services.diary_service import AsyncDiaryService
 
-router = APIRouter(prefix="/diary", tags=["diary"])
+router = APIRouter(prefix="/diary", tags=["diary"], dependencies=[Depends(user_etag)])
 
 
 @router.get("")
-def get_diary(
+async def get_diary(
     diary_date: date | None = Query(default=None, alias="date"),
     user: Principal = Depends(get_current_user),
-    db = Depends(get_db),
+    svc: AsyncDiaryService = Depends(get_async_diary_service),
 ):
     try:
-        svc = DiaryService(db)
-        return svc.get_daily_diary(
+        return await svc.get_daily_diary(
             user.uid,
             diary_date or date.today(),
         )
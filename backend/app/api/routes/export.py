@@ -0,0 +1,27 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.auth.deps import get_current_user, Principal
+from app.core.database import AsyncSessionLocal
+from app.services.export_service import EXPORT_FORMATS, stream_export
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+@router.get("/{kind}")
+async def export_history(
+    kind: Literal["food", "weights", "workouts"],
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    start: date | None = Query(None, description="YYYY-MM-DD, inclusive"),
+    end: date | None = Query(None, description="YYYY-MM-DD, inclusive"),
+    user: Principal = Depends(get_current_user),
+):
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must be <= end")
+    return StreamingResponse(
+        stream_export(AsyncSessionLocal, kind, user.uid, format, start, end),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="macromate-{kind}.{format}"'},
+    )
@@ -1,21 +1,44 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.services.food_service import FoodAPIClient
+from app.api.deps import get_async_db
+from app.services import food_catalog
+from app.services.food_service import FoodAPIClient, FoodNotFoundError
 from app.auth.deps import Principal, get_current_user
 
 router = APIRouter(prefix="/foods", tags=["foods"])
 food_api = FoodAPIClient()
 
 @router.get("/search")
-def search_foods(q: str = Query(..., min_length=1), page: int = 1, page_size: int = 25, user: Principal = Depends(get_current_user)):
+async def search_foods(q: str = Query(..., min_length=1), page: int = 1, page_size: int = 25, user: Principal = Depends(get_current_user)):
     try:
-        return food_api.search(q, page=page, page_size=page_size)
+        return await food_api.asearch(q, page=page, page_size=page_size)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Food API error: {e}")
 
+@router.get("/catalog/search")
+async def search_catalog(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=50),
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Foods already looked up, or recognised in the user's photos (the local catalog): no provider call."""
+    foods = await food_catalog.asearch(db, q, user.uid, limit)
+    return {"count": len(foods), "items": foods}
+
 @router.get("/{food_id}")
-def food_details(food_id: str, user: Principal = Depends(get_current_user)):
+async def food_details(food_id: str, user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     try:
-        return food_api.get_details(food_id)
+        details = await food_api.aget_details(food_id)
+    except FoodNotFoundError:
+        raise HTTPException(status_code=404, detail="Food not found")
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Food API error: {e}")
+
+    row = food_catalog.provider_row(details)
+    if row is None:
+        return details
+    await food_catalog.astore_foods(db, [row])
+    await db.commit()
+    return {**details, "food_id": row["food_id"]}
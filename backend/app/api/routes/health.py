@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy import text
+import hmac
 import logging
 import os
 
 from app.core.config import settings
 from app.core.database import get_db, get_mongo_db, get_mongo_client
+from app.core.metrics import collect
 # from app.auth.firebase import init_firebase
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,23 @@ def health_check():
     """Simple liveness check — process is up."""
     return {"status": "ok", "env": settings.APP_ENV}
 
+def require_metrics_token(token: str = Header(default="", alias="X-Metrics-Token")) -> None:
+    """Internal-only guard: metrics expose SQL / Mongo error text and pool internals."""
+    expected = settings.METRICS_TOKEN.get_secret_value() if settings.METRICS_TOKEN else ""
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid metrics token")
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_token)])
+def metrics():
+    """
+    In-process counters and latencies (DB pool checkouts per route, etc.).
+    Values are per worker process and reset on restart.
+    Internal only: requires the METRICS_TOKEN setting in an X-Metrics-Token header.
+    """
+    return collect()
+
 @router.get("/ready")
 def readiness_check(db = Depends(get_db)):
     """
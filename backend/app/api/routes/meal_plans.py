@@ -4,6 +4,7 @@ from datetime import date
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from app.api.deps import user_etag
 from app.auth.deps import get_current_user, Principal
 from app.services.meal_plan_service import MealPlanService
 from app.core.database import get_db
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/meal-plans", tags=["meal-plans"])
 class MealPlanGenerateIn(BaseModel):
     days: int = Field(..., ge=1, le=14)
 
-@router.get("")
+@router.get("", dependencies=[Depends(user_etag)])
 def get_all_meal_plans(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
@@ -21,7 +22,7 @@ def get_all_meal_plans(
     svc = MealPlanService(db)
     return svc.get_all_meal_plans(user.uid)
 
-@router.get("/{plan_id}")
+@router.get("/{plan_id}", dependencies=[Depends(user_etag)])
 def get_meal_plan(
     plan_id: str,
     db: Session = Depends(get_db),
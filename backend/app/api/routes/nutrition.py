@@ -1,95 +1,14 @@
 import datetime as dt
-from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
-from pydantic import BaseModel, Field, field_validator
-from app.api.deps import get_food_log_service, get_nutrition_service, get_user_service
+from app.api.deps import get_async_food_log_service, get_food_log_service, get_nutrition_service, get_user_service, user_etag
 from app.auth.deps import Principal, get_current_user
-from app.services.food_log_service import FoodLogService, NotFoundError
+from app.schemas.nutrition import BulkLogRequest, LogRequest, UpdateEntryPayload
+from app.services.food_log_service import AsyncFoodLogService, FoodLogService, NotFoundError
 from app.services.nutrition_service import NutritionService
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/nutrition", tags=["nutrition"])
 
-# -----------------------
-# Validation / Schemas
-# -----------------------
-ALLOWED_MEAL_TYPES = {"breakfast", "lunch", "dinner", "snack"}
-
-ALLOWED_UNITS = {"g", "ml", "piece", "slice", "cup", "oz"}
-
-class FoodItemIn(BaseModel):
-    food_api_id: str | None = None
-    name: str
-    brand: str | None = None
-    quantity: float | None = None
-    unit: str | None = None
-    calories: int | None = None
-    protein_g: float | None = None
-    carbs_g: float | None = None
-    fats_g: float | None = None
-    raw: Any | None = None
-
-    @field_validator("quantity", "calories", "protein_g", "carbs_g", "fats_g", mode="before")
-    def non_negative(cls, v):
-        if v is None:
-            return None
-        try:
-            num = float(v)
-        except Exception:
-            raise ValueError("must be a number")
-        if num < 0:
-            raise ValueError("must be >= 0")
-        # calories should be int
-        return int(num) if isinstance(v, int) or (isinstance(v, float) and v.is_integer()) and cls.__name__ == "FoodItemIn" and False else num
-
-    @field_validator("unit")
-    def check_unit(cls, v):
-        if v is None:
-            return None
-        if v not in ALLOWED_UNITS:
-            raise ValueError(f"unit must be one of {sorted(ALLOWED_UNITS)}")
-        return v
-
-class LogRequest(BaseModel):
-    date: dt.date | None = None
-    meal_type: str = Field(..., description="breakfast|lunch|dinner|snack")
-    consumed_at: dt.datetime | None = None
-    foods: list[FoodItemIn]
-
-    @field_validator("meal_type")
-    def validate_meal_type(cls, v):
-        if v not in ALLOWED_MEAL_TYPES:
-            raise ValueError(f"meal_type must be one of {sorted(ALLOWED_MEAL_TYPES)}")
-        return v
-
-class UpdateEntryPayload(BaseModel):
-    quantity: float | None = None
-    unit: str | None = None
-    calories: int | None = None
-    protein_g: float | None = None
-    carbs_g: float | None = None
-    fats_g: float | None = None
-    food_name: str | None = None
-    brand: str | None = None
-    consumed_at: dt.datetime | None = None
-    meal_type: str | None = None
-    date: dt.datetime | None = None
-
-    @field_validator("unit")
-    def check_unit(cls, v):
-        if v is None:
-            return v
-        if v not in ALLOWED_UNITS:
-            raise ValueError(f"unit must be one of {sorted(ALLOWED_UNITS)}")
-        return v
-
-    @field_validator("meal_type")
-    def check_meal_type(cls, v):
-        if v is None:
-            return v
-        if v not in ALLOWED_MEAL_TYPES:
-            raise ValueError(f"meal_type must be one of {sorted(ALLOWED_MEAL_TYPES)}")
-        return v
 
 # -----------------------
 # Endpoints
@@ -105,47 +24,90 @@ def get_daily_nutrition(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/log", status_code=201)
-def log_foods(
+async def log_foods(
     payload: LogRequest,
     user: Principal = Depends(get_current_user),
-    svc: FoodLogService = Depends(get_food_log_service),
+    svc: AsyncFoodLogService = Depends(get_async_food_log_service),
 ):
     day = payload.date or dt.datetime.utcnow().date()
-    created = svc.add_food_entries(user.uid, day, payload.meal_type, [f.dict() for f in payload.foods], payload.consumed_at)
+    try:
+        created = await svc.add_food_entries(user.uid, day, payload.meal_type, [f.dict() for f in payload.foods], payload.consumed_at)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"ok": True, "created": created}
 
+@router.post("/logs/bulk", status_code=201)
+async def bulk_log_foods(
+    payload: BulkLogRequest,
+    user: Principal = Depends(get_current_user),
+    svc: AsyncFoodLogService = Depends(get_async_food_log_service),
+):
+    """Many meals / days in one request (offline sync, imports from other trackers)."""
+    today = dt.datetime.utcnow().date()
+    meals = [
+        {
+            "date": m.date or today,
+            "meal_type": m.meal_type,
+            "consumed_at": m.consumed_at,
+            "foods": [f.model_dump() for f in m.foods],
+        }
+        for m in payload.meals
+    ]
+    try:
+        return {"ok": True, **await svc.ingest_meals(user.uid, meals)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/logs")
-def list_logs(
+async def list_logs(
     day: dt.date = Query(None, description="YYYY-MM-DD; defaults to today if omitted"),
     limit: int = Query(100, ge=0, le=500),
     offset: int = Query(0, ge=0),
     user: Principal = Depends(get_current_user),
-    svc: FoodLogService = Depends(get_food_log_service),
+    svc: AsyncFoodLogService = Depends(get_async_food_log_service),
 ):
     day_val = day or dt.datetime.utcnow().date()
-    rows = svc.get_entries_by_day(user.uid, day_val, limit=limit, offset=offset)
+    rows = await svc.get_entries_by_day(user.uid, day_val, limit=limit, offset=offset)
     return {"date": day_val.isoformat(), "count": len(rows), "items": rows}
 
+@router.get("/history")
+async def list_history(
+    start: dt.date | None = Query(None, description="YYYY-MM-DD, inclusive"),
+    end: dt.date | None = Query(None, description="YYYY-MM-DD, inclusive"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    user: Principal = Depends(get_current_user),
+    svc: AsyncFoodLogService = Depends(get_async_food_log_service),
+):
+    """Entries over any range, oldest (or newest) first, one page per request."""
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must be <= end")
+    try:
+        return await svc.list_entries(user.uid, start, end, limit=limit, cursor=cursor, descending=order == "desc")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/log/{entry_id}")
-def get_log_entry(
+async def get_log_entry(
     entry_id: str = Path(..., min_length=1),
     user: Principal = Depends(get_current_user),
-    svc: FoodLogService = Depends(get_food_log_service),
+    svc: AsyncFoodLogService = Depends(get_async_food_log_service),
 ):
-    entry = svc.get_entry(entry_id, user.uid)
+    entry = await svc.get_entry(entry_id, user.uid)
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     return entry
 
 @router.patch("/log/{entry_id}")
-def update_log_entry(
+async def update_log_entry(
     entry_id: str,
     payload: UpdateEntryPayload,
     user: Principal = Depends(get_current_user),
-    svc: FoodLogService = Depends(get_food_log_service),
+    svc: AsyncFoodLogService = Depends(get_async_food_log_service),
 ):
     try:
-        updated = svc.update_entry(entry_id, user.uid, payload.model_dump(exclude_unset=True))
+        updated = await svc.update_entry(entry_id, user.uid, payload.model_dump(exclude_unset=True))
         return {"ok": True, "updated": updated}
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Entry not found")
@@ -155,13 +117,13 @@ def update_log_entry(
         raise HTTPException(status_code=500, detail="Failed to update entry")
 
 @router.delete("/log/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_log_entry(
+async def delete_log_entry(
     entry_id: str,
     user: Principal = Depends(get_current_user),
-    svc: FoodLogService = Depends(get_food_log_service),
+    svc: AsyncFoodLogService = Depends(get_async_food_log_service),
 ):
     try:
-        svc.delete_entry(entry_id, user.uid)
+        await svc.delete_entry(entry_id, user.uid)
         return {} # 204 will have no body
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Entry not found")
@@ -169,7 +131,7 @@ def delete_log_entry(
         raise HTTPException(status_code=500, detail="Failed to delete entry")
 
 
-@router.get("/summary")
+@router.get("/summary", dependencies=[Depends(user_etag)])
 def get_daily_summary(
     day: dt.date | None = Query(..., description="Date in YYYY-MM-DD"),
     user: Principal = Depends(get_current_user),
@@ -187,8 +149,9 @@ def get_daily_summary(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/weekly")
+@router.get("/weekly", dependencies=[Depends(user_etag)])
 def weekly_summary(
+    items: bool = Query(False, description="Include the individual food entries per day"),
     user: Principal = Depends(get_current_user),
     user_svc: UserService = Depends(get_user_service),
     food_log_svc: FoodLogService = Depends(get_food_log_service),
@@ -203,10 +166,11 @@ def weekly_summary(
     start = start_of_this_week - dt.timedelta(days=7)
     end = start + dt.timedelta(days=6)
 
-    return food_log_svc.get_range_summary(user.uid, start, end, user_data.onboarding_summary)
+    return food_log_svc.get_range_summary(user.uid, start, end, user_data.onboarding_summary, include_items=items)
 
-@router.get("/monthly")
+@router.get("/monthly", dependencies=[Depends(user_etag)])
 def monthly_summary(
+    items: bool = Query(False, description="Include the individual food entries per day"),
     user: Principal = Depends(get_current_user),
     user_svc: UserService = Depends(get_user_service),
     food_log_svc: FoodLogService = Depends(get_food_log_service),
@@ -222,7 +186,7 @@ def monthly_summary(
     start = last_day_prev_month.replace(day=1)
     end = last_day_prev_month
 
-    return food_log_svc.get_range_summary(user.uid, start, end, user_data.onboarding_summary)
+    return food_log_svc.get_range_summary(user.uid, start, end, user_data.onboarding_summary, include_items=items)
 
 @router.get("/dashboard")
 def get_dashboard(
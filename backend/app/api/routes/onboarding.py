@@ -1,10 +1,11 @@
 from typing import Any
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
 from pydantic import BaseModel
 
-from app.api.deps import get_onboarding_service, get_user_service
+from app.api.deps import get_onboarding_service, get_user_read_model, get_user_service
 from app.auth.deps import Principal, get_current_user
 from app.services.onboarding_service import OnboardingService
+from app.services.user_read_model import UserReadModel
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/onboarding", tags=["onboarding"])
@@ -26,11 +27,14 @@ class GenericPayload(BaseModel):
     data: dict[str, Any] = {}
 
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_progress(
+def get_progress(
+    response: Response,
     user: Principal = Depends(get_current_user),
-    svc: OnboardingService = Depends(get_onboarding_service)
+    read_model: UserReadModel = Depends(get_user_read_model)
 ):
-    return svc.get_progress(user.uid)
+    progress, source = read_model.get_onboarding_progress(user.uid)
+    response.headers["X-Read-Source"] = source
+    return progress
 
 @router.patch("/step/{step_name}", status_code=status.HTTP_200_OK)
 def save_step(
@@ -1,34 +1,71 @@
+import logging
+
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.api.deps import get_async_db, get_meal_snap_analyzer
 from app.auth.deps import get_current_user, Principal
-from app.services.meal_snap_analyzer import MealSnapAnalyzer
 from app.core.config import settings
+from app.services import food_catalog
+from app.services.image_pipeline import ImageTooLargeError, UnsupportedImageError, prepare_image, read_capped
+from app.services.meal_snap_analyzer import AnalyzerBusyError, MealSnapAnalyzer
+from app.services.snap_cache import get_snap_cache
 
 router = APIRouter(prefix="/ai", tags=["AI"])
+logger = logging.getLogger(__name__)
 
 
 @router.post("/snap-meal", status_code=status.HTTP_200_OK)
 async def snap_meal(
     file: UploadFile = File(...),
     user: Principal = Depends(get_current_user),
+    analyzer: MealSnapAnalyzer = Depends(get_meal_snap_analyzer),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if file.content_type not in ("image/jpeg", "image/png", "application/octet-stream"):
+    # the declared content type is not trusted; prepare_image sniffs the bytes
+    try:
+        image_bytes = await read_capped(file, settings.SNAP_UPLOAD_MAX_BYTES)
+        image = await prepare_image(image_bytes)
+    except ImageTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
+    except UnsupportedImageError as e:
         raise HTTPException(
             status_code=400,
-            detail="Only JPEG or PNG images are supported",
+            detail=str(e),
         )
 
-    image_bytes = await file.read()
-
-    analyzer = MealSnapAnalyzer(
-        api_key=settings.GEMINI_API_KEY
-    )
+    # duplicate / retried uploads are answered without a Gemini call
+    cache = get_snap_cache()
+    cached = await run_in_threadpool(cache.lookup, user.uid, image.digest, image.phash)
+    if cached is not None:
+        result, cache_info = cached
+        return {**result, "cache": cache_info}
 
     try:
-        result = analyzer.analyze_meal_image(image_bytes)
-        return result
+        result = await analyzer.analyze_meal_image_async(image.data, mime_type=image.mime_type)
+    except AnalyzerBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=str(e),
         )
 
+    # recognised foods join the user's catalog; items come back with their food_id (cached with it)
+    if result.get("foods"):
+        try:
+            result = {**result, "foods": await food_catalog.acatalog_snap_foods(db, user.uid, result["foods"])}
+        except Exception:
+            # the analysis is still good without catalog ids
+            await db.rollback()
+            logger.exception("cataloguing snap-meal foods failed for %s", user.uid)
+
+    await run_in_threadpool(cache.store, user.uid, image.digest, image.phash, result)
+    return {**result, "cache": {"hit": False, "match": None, "distance": None}}
@@ -0,0 +1,44 @@
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+
+from app.api.deps import get_db
+from app.auth.deps import get_current_user, Principal
+from app.core.config import settings
+from app.services.sync_service import SyncService
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+SyncTable = Literal["food_entries", "weight_entries", "workout_sessions", "exercise_entries", "recipes", "meal_plans"]
+
+class Mutation(BaseModel):
+    id: str | None = Field(None, description="client reference, echoed in the result")
+    table: SyncTable
+    op: Literal["create", "update", "delete"]
+    row_id: str = Field(..., min_length=1, max_length=36)
+    data: dict[str, Any] = Field(default_factory=dict)
+
+class SyncRequest(BaseModel):
+    # table -> token from the previous response (null / missing = full sync)
+    tokens: dict[str, str | None] = Field(default_factory=dict)
+    tables: list[SyncTable] | None = None
+    mutations: list[Mutation] = Field(default_factory=list, max_length=settings.SYNC_MAX_MUTATIONS)
+    limit: int | None = Field(None, ge=1, le=settings.SYNC_PAGE_ROWS)
+
+@router.post("")
+def sync(
+    payload: SyncRequest,
+    user: Principal = Depends(get_current_user),
+    db=Depends(get_db),
+):
+    try:
+        return SyncService(db).sync(
+            user.uid,
+            tokens=payload.tokens,
+            mutations=[m.model_dump() for m in payload.mutations],
+            tables=payload.tables,
+            limit=payload.limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
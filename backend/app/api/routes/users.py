@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Response, status, HTTPException
 from app.schemas.user import PreferencesUpdate, UserCreate, UserUpdate, UserResponse
+from app.services.user_read_model import UserReadModel
 from app.services.user_service import UserService
-from app.api.deps import get_user_service, get_current_user, Principal
+from app.api.deps import get_user_read_model, get_user_service, get_current_user, Principal
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -26,9 +27,10 @@ router = APIRouter(prefix="/users", tags=["users"])
 #     return db_user
 
 @router.get("/{user_id}/profile", response_model=UserResponse)
-async def get_user_profile(
+def get_user_profile(
     user_id: str,
-    user_service: UserService = Depends(get_user_service),
+    response: Response,
+    read_model: UserReadModel = Depends(get_user_read_model),
     current_user: Principal = Depends(get_current_user)
 ):
     """
@@ -41,13 +43,15 @@ async def get_user_profile(
             detail="You are not authorized to view this profile."
         )
 
-    user = user_service.get_user(user_id)
+    user, source = read_model.get_user(user_id)
+    response.headers["X-Read-Source"] = source
     if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User profile not found.")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User profile not found.",
+                            headers={"X-Read-Source": source})
     return user
 
 @router.put("/{user_id}/profile", response_model=UserResponse)
-async def update_user_profile(
+def update_user_profile(
     user_id: str,
     user_data: UserUpdate,
     user_service: UserService = Depends(get_user_service),
@@ -68,25 +72,27 @@ async def update_user_profile(
 
 
 @router.get("/me/status")
-async def get_profile_status(
+def get_profile_status(
+    response: Response,
     current_user: Principal = Depends(get_current_user),
-    user_service: UserService = Depends(get_user_service)
+    user_service: UserService = Depends(get_user_service),
+    read_model: UserReadModel = Depends(get_user_read_model),
 ):
-    user = user_service.get_user(current_user.uid)
+    user, source = read_model.get_user(current_user.uid)
+    response.headers["X-Read-Source"] = source
     if not user:
         if current_user.email:
             created = user_service.ensure_user_exists(current_user.uid, current_user.email, current_user.name)
             if created:
-                user = created
+                return {"isProfileComplete": bool(created.is_profile_complete)}
 
-    if not user:
         # can't create without email — frontend should ask for email in onboarding personal_info
         return {"isProfileComplete": False}
-    return {"isProfileComplete": bool(user.is_profile_complete)}
+    return {"isProfileComplete": bool(user["is_profile_complete"])}
 
 
 @router.put("/me/preferences")
-async def update_user_preferences(
+def update_user_preferences(
     update: PreferencesUpdate,
     user_service: UserService = Depends(get_user_service),
     current_user: Principal = Depends(get_current_user),
@@ -96,17 +102,19 @@ async def update_user_preferences(
 
 
 @router.get("/me/daily-targets")
-async def get_daily_targets(
-    user_service: UserService = Depends(get_user_service),
+def get_daily_targets(
+    response: Response,
+    read_model: UserReadModel = Depends(get_user_read_model),
     current_user: Principal = Depends(get_current_user),
 ):
-    user = user_service.get_user(current_user.uid)
+    user, source = read_model.get_user(current_user.uid)
+    response.headers["X-Read-Source"] = source
     if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if not user.is_profile_complete:
-        raise HTTPException(status_code=400, detail="Onboarding incomplete")
+        raise HTTPException(status_code=404, detail="User not found", headers={"X-Read-Source": source})
+    if not user["is_profile_complete"]:
+        raise HTTPException(status_code=400, detail="Onboarding incomplete", headers={"X-Read-Source": source})
 
-    summary = user.onboarding_summary or {}
+    summary = user["onboarding_summary"] or {}
     return {
         "daily_calories": summary.get("daily_calories"),
         "macro_targets": summary.get("macro_targets"),
@@ -118,15 +126,15 @@ async def get_daily_targets(
 from app.events.projection_service import get_projection_service, ProjectionService
 
 @router.post("/process-events", status_code=status.HTTP_200_OK)
-async def process_all_pending_events(
+def process_all_pending_events(
     projection_service: ProjectionService = Depends(get_projection_service)
 ):
     """
     TEMPORARY: Manually triggers the processing of all pending events
-    in the in-memory queue to update MongoDB projections.
+    on the event bus to update MongoDB projections.
     """
-    projection_service.process_events()
-    return {"message": "Events processed."}
+    processed = projection_service.process_events()
+    return {"message": "Events processed.", "processed": processed}
 
 
 
@@ -2,7 +2,14 @@ import tempfile
 import json
 import firebase_admin
 from firebase_admin import credentials, auth
+from app.auth.token_verifier import (
+    GooglePublicKeys,
+    LocalKeySet,
+    TokenVerifier,
+    firebase_revocation_lookup,
+)
 from app.core.config import settings
+from app.core.metrics import register_source
 
 def init_firebase():
     # Option 1: GOOGLE_APPLICATION_CREDENTIALS points to a file path (already set in env)
@@ -38,9 +45,44 @@ def init_firebase():
     # If no credentials provided, you may want to raise or fallback to non-initialized state.
     raise RuntimeError("Firebase service account not configured. Set GOOGLE_APPLICATION_CREDENTIALS or FIREBASE_SERVICE_ACCOUNT_JSON")
 
+_verifier: TokenVerifier | None = None
+
+def _project_id() -> str:
+    if settings.FIREBASE_PROJECT_ID:
+        return settings.FIREBASE_PROJECT_ID
+    project_id = firebase_admin.get_app().project_id
+    if not project_id:
+        raise RuntimeError("Firebase project id unknown. Set FIREBASE_PROJECT_ID")
+    return project_id
+
+def get_token_verifier() -> TokenVerifier:
+    global _verifier
+    if _verifier is None:
+        if settings.FIREBASE_PUBLIC_KEYS_FILE:
+            # offline key set: nothing to ask Firebase about revocation
+            key_set, lookup = LocalKeySet.from_file(settings.FIREBASE_PUBLIC_KEYS_FILE), None
+        else:
+            key_set, lookup = GooglePublicKeys(), firebase_revocation_lookup
+        _verifier = TokenVerifier(
+            key_set,
+            _project_id,
+            cache_size=settings.AUTH_TOKEN_CACHE_SIZE,
+            revocation_check_interval=settings.FIREBASE_REVOCATION_CHECK_INTERVAL_S,
+            revocation_lookup=lookup,
+            clock_skew=settings.FIREBASE_CLOCK_SKEW_S,
+        )
+    return _verifier
+
+def set_token_verifier(verifier: TokenVerifier | None):
+    """Swap the verifier (e.g. a LocalKeySet-backed one in tests)."""
+    global _verifier
+    _verifier = verifier
+
+register_source("auth", lambda: get_token_verifier().metrics() if _verifier else {})
+
 def verify_id_token(id_token: str) -> dict:
-    decoded = auth.verify_id_token(id_token, check_revoked=True)
-    return decoded
+    return get_token_verifier().verify(id_token)
 
 def revoke_user(uid: str):
     auth.revoke_refresh_tokens(uid)
+    get_token_verifier().invalidate_user(uid)
@@ -0,0 +1,286 @@
+"""
+Local Firebase ID-token verification with a verified-claims cache.
+
+`firebase_admin.auth.verify_id_token(check_revoked=True)` makes a network call
+to Firebase on every request. Here instead:
+
+- the RS256 signature is checked locally against Google's public certs, which
+  are fetched once and re-fetched only when their Cache-Control max-age runs out
+- verified claims are cached under sha256(token), and a cached entry never
+  outlives the token's `exp`
+- revocation (tokens_valid_after / disabled) is looked up per uid at most once
+  every FIREBASE_REVOCATION_CHECK_INTERVAL_S seconds (0 = every call, <0 = never)
+
+`LocalKeySet` stands in for Google's key set so tokens can be minted and
+verified offline (tests, local dev without Firebase).
+"""
+from hashlib import sha256
+from typing import Any, Callable, Protocol
+from uuid import uuid4
+import json
+import logging
+import re
+import threading
+import time
+
+import jwt
+import requests
+from cachetools import TLRUCache
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+# forced refreshes (unknown kid) at most this often: random kids can't drive fetches
+FORCED_REFRESH_INTERVAL_S = 60.0
+
+
+class TokenVerificationError(Exception):
+    """Token is malformed, badly signed, expired, or issued for another project."""
+
+
+class TokenRevokedError(TokenVerificationError):
+    """Token was revoked or the user is disabled."""
+
+
+class KeySet(Protocol):
+    def get_key(self, kid: str) -> Any:
+        """Return the public key for `kid`, or None when unknown."""
+        ...
+
+
+def _load_public_key(pem: str):
+    data = pem.encode("utf-8")
+    if b"BEGIN CERTIFICATE" in data:
+        return x509.load_pem_x509_certificate(data).public_key()
+    return serialization.load_pem_public_key(data)
+
+
+# ─────────────────────────────
+# Key sets
+# ─────────────────────────────
+class GooglePublicKeys:
+    """
+    Google securetoken x509 certs, cached for the response's max-age. An
+    unknown kid forces a refresh at most once every `min_refresh_interval`
+    seconds; in between it is rejected without a fetch.
+    """
+
+    def __init__(self, url: str = GOOGLE_CERTS_URL, timeout: float = 5.0,
+                 min_refresh_interval: float = FORCED_REFRESH_INTERVAL_S):
+        self.url = url
+        self.timeout = timeout
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        resp = requests.get(self.url, timeout=self.timeout)
+        resp.raise_for_status()
+        self._keys = {kid: _load_public_key(pem) for kid, pem in resp.json().items()}
+        m = _MAX_AGE_RE.search(resp.headers.get("Cache-Control", ""))
+        self._expires_at = time.time() + (int(m.group(1)) if m else 3600)
+
+    def get_key(self, kid: str):
+        key = self._keys.get(kid)
+        if key is not None and time.time() < self._expires_at:
+            return key
+        with self._lock:
+            now = time.time()
+            if now >= self._expires_at:
+                self._refreshed_at = now
+                self._refresh()
+            key = self._keys.get(kid)
+            if key is None and now - self._refreshed_at >= self.min_refresh_interval:
+                # keys rotate; an unknown kid is worth a forced refresh, rate-limited
+                self._refreshed_at = now
+                self._refresh()
+                key = self._keys.get(kid)
+            return key
+
+
+class LocalKeySet:
+    """
+    In-process key set. Either loaded from a JSON file of {kid: PEM cert/public key}
+    (FIREBASE_PUBLIC_KEYS_FILE) or generated, in which case it can also sign tokens.
+    """
+
+    def __init__(self, keys: dict[str, Any] | None = None):
+        self._keys: dict[str, Any] = dict(keys or {})
+        self._signing: tuple[str, Any] | None = None
+
+    @classmethod
+    def from_file(cls, path: str) -> "LocalKeySet":
+        with open(path, "r", encoding="utf-8") as fh:
+            raw = json.load(fh)
+        return cls({kid: _load_public_key(pem) for kid, pem in raw.items()})
+
+    @classmethod
+    def generate(cls, kid: str | None = None) -> "LocalKeySet":
+        kid = kid or uuid4().hex
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        ks = cls({kid: private_key.public_key()})
+        ks._signing = (kid, private_key)
+        return ks
+
+    def get_key(self, kid: str):
+        return self._keys.get(kid)
+
+    def issue_token(self, project_id: str, uid: str, ttl: int = 3600, **claims) -> str:
+        """Mint a Firebase-shaped ID token signed with the generated key."""
+        if self._signing is None:
+            raise RuntimeError("LocalKeySet has no private key; use LocalKeySet.generate()")
+        kid, private_key = self._signing
+        now = int(time.time())
+        payload = {
+            "iss": f"https://securetoken.google.com/{project_id}",
+            "aud": project_id,
+            "sub": uid,
+            "user_id": uid,
+            "iat": now,
+            "auth_time": now,
+            "exp": now + ttl,
+            **claims,
+        }
+        return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+# ─────────────────────────────
+# Revocation
+# ─────────────────────────────
+def firebase_revocation_lookup(uid: str) -> tuple[float, bool]:
+    """Return (tokens_valid_after in epoch seconds, disabled) from Firebase."""
+    from firebase_admin import auth
+
+    user = auth.get_user(uid)
+    valid_after_ms = user.tokens_valid_after_timestamp or 0
+    return valid_after_ms / 1000.0, bool(user.disabled)
+
+
+# ─────────────────────────────
+# Verifier
+# ─────────────────────────────
+class TokenVerifier:
+    def __init__(
+        self,
+        key_set: KeySet,
+        project_id: str | Callable[[], str],
+        *,
+        cache_size: int = 10_000,
+        revocation_check_interval: float = 300.0,
+        revocation_lookup: Callable[[str], tuple[float, bool]] | None = firebase_revocation_lookup,
+        clock_skew: int = 0,
+    ):
+        self.key_set = key_set
+        self._project_id = project_id
+        self.revocation_check_interval = revocation_check_interval
+        self.revocation_lookup = revocation_lookup
+        self.clock_skew = clock_skew
+        # value = (claims, exp); each entry dies at the token's own exp
+        self._cache: TLRUCache[str, tuple[dict[str, Any], float]] = TLRUCache(
+            maxsize=cache_size, ttu=lambda _k, v, _now: v[1], timer=time.time
+        )
+        self._cache_lock = threading.Lock()
+        # uid -> (checked_at, tokens_valid_after, disabled)
+        self._revocation: dict[str, tuple[float, float, bool]] = {}
+        self._revocation_lock = threading.Lock()
+        self.counters = Counter("cache_hits", "cache_misses", "rejected", "revocation_lookups", "revoked")
+
+    @property
+    def project_id(self) -> str:
+        if callable(self._project_id):
+            self._project_id = self._project_id()
+        return self._project_id
+
+    def verify(self, token: str) -> dict:
+        key = sha256(token.encode("utf-8")).hexdigest()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            self.counters.inc("cache_hits")
+            claims = cached[0]
+        else:
+            self.counters.inc("cache_misses")
+            try:
+                claims = self._decode(token)
+            except TokenVerificationError:
+                self.counters.inc("rejected")
+                raise
+            with self._cache_lock:
+                self._cache[key] = (claims, float(claims["exp"]))
+
+        try:
+            self._check_revocation(claims)
+        except TokenRevokedError:
+            with self._cache_lock:
+                self._cache.pop(key, None)
+            raise
+        return claims
+
+    def _decode(self, token: str) -> dict:
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(f"Malformed token: {e}") from e
+        if header.get("alg") != "RS256":
+            raise TokenVerificationError("Unexpected token algorithm")
+        kid = header.get("kid")
+        public_key = self.key_set.get_key(kid) if kid else None
+        if public_key is None:
+            raise TokenVerificationError("Unknown signing key")
+
+        project_id = self.project_id
+        try:
+            claims = jwt.decode(
+                token,
+                public_key,
+                algorithms=["RS256"],
+                audience=project_id,
+                issuer=f"https://securetoken.google.com/{project_id}",
+                leeway=self.clock_skew,
+                options={"require": ["exp", "iat", "sub"]},
+            )
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(str(e)) from e
+
+        sub = claims.get("sub")
+        if not isinstance(sub, str) or not sub or len(sub) > 128:
+            raise TokenVerificationError("Invalid subject")
+        # same shape firebase_admin returns
+        claims["uid"] = sub
+        return claims
+
+    def _check_revocation(self, claims: dict) -> None:
+        if self.revocation_lookup is None or self.revocation_check_interval < 0:
+            return
+        uid = claims["uid"]
+        now = time.time()
+        with self._revocation_lock:
+            state = self._revocation.get(uid)
+        if state is None or now - state[0] >= self.revocation_check_interval:
+            self.counters.inc("revocation_lookups")
+            valid_after, disabled = self.revocation_lookup(uid)
+            state = (now, valid_after, disabled)
+            with self._revocation_lock:
+                self._revocation[uid] = state
+        _, valid_after, disabled = state
+        if disabled or claims["iat"] < valid_after:
+            self.counters.inc("revoked")
+            raise TokenRevokedError("Token revoked or user disabled")
+
+    def invalidate_user(self, uid: str) -> None:
+        """Force a revocation lookup for `uid` on its next request (e.g. after logout)."""
+        with self._revocation_lock:
+            self._revocation.pop(uid, None)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._cache_lock:
+            size = len(self._cache)
+        return {**self.counters.snapshot(), "cached_tokens": size}
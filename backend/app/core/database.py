@@ -1,8 +1,15 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from pymongo import MongoClient
 from pymongo.database import Database as MongoDatabase
 from app.core.config import settings
+from app.core.db_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    async_pool_metrics,
+    sync_pool_metrics,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,12 +17,27 @@ logger = logging.getLogger(__name__)
 # --- MySQL (SQLAlchemy) Setup ---
 SQLALCHEMY_DATABASE_URL = settings.mysql_url()
 
-# Create the SQLAlchemy engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+# Create the SQLAlchemy engine (pool sizing comes from DB_POOL_* settings)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    **settings.db_pool_kwargs(),
+)
+sync_pool_metrics.bind(engine)
 
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine + session factory (aiomysql) for non-blocking routes.
+# expire_on_commit=False so ORM objects stay readable after commit without a lazy reload.
+async_engine = create_async_engine(
+    settings.mysql_async_url(),
+    poolclass=InstrumentedAsyncQueuePool,
+    **settings.db_pool_kwargs(),
+)
+async_pool_metrics.bind(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for declarative models
 Base = declarative_base()
 
@@ -28,6 +50,15 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Dependency to get an async SQLAlchemy session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine():
+    """Closes pooled async connections (call on shutdown)."""
+    await async_engine.dispose()
+
 # --- MongoDB (PyMongo) Setup ---
 mongo_client: MongoClient | None = None
 mongo_db: MongoDatabase | None = None
@@ -0,0 +1,121 @@
+"""
+Connection pool instrumentation for the sync and async SQLAlchemy engines.
+
+- pool events (connect / checkout / checkin / invalidate) feed counters and
+  connection hold time
+- the pool classes below time every checkout, including the wait for an
+  overflow slot, and attribute it to the current route
+"""
+from time import perf_counter
+from typing import Any
+import threading
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import Counter, LatencyStat, current_route, register_source
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.counters = Counter("connects", "checkouts", "checkins", "invalidations", "timeouts")
+        self.checkout_wait = LatencyStat()
+        self.held = LatencyStat()
+        self._routes_lock = threading.Lock()
+        self._routes: dict[str, dict[str, Any]] = {}
+        self._engine = None
+
+    def bind(self, engine) -> None:
+        """Attach pool event listeners to a (sync) Engine."""
+        self._engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    # ---------- event hooks ----------
+    def _on_connect(self, dbapi_conn, connection_record):
+        self.counters.inc("connects")
+
+    def _on_checkout(self, dbapi_conn, connection_record, connection_proxy):
+        self.counters.inc("checkouts")
+        connection_record.info["checked_out_at"] = perf_counter()
+
+    def _on_checkin(self, dbapi_conn, connection_record):
+        self.counters.inc("checkins")
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            self.held.observe((perf_counter() - started) * 1000.0)
+
+    def _on_invalidate(self, dbapi_conn, connection_record, exception):
+        self.counters.inc("invalidations")
+
+    # ---------- checkout timing ----------
+    def observe_wait(self, ms: float, timed_out: bool = False) -> None:
+        self.checkout_wait.observe(ms)
+        if timed_out:
+            self.counters.inc("timeouts")
+        route = current_route()
+        with self._routes_lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {"wait": LatencyStat(), "timeouts": 0}
+            if timed_out:
+                stats["timeouts"] += 1
+        stats["wait"].observe(ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        pool = self._engine.pool if self._engine is not None else None
+        gauges = {}
+        if isinstance(pool, QueuePool):
+            gauges = {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        with self._routes_lock:
+            routes = {r: {"checkout_wait": s["wait"].snapshot(), "timeouts": s["timeouts"]} for r, s in self._routes.items()}
+        return {
+            **self.counters.snapshot(),
+            "pool": gauges,
+            "checkout_wait": self.checkout_wait.snapshot(),
+            "connection_held": self.held.snapshot(),
+            "routes": routes,
+        }
+
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+register_source("db_pool", lambda: {
+    "sync": sync_pool_metrics.snapshot(),
+    "async": async_pool_metrics.snapshot(),
+})
+
+
+def _timed_get(metrics: PoolMetrics, do_get):
+    started = perf_counter()
+    timed_out = False
+    try:
+        return do_get()
+    except exc.TimeoutError:
+        timed_out = True
+        raise
+    finally:
+        metrics.observe_wait((perf_counter() - started) * 1000.0, timed_out)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        return _timed_get(sync_pool_metrics, super()._do_get)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool counterpart of InstrumentedQueuePool."""
+
+    def _do_get(self):
+        return _timed_get(async_pool_metrics, super()._do_get)
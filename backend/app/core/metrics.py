@@ -0,0 +1,134 @@
+"""
+Lightweight in-process metrics surface.
+
+Components register a snapshot callable with `register_source(name, fn)`;
+`collect()` returns every source's snapshot as one JSON-friendly dict
+(served by GET /api/health/metrics).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_sources: dict[str, Callable[[], dict[str, Any]]] = {}
+
+def register_source(name: str, fn: Callable[[], dict[str, Any]]) -> None:
+    """Register (or replace) a named metrics snapshot provider."""
+    _sources[name] = fn
+
+def collect() -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    for name, fn in list(_sources.items()):
+        try:
+            out[name] = fn()
+        except Exception as e:
+            logger.exception("metrics source %s failed", name)
+            out[name] = {"error": str(e)}
+    return out
+
+
+class LatencyStat:
+    """Thread-safe count / total / max accumulator (milliseconds)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+                "max_ms": round(self.max_ms, 3),
+            }
+
+
+class Counter:
+    """Thread-safe named counters."""
+
+    def __init__(self, *names: str):
+        self._lock = threading.Lock()
+        self._values: dict[str, int] = {n: 0 for n in names}
+
+    def inc(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + n
+
+    def get(self, name: str) -> int:
+        return self._values.get(name, 0)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._values)
+
+
+class StageTimer:
+    """
+    Per-request stage durations (ms), e.g. for a Server-Timing header.
+    Optionally feeds each stage into a shared {stage: LatencyStat} dict.
+    """
+
+    def __init__(self, stats: dict[str, LatencyStat] | None = None):
+        self.stages: dict[str, float] = {}
+        self._stats = stats
+
+    @contextmanager
+    def stage(self, name: str):
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            ms = (perf_counter() - started) * 1000.0
+            self.stages[name] = self.stages.get(name, 0.0) + ms
+            if self._stats is not None:
+                self._stats.setdefault(name, LatencyStat()).observe(ms)
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in self.stages.items())
+
+
+# ─────────────────────────────
+# Request route context
+# ─────────────────────────────
+# Holds the ASGI scope of the request being served. Routing writes the matched
+# route into that same scope dict, so code running deeper (including sync
+# handlers in the threadpool, which inherit a copy of the context) can label
+# metrics with the route template instead of the raw path.
+_current_scope: ContextVar[dict | None] = ContextVar("current_scope", default=None)
+
+def current_route() -> str:
+    scope = _current_scope.get()
+    if scope is None:
+        return "-"
+    route = scope.get("route")
+    return getattr(route, "path", None) or "-"
+
+
+class RouteContextMiddleware:
+    """Pure ASGI middleware exposing the current request scope to `current_route()`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
@@ -0,0 +1,235 @@
+"""
+Pluggable event bus (EVENT_BUS_BACKEND).
+
+- "outbox": events are rows in the MySQL `event_outbox` table, added to the
+  publisher's session so they commit (or roll back) with the write they
+  describe. Consumers claim batches with SELECT ... FOR UPDATE SKIP LOCKED and
+  delete them once handled, so any number of workers can drain the table.
+  Batches are claimed in id order; with several consumers running, two
+  batches for the same user may be handled concurrently.
+- "memory": per-process deque for tests and local runs. Events published with
+  a session are held until that session commits and dropped on rollback.
+
+When a batch handler raises, the batch is retried one event at a time. If
+every event fails, the error propagates (an outage: the batch is redelivered
+as is). Otherwise the others are acknowledged and each failing event counts an
+attempt; after EVENT_MAX_ATTEMPTS it is parked and skipped from then on, so
+one malformed event can't stall the events claimed after it.
+"""
+from collections import deque
+from datetime import datetime
+from itertools import count
+from typing import Any, Callable, NamedTuple, Protocol
+import logging
+import threading
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.sql_models import EventOutbox
+
+logger = logging.getLogger(__name__)
+
+class Event(NamedTuple):
+    id: int
+    type: str
+    payload: dict[str, Any]
+    created_at: datetime  # UTC
+
+
+BatchHandler = Callable[[list[Event]], None]
+
+
+class EventBus(Protocol):
+    def publish(self, event_type: str, payload: dict[str, Any], session: Session | AsyncSession | None = None) -> None:
+        """Queue an event; with `session`, it is only delivered if that session commits."""
+        ...
+
+    def consume(self, handler: BatchHandler, max_batch: int) -> int:
+        """Hand up to `max_batch` events (oldest first) to `handler`; return how many were
+        acknowledged. Raises if no event could be handled (see the module docstring)."""
+        ...
+
+    def backlog(self) -> tuple[int, datetime | None]:
+        """(pending events, created_at of the oldest); parked events are not pending."""
+        ...
+
+
+def _row(event_type: str, payload: dict[str, Any]) -> dict[str, Any]:
+    # datetimes / dates / Decimals -> JSON-safe values, same as a response body
+    payload = jsonable_encoder(payload)
+    return {
+        "event_type": event_type,
+        "aggregate_id": payload.get("user_id"),
+        "payload": payload,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _handle_isolated(handler: BatchHandler, events: list[Event]) -> tuple[list[Event], list[tuple[Event, Exception]]]:
+    """(handled, failed with their errors); raises when nothing could be handled."""
+    try:
+        handler(events)
+        return events, []
+    except Exception:
+        if len(events) == 1:
+            raise
+    handled: list[Event] = []
+    failed: list[tuple[Event, Exception]] = []
+    for evt in events:
+        try:
+            handler([evt])
+            handled.append(evt)
+        except Exception as e:
+            failed.append((evt, e))
+    if not handled:
+        raise failed[0][1]
+    return handled, failed
+
+def _log_parked(evt: Event, error: Exception, attempts: int) -> None:
+    logger.error(f"Parking event {evt.id} ({evt.type}) after {attempts} failed attempts: {error}")
+
+
+class OutboxEventBus:
+    def __init__(self, session_factory: Callable[[], Session] | None = None):
+        if session_factory is None:
+            from app.core.database import SessionLocal
+
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+
+    def publish(self, event_type: str, payload: dict[str, Any], session: Session | AsyncSession | None = None) -> None:
+        row = EventOutbox(**_row(event_type, payload))
+        if session is not None:
+            session.add(row)
+            return
+        with self._session_factory() as db:
+            db.add(row)
+            db.commit()
+
+    def consume(self, handler: BatchHandler, max_batch: int) -> int:
+        with self._session_factory() as db:
+            rows = db.execute(
+                select(EventOutbox)
+                .where(EventOutbox.parked_at.is_(None))
+                .order_by(EventOutbox.id)
+                .limit(max_batch)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not rows:
+                db.rollback()
+                return 0
+            # raising leaves the rows in place (rolled back on close)
+            handled, failed = _handle_isolated(
+                handler, [Event(r.id, r.event_type, r.payload, r.created_at) for r in rows]
+            )
+            db.execute(delete(EventOutbox).where(EventOutbox.id.in_([e.id for e in handled])))
+            by_id = {r.id: r for r in rows}
+            for evt, error in failed:
+                row = by_id[evt.id]
+                row.attempts += 1
+                row.last_error = str(error)[:1024]
+                if row.attempts >= settings.EVENT_MAX_ATTEMPTS:
+                    row.parked_at = datetime.utcnow()
+                    _log_parked(evt, error, row.attempts)
+            db.commit()
+            return len(handled)
+
+    def backlog(self) -> tuple[int, datetime | None]:
+        with self._session_factory() as db:
+            pending, oldest = db.execute(
+                select(func.count(), func.min(EventOutbox.created_at)).where(EventOutbox.parked_at.is_(None))
+            ).one()
+            return pending, oldest
+
+
+class InMemoryEventBus:
+    def __init__(self):
+        self._queue: deque[Event] = deque()
+        self._lock = threading.Lock()
+        self._ids = count(1)
+        self._attempts: dict[int, int] = {}
+        self.parked: list[Event] = []
+
+    def publish(self, event_type: str, payload: dict[str, Any], session: Session | AsyncSession | None = None) -> None:
+        row = _row(event_type, payload)
+        evt = Event(next(self._ids), row["event_type"], row["payload"], row["created_at"])
+        if session is None:
+            with self._lock:
+                self._queue.append(evt)
+            return
+
+        # AsyncSession: transaction events live on its sync Session
+        sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+        pending = sync_session.info.setdefault("bus_pending_events", [])
+        if not sync_session.info.get("bus_listening"):
+            sync_session.info["bus_listening"] = True
+            event.listen(sync_session, "after_commit", self._on_commit)
+            event.listen(sync_session, "after_rollback", self._on_rollback)
+        pending.append(evt)
+
+    def _on_commit(self, session: Session) -> None:
+        pending = session.info.pop("bus_pending_events", [])
+        with self._lock:
+            self._queue.extend(pending)
+
+    def _on_rollback(self, session: Session) -> None:
+        session.info.pop("bus_pending_events", None)
+
+    def consume(self, handler: BatchHandler, max_batch: int) -> int:
+        with self._lock:
+            batch = [self._queue.popleft() for _ in range(min(max_batch, len(self._queue)))]
+        if not batch:
+            return 0
+        try:
+            handled, failed = _handle_isolated(handler, batch)
+        except Exception:
+            with self._lock:
+                self._queue.extendleft(reversed(batch))
+            raise
+
+        retry = []
+        with self._lock:
+            for evt in handled:
+                self._attempts.pop(evt.id, None)
+            for evt, error in failed:
+                attempts = self._attempts.get(evt.id, 0) + 1
+                if attempts >= settings.EVENT_MAX_ATTEMPTS:
+                    self._attempts.pop(evt.id, None)
+                    self.parked.append(evt)
+                    _log_parked(evt, error, attempts)
+                else:
+                    self._attempts[evt.id] = attempts
+                    retry.append(evt)
+            self._queue.extendleft(reversed(retry))
+        return len(handled)
+
+    def backlog(self) -> tuple[int, datetime | None]:
+        with self._lock:
+            return len(self._queue), (self._queue[0].created_at if self._queue else None)
+
+
+_bus: EventBus | None = None
+_bus_lock = threading.Lock()
+
+def get_event_bus() -> EventBus:
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            backend = settings.EVENT_BUS_BACKEND.lower()
+            if backend == "outbox":
+                _bus = OutboxEventBus()
+            elif backend == "memory":
+                _bus = InMemoryEventBus()
+            else:
+                raise ValueError(f"Unknown EVENT_BUS_BACKEND: {settings.EVENT_BUS_BACKEND}")
+        return _bus
+
+def set_event_bus(bus: EventBus | None) -> None:
+    """Swap the process-wide bus (tests); None re-reads EVENT_BUS_BACKEND on next use."""
+    global _bus
+    with _bus_lock:
+        _bus = bus
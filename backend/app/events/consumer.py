@@ -0,0 +1,89 @@
+"""
+Batch consumer for the event bus, with throughput / lag metrics
+(GET /api/health/metrics -> "events").
+"""
+from datetime import datetime
+from time import perf_counter
+from typing import Any
+import logging
+import threading
+
+from app.core.config import settings
+from app.core.metrics import Counter, LatencyStat, register_source
+from app.events.bus import BatchHandler, Event, EventBus, get_event_bus
+
+logger = logging.getLogger(__name__)
+
+
+class ConsumerMetrics:
+    def __init__(self):
+        self.batch = LatencyStat()
+        self.counters = Counter("events", "batches", "failed_batches")
+        self._lock = threading.Lock()
+        self._last: dict[str, Any] = {}
+
+    def observe_batch(self, events: list[Event], ms: float) -> None:
+        now = datetime.utcnow()
+        self.batch.observe(ms)
+        self.counters.inc("batches")
+        self.counters.inc("events", len(events))
+        with self._lock:
+            self._last = {
+                "last_batch_size": len(events),
+                "last_batch_events_per_s": round(len(events) / (ms / 1000.0), 1) if ms else None,
+                # publish -> handled, for the oldest event in the batch
+                "last_lag_s": round((now - events[0].created_at).total_seconds(), 3),
+                "last_consumed_at": now.isoformat(),
+            }
+
+    def snapshot(self, bus: EventBus | None = None) -> dict[str, Any]:
+        with self._lock:
+            out = {**self.counters.snapshot(), "batch": self.batch.snapshot(), **self._last}
+        if bus is not None:
+            pending, oldest = bus.backlog()
+            out["pending"] = pending
+            out["oldest_pending_age_s"] = (
+                round((datetime.utcnow() - oldest).total_seconds(), 3) if oldest else 0.0
+            )
+        return out
+
+
+consumer_metrics = ConsumerMetrics()
+
+
+class EventConsumer:
+    def __init__(self, handler: BatchHandler, bus: EventBus | None = None, batch_size: int | None = None):
+        self.handler = handler
+        self.bus = bus or get_event_bus()
+        self.batch_size = batch_size or settings.EVENT_BATCH_SIZE
+
+    def _handle(self, events: list[Event]) -> None:
+        started = perf_counter()
+        self.handler(events)
+        consumer_metrics.observe_batch(events, (perf_counter() - started) * 1000.0)
+
+    def run_once(self) -> int:
+        """Consume one batch; returns the number of events handled (0 = nothing pending)."""
+        try:
+            return self.bus.consume(self._handle, self.batch_size)
+        except Exception:
+            consumer_metrics.counters.inc("failed_batches")
+            raise
+
+    def drain(self, max_batches: int | None = None) -> int:
+        """Consume batches until the bus is empty (or `max_batches`); returns events handled."""
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            n = self.run_once()
+            if not n:
+                break
+            total += n
+            batches += 1
+        return total
+
+
+def _metrics() -> dict[str, Any]:
+    return consumer_metrics.snapshot(get_event_bus())
+
+register_source("events", _metrics)
@@ -0,0 +1,201 @@
+"""
+Per-user home dashboard documents (Mongo `dashboards`, see mongo_models.Dashboard),
+so GET /api/dashboard/home is a single find_one by _id.
+
+Food, weight and workout writes publish FoodEntriesChanged / WeightEntriesChanged /
+WorkoutsChanged; profile events (name, height, targets) count too. Events only
+say *which* users changed: each affected user's document is recomputed from
+MySQL, so replays, reordering and dropped intermediate events are harmless.
+A batch's documents go out as one unordered bulk_write.
+
+    python -m app.events.dashboard_projector [--user UID]   # backfill / rebuild
+"""
+from datetime import date, datetime
+from time import perf_counter
+from typing import Any, Callable, Iterable, Mapping
+import argparse
+import logging
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.metrics import Counter, LatencyStat, register_source
+from app.events.bus import Event
+from app.models.sql_models import ExerciseEntry, User, WorkoutSession
+from app.services.dashboard_service import _home_meals_stmt, _home_user_weights_stmt, _split_user_weights
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_EVENTS = frozenset({"FoodEntriesChanged", "WeightEntriesChanged", "WorkoutsChanged"})
+# profile events: display name, height and calorie / macro targets live on the dashboard too
+PROFILE_EVENTS = frozenset({"UserCreated", "UserUpdated", "OnboardingCompleted"})
+
+_rebuild_stat = LatencyStat()
+_bulk_write_stat = LatencyStat()
+_counters = Counter("events", "documents", "missing_users", "write_errors")
+register_source(
+    "dashboard_projection",
+    lambda: {**_counters.snapshot(), "rebuild": _rebuild_stat.snapshot(), "bulk_write": _bulk_write_stat.snapshot()},
+)
+
+
+def _last_workout_stmt(user_id: str):
+    """The user's latest session (by day, then creation) with its exercise count and volume."""
+    latest = (
+        select(WorkoutSession.session_id)
+        .where(WorkoutSession.user_id == user_id)
+        .order_by(WorkoutSession.date.desc(), WorkoutSession.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            WorkoutSession.session_id,
+            WorkoutSession.date,
+            WorkoutSession.name,
+            func.count(ExerciseEntry.entry_id).label("exercise_count"),
+            func.coalesce(func.sum(ExerciseEntry.total_volume), 0).label("total_volume"),
+        )
+        .outerjoin(ExerciseEntry, ExerciseEntry.session_id == WorkoutSession.session_id)
+        .where(WorkoutSession.session_id == latest)
+        .group_by(WorkoutSession.session_id, WorkoutSession.date, WorkoutSession.name)
+    )
+
+
+def affected_users(events: Iterable[Event]) -> dict[str, datetime]:
+    """user_id -> publish time of the newest event that touches their dashboard."""
+    users: dict[str, datetime] = {}
+    for event in events:
+        if event.type not in DASHBOARD_EVENTS and event.type not in PROFILE_EVENTS:
+            continue
+        user_id = event.payload.get("user_id")
+        if user_id:
+            users[user_id] = max(users.get(user_id, event.created_at), event.created_at)
+    return users
+
+
+def build_document(db: Session, user_id: str, today: date | None = None) -> dict[str, Any] | None:
+    """The user's dashboard document (without _id / last_event_at), or None if the user is gone."""
+    today = today or date.today()
+    user, latest_kg, previous_kg = _split_user_weights(db.execute(_home_user_weights_stmt(user_id)).all())
+    if user is None:
+        return None
+    meals = db.execute(_home_meals_stmt(user_id, today)).all()
+    workout = db.execute(_last_workout_stmt(user_id)).first()
+    return _document(user, latest_kg, previous_kg, meals, workout, today)
+
+
+def _document(user: User, latest_kg, previous_kg, meals, workout, today: date) -> dict[str, Any]:
+    summary = user.onboarding_summary or {}
+    return {
+        "display_name": user.name or "User",
+        # ISO string: BSON has no date-only type
+        "current_date": today.isoformat(),
+        "daily_macro_summary": {
+            "meals": [
+                {
+                    "meal_type": m.meal_type,
+                    "calories": int(m.calories),
+                    "protein_g": float(m.protein_g),
+                    "carbs_g": float(m.carbs_g),
+                    "fats_g": float(m.fats_g),
+                    "time": m.time,
+                }
+                for m in meals
+            ],
+        },
+        "daily_target": {
+            "daily_calories": summary.get("daily_calories"),
+            "macro_targets": summary.get("macro_targets") or {},
+        },
+        "last_weight_kg": float(latest_kg) if latest_kg is not None else None,
+        "previous_weight_kg": float(previous_kg) if previous_kg is not None else None,
+        "height_cm": user.height_cm,
+        "last_workout_summary": {
+            "session_id": workout.session_id,
+            "date": workout.date.isoformat(),
+            "name": workout.name,
+            "exercise_count": int(workout.exercise_count),
+            "total_volume": float(workout.total_volume),
+        } if workout else None,
+        "last_updated": datetime.utcnow(),
+    }
+
+
+class DashboardProjector:
+    def __init__(self, mongo_db: Database, session_factory: Callable[[], Session] | None = None):
+        if session_factory is None:
+            from app.core.database import SessionLocal
+
+            session_factory = SessionLocal
+        self.collection = mongo_db.get_collection("dashboards")
+        self._session_factory = session_factory
+
+    def apply(self, events: list[Event]) -> None:
+        """Recompute the dashboards of the users touched by `events` (one bulk_write)."""
+        users = affected_users(events)
+        _counters.inc("events", sum(1 for e in events if e.type in DASHBOARD_EVENTS))
+        if users:
+            self.project(users)
+
+    def project(self, users: Mapping[str, datetime | None]) -> int:
+        """Rebuild the given users' documents; returns how many were written."""
+        started = perf_counter()
+        requests = []
+        with self._session_factory() as db:
+            for user_id, event_at in users.items():
+                doc = build_document(db, user_id)
+                if doc is None:
+                    _counters.inc("missing_users")
+                    continue
+                update: dict[str, Any] = {"$set": doc}
+                if event_at is not None:
+                    update["$max"] = {"last_event_at": event_at}
+                requests.append(UpdateOne({"_id": user_id}, update, upsert=True))
+        _rebuild_stat.observe((perf_counter() - started) * 1000.0)
+        if not requests:
+            return 0
+
+        started = perf_counter()
+        try:
+            self.collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            _counters.inc("write_errors", len(errors))
+            for err in errors:
+                logger.error(f"Dashboard projection failed (op {err.get('index')}): {err.get('errmsg')}")
+        finally:
+            _bulk_write_stat.observe((perf_counter() - started) * 1000.0)
+        _counters.inc("documents", len(requests))
+        return len(requests)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild dashboards documents from MySQL")
+    parser.add_argument("--user", dest="user_id")
+    parser.add_argument("--chunk", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    from app.core.database import SessionLocal, close_mongo_connection, connect_to_mongo, get_mongo_db
+
+    connect_to_mongo()
+    try:
+        projector = DashboardProjector(get_mongo_db())
+        if args.user_id:
+            user_ids = [args.user_id]
+        else:
+            with SessionLocal() as db:
+                user_ids = list(db.execute(select(User.user_id).order_by(User.user_id)).scalars())
+        written = 0
+        for i in range(0, len(user_ids), args.chunk):
+            # no last_event_at: a rebuild doesn't vouch for events still in the bus
+            written += projector.project({uid: None for uid in user_ids[i:i + args.chunk]})
+        print(f"dashboards: {written} documents rebuilt")
+    finally:
+        close_mongo_connection()
+
+if __name__ == "__main__":
+    main()
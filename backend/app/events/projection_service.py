@@ -1,43 +1,172 @@
 from datetime import datetime
 from fastapi import Depends
+from pymongo import UpdateOne
 from pymongo.database import Database
+from pymongo.errors import BulkWriteError
 from app.core.database import get_mongo_db
+from app.core.metrics import Counter, LatencyStat, register_source
+from app.events.bus import Event, EventBus
+from app.events.consumer import EventConsumer
+from app.events.dashboard_projector import DASHBOARD_EVENTS, DashboardProjector
 from app.models.mongo_models import UserProjection
-from app.services.user_service import event_queue # Import the in-memory queue
+from time import perf_counter
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# (user_id, $set document, upsert)
+ProjectionUpdate = Tuple[str, Dict[str, Any], bool]
+
+# --- Metrics (GET /api/health/metrics -> "projection") ---
+_bulk_write_stat = LatencyStat()
+_counters = Counter("events", "updates", "write_errors")
+
+def _metrics() -> Dict[str, Any]:
+    counts = _counters.snapshot()
+    ratio = counts["events"] / counts["updates"] if counts["updates"] else 0.0
+    return {**counts, "coalescing_ratio": round(ratio, 2), "bulk_write": _bulk_write_stat.snapshot()}
+
+register_source("projection", _metrics)
+
+
+def _merge_set(target: Dict[str, Any], new: Dict[str, Any]) -> None:
+    """
+    Fold a later $set into an earlier one for the same document. Later values
+    win; overlapping paths ("onboarding" vs "onboarding.summary") are resolved
+    so the merged $set has no conflicts Mongo would reject.
+    """
+    for key, value in new.items():
+        for existing in list(target):
+            if existing.startswith(key + "."):
+                # later write replaces the whole parent
+                del target[existing]
+            elif key.startswith(existing + ".") and isinstance(target[existing], dict):
+                # later write to a child of a parent set earlier in the batch
+                parent = target[existing] = dict(target[existing])
+                *path, leaf = key[len(existing) + 1:].split(".")
+                for part in path:
+                    child = parent.get(part)
+                    parent[part] = dict(child) if isinstance(child, dict) else {}
+                    parent = parent[part]
+                parent[leaf] = value
+                break
+        else:
+            target[key] = value
+
+
+def _profile_pipeline(doc: Dict[str, Any], newest: datetime, profile: Dict[str, Any], profile_at: datetime) -> List[Dict[str, Any]]:
+    """
+    Update pipeline that applies `doc` and replaces the full profile snapshot
+    only if it is newer than the stored one (`profile_at`): consumers run in
+    every API process and the outbox doesn't order a user's events, so an older
+    UserUpdated may arrive after a newer one.
+    """
+    fresher = {"$gt": [profile_at, {"$ifNull": ["$profile_at", datetime.min]}]}
+    stage: Dict[str, Any] = {k: {"$literal": v} for k, v in doc.items()}
+    stage["last_event_at"] = {"$max": ["$last_event_at", newest]}
+    stage["profile"] = {"$cond": [fresher, {"$literal": profile}, "$profile"]}
+    stage["profile_at"] = {"$max": ["$profile_at", profile_at]}
+    return [{"$set": stage}]
+
+
+def coalesce(updates: List[Tuple[ProjectionUpdate, datetime]]) -> List[UpdateOne]:
+    """
+    One UpdateOne per _id, in first-seen order. `last_event_at` (the newest
+    applied event's publish time) lets readers tell whether a write they made
+    has reached the projection. Of the batch's profile snapshots only the
+    newest is kept, and it is written conditionally (_profile_pipeline).
+    """
+    merged: Dict[str, Tuple[Dict[str, Any], bool, datetime]] = {}
+    profiles: Dict[str, Tuple[Dict[str, Any], datetime]] = {}
+    for (user_id, set_doc, upsert), event_at in updates:
+        doc, upserted, newest = merged.get(user_id, ({}, False, event_at))
+        set_doc = dict(set_doc)
+        profile = set_doc.pop("profile", None)
+        if profile is not None and (user_id not in profiles or event_at >= profiles[user_id][1]):
+            profiles[user_id] = (profile, event_at)
+        _merge_set(doc, set_doc)
+        merged[user_id] = (doc, upserted or upsert, max(newest, event_at))
+    requests = []
+    for uid, (doc, upsert, newest) in merged.items():
+        if uid in profiles:
+            requests.append(UpdateOne({"_id": uid}, _profile_pipeline(doc, newest, *profiles[uid]), upsert=upsert))
+            continue
+        update: Dict[str, Any] = {"$max": {"last_event_at": newest}}
+        if doc:
+            update["$set"] = doc
+        requests.append(UpdateOne({"_id": uid}, update, upsert=upsert))
+    return requests
+
+
 class ProjectionService:
-    def __init__(self, mongo_db: Database):
+    def __init__(self, mongo_db: Database, dashboard_projector: DashboardProjector | None = None):
         self.users_projection_collection = mongo_db.get_collection("users_projection")
+        self.dashboard_projector = dashboard_projector or DashboardProjector(mongo_db)
+
+    def process_events(self, bus: EventBus | None = None) -> int:
+        """
+        Drains pending events from the event bus (in batches) into the MongoDB
+        projections. Returns the number of events processed.
+        """
+        return EventConsumer(self.apply, bus=bus).drain()
 
-    def process_events(self):
+    def apply(self, events: List[Event]):
         """
-        Processes events from the in-memory queue and updates MongoDB projections.
-        In a real system, this would be triggered by a message broker listener.
+        Applies one batch of events: every event's update for the same user is
+        merged into a single UpdateOne, and the batch goes out as one unordered
+        bulk_write. Connection errors propagate (the batch is redelivered; the
+        updates are idempotent $sets); per-document write errors are logged.
+        The same batch then refreshes the affected users' dashboards.
         """
-        while event_queue:
-            event = event_queue.pop(0) # Get the oldest event
-            event_type = event["type"]
-            payload = event["payload"]
-            
-            if event_type == "UserCreated":
-                print("\n\n\nRUNNING!!!!\n\n\n")
-                self._handle_user_created(payload)
-            elif event_type == "UserUpdated":
-                self._handle_user_updated(payload)
-            elif event_type == "UserOnboardingStepSaved":
-                self._handle_onboarding_step_saved(payload)
-            elif event_type == "OnboardingCompleted":
-                self._handle_onboarding_completed(payload)
-            # Add handlers for other event types as needed
-            else:
-                logger.warning(f"Unknown event type: {event_type}")
-
-    def _handle_user_created(self, payload: Dict[str, Any]):
-        """Handles UserCreated event to create user projection."""
+        updates: List[Tuple[ProjectionUpdate, datetime]] = []
+        for event in events:
+            update = self._to_update(event)
+            if update is not None:
+                updates.append((update, event.created_at))
+
+        requests = coalesce(updates)
+        _counters.inc("events", len(events))
+        if requests:
+            self._write_users_projection(requests)
+        self.dashboard_projector.apply(events)
+
+    def _write_users_projection(self, requests: List[UpdateOne]) -> None:
+        _counters.inc("updates", len(requests))
+
+        started = perf_counter()
+        try:
+            self.users_projection_collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            _counters.inc("write_errors", len(errors))
+            for err in errors:
+                logger.error(f"Projection update failed (op {err.get('index')}): {err.get('errmsg')}")
+        finally:
+            _bulk_write_stat.observe((perf_counter() - started) * 1000.0)
+
+    def _to_update(self, event: Event) -> ProjectionUpdate | None:
+        event_type = event.type
+        payload = event.payload
+
+        if event_type == "UserCreated":
+            return self._handle_user_created(payload)
+        elif event_type == "UserUpdated":
+            return self._handle_user_updated(payload)
+        elif event_type == "UserOnboardingStepSaved":
+            return self._handle_onboarding_step_saved(payload)
+        elif event_type == "OnboardingCompleted":
+            return self._handle_onboarding_completed(payload)
+        elif event_type in DASHBOARD_EVENTS:
+            # dashboards only (DashboardProjector)
+            return None
+        # Add handlers for other event types as needed
+        else:
+            logger.warning(f"Unknown event type: {event_type}")
+            return None
+
+    def _handle_user_created(self, payload: Dict[str, Any]) -> ProjectionUpdate | None:
+        """Handles UserCreated event to create user projection (upsert, so replays are harmless)."""
         try:
             # Extract relevant fields for projection
             user_projection_data = {
@@ -45,110 +174,75 @@ class ProjectionService:
                 "email": payload["email"],
                 "name": payload.get("name"),
                 "goal": payload.get("goal"),
-                "diet_type": payload.get("preferences", {}).get("diet_type"), # Extract specific preference
+                "diet_type": (payload.get("preferences") or {}).get("diet_type"), # Extract specific preference
                 "allergies": payload.get("allergies"),
                 "status": payload.get("status", "active"),
                 "last_synced": payload["timestamp"] # Use event timestamp for initial sync
             }
             user_projection = UserProjection(**user_projection_data)
-            
-            self.users_projection_collection.insert_one(user_projection.model_dump(by_alias=True))
-            logger.info(f"User projection created for {payload['user_id']}")
+            doc = user_projection.model_dump(by_alias=True, exclude={"onboarding", "current_plan_summary", "profile", "profile_at", "last_event_at"})
+            doc.pop("_id")
+            if payload.get("profile"):
+                doc["profile"] = payload["profile"]
+            return payload["user_id"], doc, True
         except Exception as e:
-            logger.error(f"Error creating user projection for {payload['user_id']}: {e}")
+            logger.error(f"Error creating user projection for {payload.get('user_id')}: {e}")
+            return None
 
-    def _handle_user_updated(self, payload: Dict[str, Any]):
+    def _handle_user_updated(self, payload: Dict[str, Any]) -> ProjectionUpdate | None:
         """Handles UserUpdated event to update user projection."""
         user_id = payload["user_id"]
         updated_fields = payload["updated_fields"]
-        
-        # Prepare update document for MongoDB
-        mongo_update_doc = {"$set": {}}
-        
+
+        # Prepare $set document for MongoDB
+        set_doc: Dict[str, Any] = {}
+
         for key, value in updated_fields.items():
             if key == "preferences":
                 # If preferences changed, update diet_type in projection
-                if "diet_type" in value:
-                    mongo_update_doc["$set"]["diet_type"] = value["diet_type"]
+                if value and "diet_type" in value:
+                    set_doc["diet_type"] = value["diet_type"]
                 # You might need more sophisticated logic here if preferences are complex
-            elif key == "allergies":
-                mongo_update_doc["$set"]["allergies"] = value
-            elif key == "goal":
-                mongo_update_doc["$set"]["goal"] = value
-            elif key == "name":
-                mongo_update_doc["$set"]["name"] = value
-            elif key == "email":
-                mongo_update_doc["$set"]["email"] = value
+            elif key in ("allergies", "goal", "name", "email"):
+                set_doc[key] = value
             # Add other fields that should be projected
-        
-        mongo_update_doc["$set"]["last_synced"] = datetime.utcnow() # Update sync timestamp
-
-        if mongo_update_doc["$set"]: # Only update if there are fields to set
-            try:
-                self.users_projection_collection.update_one(
-                    {"_id": user_id},
-                    mongo_update_doc,
-                    upsert=False # Do not create if not exists, it should exist from UserCreated
-                )
-                logger.info(f"User projection updated for {user_id} with fields: {list(mongo_update_doc['$set'].keys())}")
-            except Exception as e:
-                logger.error(f"Error updating user projection for {user_id}: {e}")
-    def _handle_onboarding_step_saved(self, payload: Dict[str, Any]):
+
+        set_doc["last_synced"] = datetime.utcnow() # Update sync timestamp
+        if payload.get("profile"):
+            set_doc["profile"] = payload["profile"]
+
+        # Do not create if not exists (it should exist from UserCreated), unless
+        # the event carries a full profile snapshot (users created before profiles were projected)
+        return user_id, set_doc, bool(payload.get("profile"))
+
+    def _handle_onboarding_step_saved(self, payload: Dict[str, Any]) -> ProjectionUpdate | None:
         """
         Update the users_projection onboarding subdocument for fast reads.
         payload: { user_id, step, payload, timestamp }
         """
-        try:
-            user_id = payload["user_id"]
-            step = payload.get("step")
-            step_payload = payload.get("payload")
-            ts = payload.get("timestamp")
-
-            update_doc = {
-                "$set": {
-                    f"onboarding.progress.{step}": step_payload,
-                    "onboarding.current_step": step,
-                    "onboarding.last_saved": ts
-                }
-            }
-            # upsert projection if not exists
-            self.users_projection_collection.update_one(
-                {"_id": user_id},
-                update_doc,
-                upsert=True
-            )
-            logger.info(f"Updated onboarding step '{step}' for user {user_id} in projection")
-        except Exception as e:
-            logger.error(f"Error updating onboarding projection: {e}")
+        step = payload.get("step")
+        set_doc = {
+            f"onboarding.progress.{step}": payload.get("payload"),
+            "onboarding.current_step": step,
+            "onboarding.last_saved": payload.get("timestamp")
+        }
+        # upsert projection if not exists
+        return payload["user_id"], set_doc, True
 
-    def _handle_onboarding_completed(self, payload: Dict[str, Any]):
+    def _handle_onboarding_completed(self, payload: Dict[str, Any]) -> ProjectionUpdate | None:
         """
         Mark onboarding complete in projection, store a short summary and timestamp.
         """
-        try:
-            user_id = payload["user_id"]
-            summary = payload.get("summary", {})
-            ts = payload.get("timestamp")
-            # Set is_complete flag and save summary
-            update_doc = {
-                "$set": {
-                    "onboarding.is_complete": True,
-                    "onboarding.completed_at": ts,
-                    "onboarding.summary": summary
-                }
-            }
-            self.users_projection_collection.update_one(
-                {"_id": user_id},
-                update_doc,
-                upsert=True
-            )
-            logger.info(f"Onboarding completed projection updated for user {user_id}")
-        except Exception as e:
-            logger.error(f"Error in onboarding completed projection handler: {e}")
+        set_doc = {
+            "onboarding.is_complete": True,
+            "onboarding.completed_at": payload.get("timestamp"),
+            "onboarding.summary": payload.get("summary", {})
+        }
+        if payload.get("profile"):
+            set_doc["profile"] = payload["profile"]
+        return payload["user_id"], set_doc, True
 
 # --- Dependency for Projection Service ---
 def get_projection_service(mongo_db: Database = Depends(get_mongo_db)) -> ProjectionService:
     """Dependency to get the ProjectionService instance."""
     return ProjectionService(mongo_db)
-
-
@@ -0,0 +1,173 @@
+"""
+Long-running projection worker: keeps users_projection (and any other
+projection handled by ProjectionService) in step with the event bus.
+
+- in-process: `app.main.lifespan` starts one per API process when
+  PROJECTION_WORKER_ENABLED is set, and stops it (draining what is pending)
+  before the Mongo connection is closed
+- standalone: `python -m app.events.worker` (outbox backend only; set
+  PROJECTION_WORKER_ENABLED=false on the API processes)
+
+Batches are pulled one at a time, so a slow Mongo slows the pull rate instead
+of piling up work. The batch size doubles while the backlog keeps batches full
+(up to EVENT_MAX_BATCH_SIZE) and falls back once it clears; failures back off
+exponentially up to PROJECTION_WORKER_MAX_BACKOFF_S.
+"""
+from typing import Any
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import Counter, register_source
+from app.events.bus import EventBus
+from app.events.consumer import EventConsumer
+from app.events.projection_service import ProjectionService
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectionWorker:
+    def __init__(
+        self,
+        service: ProjectionService,
+        bus: EventBus | None = None,
+        *,
+        batch_size: int | None = None,
+        max_batch_size: int | None = None,
+        poll_interval: float | None = None,
+        max_backoff: float | None = None,
+    ):
+        self.consumer = EventConsumer(service.apply, bus=bus, batch_size=batch_size)
+        self.min_batch_size = self.consumer.batch_size
+        self.max_batch_size = max(max_batch_size or settings.EVENT_MAX_BATCH_SIZE, self.min_batch_size)
+        self.poll_interval = poll_interval if poll_interval is not None else settings.EVENT_POLL_INTERVAL_S
+        self.max_backoff = max_backoff if max_backoff is not None else settings.PROJECTION_WORKER_MAX_BACKOFF_S
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+        self._failures = 0
+        self.counters = Counter("batches", "events", "idle_polls", "errors")
+        self.last_error: str | None = None
+        self.last_batch_at: float | None = None
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run(), name="projection-worker")
+            logger.info("Projection worker started")
+
+    async def stop(self, drain_timeout: float | None = None) -> None:
+        """Finish the in-flight batch, then drain pending events for up to `drain_timeout` seconds."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+        timeout = drain_timeout if drain_timeout is not None else settings.PROJECTION_WORKER_DRAIN_TIMEOUT_S
+        deadline = time.monotonic() + timeout
+        drained = 0
+        try:
+            while time.monotonic() < deadline:
+                n = await asyncio.to_thread(self.consumer.run_once)
+                if not n:
+                    break
+                drained += n
+        except Exception as e:
+            logger.warning(f"Projection worker drain stopped early: {e}")
+        logger.info(f"Projection worker stopped ({drained} events drained on shutdown)")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ---------- loop ----------
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                # pymongo / SQLAlchemy sync I/O: one batch at a time, off the event loop
+                n = await asyncio.to_thread(self.consumer.run_once)
+            except Exception as e:
+                self._failures += 1
+                self.counters.inc("errors")
+                self.last_error = str(e)
+                self.consumer.batch_size = self.min_batch_size
+                delay = min(self.poll_interval * (2 ** self._failures), self.max_backoff)
+                logger.warning(f"Projection batch failed ({e}); retrying in {delay:.1f}s")
+                await self._sleep(delay)
+                continue
+
+            self._failures = 0
+            if n:
+                self.counters.inc("batches")
+                self.counters.inc("events", n)
+                self.last_batch_at = time.time()
+            if n >= self.consumer.batch_size:
+                # backlog: no pause, bigger batches
+                self.consumer.batch_size = min(self.consumer.batch_size * 2, self.max_batch_size)
+                await asyncio.sleep(0)
+                continue
+
+            self.consumer.batch_size = self.min_batch_size
+            if not n:
+                self.counters.inc("idle_polls")
+            await self._sleep(self.poll_interval)
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            **self.counters.snapshot(),
+            "running": self.running,
+            "batch_size": self.consumer.batch_size,
+            "consecutive_failures": self._failures,
+            "seconds_since_last_batch": round(time.time() - self.last_batch_at, 3) if self.last_batch_at else None,
+            "last_error": self.last_error,
+        }
+
+
+_worker: ProjectionWorker | None = None
+
+def start_projection_worker() -> ProjectionWorker:
+    """Start the in-process worker (call after connect_to_mongo)."""
+    global _worker
+    from app.core.database import get_mongo_db
+
+    if _worker is None:
+        _worker = ProjectionWorker(ProjectionService(get_mongo_db()))
+    _worker.start()
+    return _worker
+
+async def stop_projection_worker() -> None:
+    """Stop and drain the in-process worker (call before close_mongo_connection)."""
+    if _worker is not None:
+        await _worker.stop()
+
+register_source("projection_worker", lambda: _worker.metrics() if _worker else {"running": False})
+
+
+async def _main() -> None:
+    from app.core.database import close_mongo_connection, connect_to_mongo
+    import signal
+
+    if settings.EVENT_BUS_BACKEND.lower() != "outbox":
+        raise SystemExit("A standalone worker needs EVENT_BUS_BACKEND=outbox")
+
+    connect_to_mongo()
+    worker = start_projection_worker()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+    await worker.stop()
+    close_mongo_connection()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
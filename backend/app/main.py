@@ -3,7 +3,11 @@ from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.core.cors import setup_cors
 from app.auth.firebase import init_firebase
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.database import connect_to_mongo, close_mongo_connection, dispose_async_engine
+from app.core.metrics import RouteContextMiddleware
+from app.events.worker import start_projection_worker, stop_projection_worker
+from app.services.food_service import close_http_clients
+from app.services.image_pipeline import shutdown_pool
 import logging
 import os
 
@@ -23,7 +27,9 @@ from app.api.routes import(
     progress_router,
     diary_router,
     meal_plans_router,
-    snap_meal_router
+    snap_meal_router,
+    export_router,
+    sync_router
 )
 
 logger = logging.getLogger(__name__)
@@ -111,14 +117,23 @@ async def lifespan(fastapi: FastAPI):
     # initialize services
     init_firebase()
     connect_to_mongo()
+    if settings.PROJECTION_WORKER_ENABLED:
+        start_projection_worker()
 
     yield
     logger.info("Application Shutdown...")
+    await close_http_clients()
+    shutdown_pool()
+    # drain pending projection events while Mongo is still connected
+    await stop_projection_worker()
     close_mongo_connection()
+    await dispose_async_engine()
 
 def create_app() -> FastAPI:
     app = FastAPI(title="MacroMate", version="1.0.0", lifespan=lifespan)
     setup_cors(app)
+    # lets DB pool metrics attribute connection checkouts to the matched route
+    app.add_middleware(RouteContextMiddleware)
 
     app.include_router(prefix="/api", router=auth_router)
     app.include_router(prefix="/api", router=protected_router)
@@ -136,6 +151,8 @@ def create_app() -> FastAPI:
     app.include_router(prefix="/api", router=diary_router)
     app.include_router(prefix="/api", router=meal_plans_router)
     app.include_router(prefix="/api", router=snap_meal_router)
+    app.include_router(prefix="/api", router=export_router)
+    app.include_router(prefix="/api", router=sync_router)
 
     return app
 
@@ -37,6 +37,12 @@ class UserProjection(BaseModel):
     last_synced: datetime = Field(default_factory=datetime.utcnow)
     onboarding: Optional[OnboardingProjection] = None
     current_plan_summary: Optional[Dict[str, Any]] = None
+    # full profile snapshot (UserResponse fields + is_profile_complete, onboarding_summary)
+    profile: Optional[Dict[str, Any]] = None
+    # publish time of the event that carried `profile` (older snapshots are ignored)
+    profile_at: Optional[datetime] = None
+    # publish time of the newest event applied to this document
+    last_event_at: Optional[datetime] = None
 
     class Config:
         populate_by_name = True
@@ -149,9 +155,12 @@ class Dashboard(BaseModel):
     daily_macro_summary: Optional[Dict[str, Any]] = None
     daily_target: Optional[Dict[str, Any]] = None
     last_weight_kg: Optional[float] = None
+    previous_weight_kg: Optional[float] = None
+    height_cm: Optional[int] = None
     active_plan_summary: Optional[Dict[str, Any]] = None
     last_workout_summary: Optional[Dict[str, Any]] = None
     last_updated: datetime = Field(default_factory=datetime.utcnow)
+    last_event_at: Optional[datetime] = None # newest applied event (read-model freshness)
 
     class Config:
         populate_by_name = True
@@ -1,5 +1,6 @@
 import datetime as dt
-from sqlalchemy import Float, Integer, String, Date, SmallInteger, JSON, Enum, Boolean, TIMESTAMP
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String, Date, SmallInteger, JSON, Enum, Boolean, TIMESTAMP, Index
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -47,11 +48,12 @@ class FoodEntry(Base):
     __tablename__ = "food_entries"
 
     entry_id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True)  # UUID hex
-    user_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)     # match users.user_id length
-    date: Mapped[dt.date] = mapped_column(Date, nullable=False, index=True)              # day of entry
-    meal_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)    # breakfast/lunch/dinner/snack
+    user_id: Mapped[str] = mapped_column(String(128), nullable=False)     # match users.user_id length
+    date: Mapped[dt.date] = mapped_column(Date, nullable=False)              # day of entry
+    meal_type: Mapped[str] = mapped_column(String(50), nullable=False)    # breakfast/lunch/dinner/snack
     consumed_at: Mapped[dt.datetime] = mapped_column(TIMESTAMP, nullable=False, server_default=func.now())  # timestamp user consumed
     food_api_id: Mapped[str | None] = mapped_column(String(128), nullable=True)     # id from provider (fdcId)
+    food_id: Mapped[str | None] = mapped_column(String(36), nullable=True)         # foods.food_id (catalog), if any
     food_name: Mapped[str] = mapped_column(String(255), nullable=False)               # cached name
     brand: Mapped[str | None] = mapped_column(String(255), nullable=True)
     quantity: Mapped[float | None] = mapped_column(Float, nullable=True)           # numeric amount (e.g. 150)
@@ -60,15 +62,93 @@ class FoodEntry(Base):
     protein_g: Mapped[float | None] = mapped_column(Float, nullable=True)
     carbs_g: Mapped[float | None] = mapped_column(Float, nullable=True)
     fats_g: Mapped[float | None] = mapped_column(Float, nullable=True)
-    raw: Mapped[dict | None] = mapped_column(JSON, nullable=True)                  # raw provider payload for auditing
+    # raw payload for custom foods only; provider foods keep theirs once in food_payloads.
+    # Deferred: no read path needs it, and it can be tens of KB per row.
+    raw: Mapped[dict | None] = mapped_column(JSON(none_as_null=True), nullable=True, deferred=True)
+    created_at: Mapped[dt.datetime] = mapped_column(TIMESTAMP, server_default=func.now())
+    updated_at: Mapped[dt.datetime] = mapped_column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+# Canonical food catalog: one row per provider food (shared) or per user and
+# AI-recognised food, macros for ref_quantity ref_unit (see
+# app/services/food_catalog.py). Entries copy the values scaled to their own quantity.
+class Food(Base):
+    __tablename__ = "foods"
+
+    food_id: Mapped[str] = mapped_column(String(36), primary_key=True)  # uuid5 of source:source_id
+    source: Mapped[str] = mapped_column(String(16), nullable=False)  # usda / ai
+    source_id: Mapped[str] = mapped_column(String(255), nullable=False)  # fdcId, or user_id|name|unit for ai
+    user_id: Mapped[str | None] = mapped_column(String(128), nullable=True)  # owner of ai rows; None = shared
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    name_key: Mapped[str] = mapped_column(String(255), nullable=False)  # lowercased, single-spaced (search)
+    brand: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    ref_quantity: Mapped[float] = mapped_column(Float, nullable=False)
+    ref_unit: Mapped[str] = mapped_column(String(32), nullable=False)
+    calories: Mapped[float | None] = mapped_column(Float, nullable=True)
+    protein_g: Mapped[float | None] = mapped_column(Float, nullable=True)
+    carbs_g: Mapped[float | None] = mapped_column(Float, nullable=True)
+    fats_g: Mapped[float | None] = mapped_column(Float, nullable=True)
+    created_at: Mapped[dt.datetime] = mapped_column(TIMESTAMP, server_default=func.now())
+
+Index("ix_foods_source_source_id", Food.source, Food.source_id, unique=True)
+Index("ix_foods_name_key", Food.name_key)
+
+# Full provider response per food (audit), stored once however many entries and
+# recipe ingredients reference it (see app/services/food_payloads.py).
+class FoodPayload(Base):
+    __tablename__ = "food_payloads"
+
+    food_api_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
     created_at: Mapped[dt.datetime] = mapped_column(TIMESTAMP, server_default=func.now())
 
+# Per-user per-day macro totals, maintained on every food_entries write
+# (see app/services/nutrition_rollup.py). Rebuildable from food_entries.
+class DailyNutritionTotal(Base):
+    __tablename__ = "daily_nutrition_totals"
+
+    user_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    date: Mapped[dt.date] = mapped_column(Date, primary_key=True)
+    calories: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    protein_g: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    carbs_g: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    fats_g: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[dt.datetime] = mapped_column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+# Transactional outbox: events are inserted in the same transaction as the
+# write they describe and deleted once consumed (see app/events/bus.py).
+class EventOutbox(Base):
+    __tablename__ = "event_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    aggregate_id: Mapped[str | None] = mapped_column(String(128), nullable=True)  # user_id
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # UTC, set by the publisher; microseconds kept for projection freshness checks
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"), nullable=False)
+    # failed deliveries of this event alone; at EVENT_MAX_ATTEMPTS it is parked
+    # (parked_at set) and no longer claimed, so it can't hold up later events
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0", default=0)
+    last_error: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    parked_at: Mapped[dt.datetime | None] = mapped_column(DateTime, nullable=True)
+
+# Deleted rows of the tables served by POST /api/sync, so clients can drop their
+# local copies (see app/services/sync_service.py). Written in the delete's transaction.
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstones"
+
+    tombstone_id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    table_name: Mapped[str] = mapped_column(String(32), nullable=False)
+    row_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    deleted_at: Mapped[dt.datetime] = mapped_column(TIMESTAMP, nullable=False, server_default=func.now())
+
 class WeightEntry(Base):
     __tablename__ = "weight_entries"
 
     entry_id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True)
-    user_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
-    date: Mapped[dt.date] = mapped_column(Date, nullable=False, index=True)   # day of entry
+    user_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    date: Mapped[dt.date] = mapped_column(Date, nullable=False)   # day of entry
     weight_kg: Mapped[float] = mapped_column(Float, nullable=False)
     note: Mapped[str | None] = mapped_column(String(255), nullable=True)
     created_at: Mapped[dt.datetime] = mapped_column(TIMESTAMP, server_default=func.now())
@@ -82,8 +162,8 @@ class WorkoutSession(Base):
     __tablename__ = "workout_sessions"
 
     session_id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True)
-    user_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
-    date: Mapped[dt.date] = mapped_column(Date, nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    date: Mapped[dt.date] = mapped_column(Date, nullable=False)
     name: Mapped[str | None] = mapped_column(String(120), nullable=True)
     notes: Mapped[str | None] = mapped_column(String(255), nullable=True)
     created_at: Mapped[dt.datetime] = mapped_column(TIMESTAMP, server_default=func.now())
@@ -99,7 +179,7 @@ class ExerciseEntry(Base):
     __tablename__ = "exercise_entries"
 
     entry_id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True)
-    session_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    session_id: Mapped[str] = mapped_column(String(36), nullable=False)
     user_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     exercise_name: Mapped[str] = mapped_column(String(120), nullable=False, index=True)
     sets: Mapped[list | None] = mapped_column(JSON, nullable=True)  # list of sets
@@ -113,6 +193,21 @@ class ExerciseEntry(Base):
     def __repr__(self):
         return f"<ExerciseEntry(entry_id='{self.entry_id}', exercise_name='{self.exercise_name}')>"
 
+# Composite indexes for the (user_id, date) access pattern of the log tables.
+# Leading user_id also serves plain per-user lookups.
+Index("ix_food_entries_user_date_meal", FoodEntry.user_id, FoodEntry.date, FoodEntry.meal_type)
+Index("ix_food_entries_user_date_consumed", FoodEntry.user_id, FoodEntry.date, FoodEntry.consumed_at)
+Index("ix_weight_entries_user_date", WeightEntry.user_id, WeightEntry.date.desc())
+Index("ix_workout_sessions_user_date", WorkoutSession.user_id, WorkoutSession.date)
+Index("ix_exercise_entries_session_user_created", ExerciseEntry.session_id, ExerciseEntry.user_id, ExerciseEntry.created_at)
+
+# (user_id, updated_at) for the /sync high-water-mark scans
+Index("ix_food_entries_user_updated", FoodEntry.user_id, FoodEntry.updated_at)
+Index("ix_weight_entries_user_updated", WeightEntry.user_id, WeightEntry.updated_at)
+Index("ix_workout_sessions_user_updated", WorkoutSession.user_id, WorkoutSession.updated_at)
+Index("ix_exercise_entries_user_updated", ExerciseEntry.user_id, ExerciseEntry.updated_at)
+Index("ix_sync_tombstones_user_table_deleted", SyncTombstone.user_id, SyncTombstone.table_name, SyncTombstone.deleted_at)
+
 class Recipe(Base):
     __tablename__ = "recipes"
 
@@ -146,6 +241,9 @@ class MealPlan(Base):
     def __repr__(self):
         return f"<MealPlan(plan_id='{self.plan_id}', user_id='{self.user_id}', {self.start_date}..{self.end_date})>"
 
+Index("ix_recipes_user_updated", Recipe.user_id, Recipe.updated_at)
+Index("ix_meal_plans_user_updated", MealPlan.user_id, MealPlan.updated_at)
+
 # class MealPlan(Base):
 #     __tablename__ = "meal_plans"
 #
@@ -0,0 +1,104 @@
+import datetime as dt
+from typing import Any
+from pydantic import BaseModel, Field, field_validator, model_validator
+from app.core.config import settings
+
+ALLOWED_MEAL_TYPES = {"breakfast", "lunch", "dinner", "snack"}
+
+ALLOWED_UNITS = {"g", "ml", "piece", "slice", "cup", "oz"}
+
+class FoodItemIn(BaseModel):
+    food_api_id: str | None = None
+    # foods catalog id: name, brand and macros come from the catalog, scaled to quantity
+    food_id: str | None = Field(None, max_length=36)
+    name: str | None = None
+    brand: str | None = None
+    quantity: float | None = None
+    unit: str | None = None
+    calories: int | None = None
+    protein_g: float | None = None
+    carbs_g: float | None = None
+    fats_g: float | None = None
+    raw: Any | None = None
+
+    @field_validator("quantity", "calories", "protein_g", "carbs_g", "fats_g", mode="before")
+    def non_negative(cls, v):
+        if v is None:
+            return None
+        try:
+            num = float(v)
+        except Exception:
+            raise ValueError("must be a number")
+        if num < 0:
+            raise ValueError("must be >= 0")
+        # calories should be int
+        return int(num) if isinstance(v, int) or (isinstance(v, float) and v.is_integer()) and cls.__name__ == "FoodItemIn" and False else num
+
+    @field_validator("unit")
+    def check_unit(cls, v):
+        if v is None:
+            return None
+        if v not in ALLOWED_UNITS:
+            raise ValueError(f"unit must be one of {sorted(ALLOWED_UNITS)}")
+        return v
+
+    @model_validator(mode="after")
+    def name_or_food_id(self):
+        if not self.name and not self.food_id:
+            raise ValueError("name is required unless food_id is given")
+        return self
+
+class MealIn(BaseModel):
+    # fields shared by LogRequest and BulkMealIn; each adds its own foods list
+    date: dt.date | None = None
+    meal_type: str = Field(..., description="breakfast|lunch|dinner|snack")
+    consumed_at: dt.datetime | None = None
+
+    @field_validator("meal_type")
+    def validate_meal_type(cls, v):
+        if v not in ALLOWED_MEAL_TYPES:
+            raise ValueError(f"meal_type must be one of {sorted(ALLOWED_MEAL_TYPES)}")
+        return v
+
+class LogRequest(MealIn):
+    foods: list[FoodItemIn]
+
+class BulkFoodItemIn(FoodItemIn):
+    # client-generated id: a retried upload skips entries it already created
+    entry_id: str | None = Field(None, min_length=1, max_length=36)
+
+class BulkMealIn(MealIn):
+    foods: list[BulkFoodItemIn]
+
+class BulkLogRequest(BaseModel):
+    # each meal has at least one food; the service caps the total foods
+    meals: list[BulkMealIn] = Field(..., min_length=1, max_length=settings.FOOD_INGEST_MAX_ROWS)
+
+class UpdateEntryPayload(BaseModel):
+    quantity: float | None = None
+    unit: str | None = None
+    calories: int | None = None
+    protein_g: float | None = None
+    carbs_g: float | None = None
+    fats_g: float | None = None
+    food_name: str | None = None
+    brand: str | None = None
+    consumed_at: dt.datetime | None = None
+    meal_type: str | None = None
+    date: dt.datetime | None = None
+
+    @field_validator("unit")
+    def check_unit(cls, v):
+        if v is None:
+            return v
+        if v not in ALLOWED_UNITS:
+            raise ValueError(f"unit must be one of {sorted(ALLOWED_UNITS)}")
+        return v
+
+    @field_validator("meal_type")
+    def check_meal_type(cls, v):
+        if v is None:
+            return v
+        if v not in ALLOWED_MEAL_TYPES:
+            raise ValueError(f"meal_type must be one of {sorted(ALLOWED_MEAL_TYPES)}")
+        return v
@@ -0,0 +1,76 @@
+"""
+Home dashboard served from the Mongo `dashboards` document (DashboardProjector)
+with one find_one by _id, instead of the per-request SQL aggregation.
+
+The document is used only when it is for today and fresh by the same rules as
+users_projection (`user_read_model.stale_reason`); otherwise the caller falls
+back to DashboardService.get_home_dashboard.
+"""
+from datetime import date
+from types import SimpleNamespace
+from typing import Any, Callable
+import logging
+
+from pymongo.database import Database as MongoDatabase
+
+from app.core.config import settings
+from app.core.metrics import Counter, register_source
+from app.services.dashboard_service import _build_home_payload
+from app.services.user_read_model import stale_reason
+
+logger = logging.getLogger(__name__)
+
+_counters = Counter(
+    "projection", "fallback_missing", "fallback_stale_day", "fallback_write_fence", "fallback_bus_lag", "fallback_error"
+)
+register_source("dashboard_read_model", _counters.snapshot)
+
+
+def home_payload_from_document(doc: dict[str, Any]) -> dict[str, Any]:
+    """The /dashboard/home body from a dashboards document (same builder as the SQL path)."""
+    target = doc.get("daily_target") or {}
+    user = SimpleNamespace(
+        name=doc.get("display_name"),
+        height_cm=doc.get("height_cm"),
+        onboarding_summary={
+            "daily_calories": target.get("daily_calories") or 0,
+            "macro_targets": target.get("macro_targets") or {},
+        },
+    )
+    meals = [SimpleNamespace(**m) for m in (doc.get("daily_macro_summary") or {}).get("meals", [])]
+    return _build_home_payload(user, doc.get("last_weight_kg"), doc.get("previous_weight_kg"), meals)
+
+
+class DashboardReadModel:
+    def __init__(self, mongo_db: MongoDatabase | Callable[[], MongoDatabase] | None, max_lag_s: float | None = None):
+        self._mongo = mongo_db
+        self.max_lag_s = max_lag_s if max_lag_s is not None else settings.READ_MODEL_MAX_LAG_S
+
+    def _collection(self):
+        mongo = self._mongo() if callable(self._mongo) else self._mongo
+        return mongo.get_collection("dashboards") if mongo is not None else None
+
+    def get_home(self, user_id: str) -> dict[str, Any] | None:
+        """The home payload from the projection, or None when SQL should answer."""
+        if not settings.READ_MODEL_ENABLED:
+            return None
+        try:
+            coll = self._collection()
+            doc = coll.find_one({"_id": user_id}) if coll is not None else None
+        except Exception as e:
+            _counters.inc("fallback_error")
+            logger.warning("dashboards read failed for %s: %s", user_id, e)
+            return None
+        if not doc:
+            _counters.inc("fallback_missing")
+            return None
+        # today's meals roll over at midnight without any event
+        if doc.get("current_date") != date.today().isoformat():
+            _counters.inc("fallback_stale_day")
+            return None
+        reason = stale_reason(user_id, doc.get("last_event_at"), self.max_lag_s)
+        if reason is not None:
+            _counters.inc(f"fallback_{reason}")
+            return None
+        _counters.inc("projection")
+        return home_payload_from_document(doc)
@@ -1,18 +1,18 @@
 from datetime import date, timedelta
 from typing import Any
 
-from sqlalchemy import func
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.metrics import LatencyStat, StageTimer, register_source
 from app.services.food_log_service import FoodLogService
 from app.services.nutrition_service import NutritionService
+from app.services import timeseries
+from app.services.response_cache import ResponseCache, get_response_cache
 from app.services.weight_service import WeightService
 from app.services.workout_service import WorkoutService
-from app.models.sql_models import User, FoodEntry, WeightEntry, WorkoutSession, ExerciseEntry
-
-def _date_range(start: date, end: date) -> list[date]:
-    days = (end - start).days
-    return [start + timedelta(days=i) for i in range(days + 1)]
+from app.models.sql_models import User, FoodEntry, DailyNutritionTotal, WeightEntry, WorkoutSession, ExerciseEntry
 
 def _macros_from_percentages(calories: int, protein_pct: int, carbs_pct: int, fat_pct: int) -> dict[str, int]:
     """Return grams for protein, carbs, fats given calorie totals and percentages."""
@@ -24,9 +24,268 @@ def _macros_from_percentages(calories: int, protein_pct: int, carbs_pct: int, fa
     return {"protein_g": int(protein_g), "carbs_g": int(carbs_g), "fats_g": int(fats_g),
             "protein_pct": protein_pct, "carbs_pct": carbs_pct, "fat_pct": fat_pct}
 
+def _completed_week_range(ref: date | None = None) -> tuple[date, date]:
+    """
+    Returns (monday, sunday) for the *last completed* week relative to ref (or today).
+    Example: if today=Thu 2025-09-25, last completed week is Mon 2025-09-15 .. Sun 2025-09-21.
+    """
+    today = ref or date.today()
+    # last completed week's sunday = yesterday - offset (weekday+1)
+    last_sunday = today - timedelta(days=(today.weekday() + 1))
+    last_monday = last_sunday - timedelta(days=6)
+    return last_monday, last_sunday
+
+def _completed_month_range(ref: date | None = None) -> tuple[date, date]:
+    """
+    Return first_day, last_day for last completed month relative to ref (or today).
+    """
+    today = ref or date.today()
+    first_this_month = date(today.year, today.month, 1)
+    last_day_prev_month = first_this_month - timedelta(days=1)
+    first_day_prev_month = date(last_day_prev_month.year, last_day_prev_month.month, 1)
+    return first_day_prev_month, last_day_prev_month
+
+def _week_bounds(week_monday: date | None) -> tuple[date, date]:
+    if week_monday is None:
+        return _completed_week_range()
+    return week_monday, week_monday + timedelta(days=6)
+
+def _month_bounds(month_start: date | None) -> tuple[date, date]:
+    if month_start is None:
+        return _completed_month_range()
+    # if user passed a particular month_start, normalize to first day of that month
+    start = date(month_start.year, month_start.month, 1)
+    # compute last day of that month
+    next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+
+# ─────────────────────────────
+# Statements shared by the sync and async services
+# ─────────────────────────────
+def _home_user_weights_stmt(user_id: str):
+    """
+    The user row outer-joined to their two most recent weigh-in days
+    (day_rank 1 = latest, 2 = the weigh-in day before it). One row per rank,
+    a single row with NULL weight when the user has no weigh-ins.
+    """
+    ranked = (
+        select(
+            WeightEntry.user_id,
+            WeightEntry.weight_kg,
+            func.dense_rank().over(order_by=WeightEntry.date.desc()).label("day_rank"),
+            func.row_number().over(
+                partition_by=WeightEntry.date,
+                order_by=WeightEntry.created_at.desc(),
+            ).label("rn"),
+        )
+        .where(WeightEntry.user_id == user_id)
+        .subquery()
+    )
+    return (
+        select(User, ranked.c.weight_kg, ranked.c.day_rank)
+        .outerjoin(
+            ranked,
+            and_(ranked.c.user_id == User.user_id, ranked.c.rn == 1, ranked.c.day_rank <= 2),
+        )
+        .where(User.user_id == user_id)
+        .order_by(ranked.c.day_rank)
+    )
+
+def _home_meals_stmt(user_id: str, day: date):
+    """Per-meal-type totals for the day; the day totals are summed from these rows."""
+    return (
+        select(
+            FoodEntry.meal_type,
+            func.coalesce(func.sum(FoodEntry.calories), 0).label("calories"),
+            func.coalesce(func.sum(FoodEntry.protein_g), 0).label("protein_g"),
+            func.coalesce(func.sum(FoodEntry.carbs_g), 0).label("carbs_g"),
+            func.coalesce(func.sum(FoodEntry.fats_g), 0).label("fats_g"),
+            func.min(FoodEntry.consumed_at).label("time"),
+        )
+        .where(
+            FoodEntry.user_id == user_id,
+            FoodEntry.date == day,
+        )
+        .group_by(FoodEntry.meal_type)
+    )
+
+def _split_user_weights(rows) -> tuple[User | None, float | None, float | None]:
+    """(user, latest_weight_kg, previous_weight_kg) from _home_user_weights_stmt rows."""
+    if not rows:
+        return None, None, None
+    weights = {r.day_rank: r.weight_kg for r in rows if r.day_rank is not None}
+    return rows[0][0], weights.get(1), weights.get(2)
+
+# home dashboard per-stage latency, across requests
+_home_stage_stats: dict[str, LatencyStat] = {}
+register_source("dashboard_home", lambda: {k: v.snapshot() for k, v in _home_stage_stats.items()})
+
+def home_stage_timer() -> StageTimer:
+    return StageTimer(_home_stage_stats)
+
+def _food_by_day_stmt(user_id: str, start: date, end: date):
+    # one pre-aggregated row per logged day (daily_nutrition_totals)
+    return (
+        select(
+            DailyNutritionTotal.date.label("d"),
+            DailyNutritionTotal.calories,
+            DailyNutritionTotal.protein_g,
+            DailyNutritionTotal.carbs_g,
+            DailyNutritionTotal.fats_g,
+        )
+        .where(
+            DailyNutritionTotal.user_id == user_id,
+            DailyNutritionTotal.date >= start,
+            DailyNutritionTotal.date <= end,
+        )
+    )
+
+def _weight_by_day_stmt(user_id: str, start: date, end: date):
+    # take latest weight of the day — use MAX(weight)
+    return (
+        select(WeightEntry.date.label("d"), func.max(WeightEntry.weight_kg).label("weight_kg"))
+        .where(WeightEntry.user_id == user_id, WeightEntry.date >= start, WeightEntry.date <= end)
+        .group_by(WeightEntry.date)
+    )
+
+def _volume_by_day_stmt(user_id: str, start: date, end: date):
+    # join exercise_entries -> workout_sessions
+    return (
+        select(WorkoutSession.date.label("d"), func.coalesce(func.sum(ExerciseEntry.total_volume), 0).label("volume"))
+        .join(ExerciseEntry, ExerciseEntry.session_id == WorkoutSession.session_id)
+        .where(WorkoutSession.user_id == user_id, WorkoutSession.date >= start, WorkoutSession.date <= end)
+        .group_by(WorkoutSession.date)
+    )
+
+# ─────────────────────────────
+# Payload builders
+# ─────────────────────────────
+# user: a User, or a SimpleNamespace of its name / height_cm / onboarding_summary (projection)
+def _build_home_payload(user: Any, latest_weight_kg: float | None, previous_weight_kg: float | None, meals) -> dict[str, Any]:
+    calories_consumed = sum(int(m.calories) for m in meals)
+    protein_g = sum(float(m.protein_g) for m in meals)
+    carbs_g = sum(float(m.carbs_g) for m in meals)
+    fats_g = sum(float(m.fats_g) for m in meals)
+
+    # ─────────────────────────────
+    # User info
+    # ─────────────────────────────
+    user_block = {
+        "name": user.name or "User",
+        "avatarUrl": None,
+    }
+
+    # ─────────────────────────────
+    # Targets (from onboarding)
+    # ─────────────────────────────
+    summary = user.onboarding_summary or {}
+    calorie_goal = int(summary.get("daily_calories", 0))
+    macro_targets = summary.get("macro_targets", {})
+
+    protein_pct = int(macro_targets.get("protein_pct", 0))
+    carbs_pct = int(macro_targets.get("carbs_pct", 0))
+    fat_pct = int(macro_targets.get("fat_pct", 0))
+
+    # ─────────────────────────────
+    # Target macro grams
+    # ─────────────────────────────
+    target_protein_g = int((calorie_goal * protein_pct / 100) / 4) if calorie_goal else 0
+    target_carbs_g = int((calorie_goal * carbs_pct / 100) / 4) if calorie_goal else 0
+    target_fats_g = int((calorie_goal * fat_pct / 100) / 9) if calorie_goal else 0
+
+    # ─────────────────────────────
+    # Remaining macros
+    # ─────────────────────────────
+    remaining_macros = {
+        "proteinG": max(target_protein_g - protein_g, 0),
+        "carbsG": max(target_carbs_g - carbs_g, 0),
+        "fatG": max(target_fats_g - fats_g, 0),
+    }
+
+    nutrition_block = {
+        "caloriesConsumed": int(calories_consumed),
+        "calorieGoal": calorie_goal,
+
+        "macroTargets": {
+            "proteinPercent": protein_pct,
+            "carbsPercent": carbs_pct,
+            "fatPercent": fat_pct,
+        },
+
+        "macroConsumed": {
+            "proteinG": round(protein_g, 1),
+            "carbsG": round(carbs_g, 1),
+            "fatG": round(fats_g, 1),
+        },
+
+        "macroRemaining": remaining_macros,
+    }
+
+    weight_change = (
+        round(latest_weight_kg - previous_weight_kg, 1)
+        if latest_weight_kg is not None and previous_weight_kg is not None
+        else None
+    )
+
+    diary_meals = [
+        {
+            "id": f"meal_{i+1}",
+            "type": m.meal_type.title(),
+            "time": m.time.strftime("%H:%M") if m.time else None,
+            "calories": int(m.calories),
+        }
+        for i, m in enumerate(meals)
+    ]
+
+    # ─────────────────────────────
+    # Final response
+    # ─────────────────────────────
+    return {
+        "user": user_block,
+        "nutrition": nutrition_block,
+        "vitals": {
+            "weight": {
+                "value": latest_weight_kg,
+                "unit": "kg",
+                "change": weight_change,
+            },
+            "water": {
+                "consumed": 0.0,
+                "goal": 3.0,
+                "unit": "L",
+            },
+            "steps": {
+                "count": 0,
+                "goal": 10000,
+            },
+        },
+        "todaysDiary": {
+            "totalCalories": int(calories_consumed),
+            "meals": diary_meals,
+        },
+        "bodyMetrics": {
+            "heightCm": user.height_cm,
+            "weightKg": latest_weight_kg,
+        },
+        "quickAccess": {
+            "showSnapMeal": True,
+            "showLogWater": True,
+        },
+    }
+
+def _build_time_series(start: date, end: date, food_q, weight_q, vol_q, layout: str = "rows") -> dict[str, Any]:
+    cols = timeseries.dense_columns(start, end, food_q, weight_q, vol_q)
+    if layout == "columns":
+        return timeseries.columns_payload(cols)
+    return timeseries.rows_payload(cols)
+
+def _period_summary(start: date, end: date, times: dict[str, Any]) -> dict[str, Any]:
+    return {"start": start.isoformat(), "end": end.isoformat(), "days": times["series"], "totals": times["totals"], "average_per_day": times["average"]}
+
 class DashboardService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: ResponseCache | None = None):
         self.db = db
+        self.cache = cache or get_response_cache()
         self.food_svc = FoodLogService(db)
         self.nutrition_svc = NutritionService(db)
         self.weight_svc = WeightService(db)
@@ -160,178 +419,33 @@ class DashboardService:
     #         },
     #     }
 
-    def get_home_dashboard(self, user_id: str):
+    def get_home_dashboard(self, user_id: str, timer: StageTimer | None = None):
+        """
+        Two round-trips: user + last two weigh-ins (windowed), then today's
+        per-meal totals. Stage durations land in `timer` when given.
+        """
+        timer = timer or home_stage_timer()
         today = date.today()
 
-        user = self.db.query(User).filter(User.user_id == user_id).first()
+        with timer.stage("user_weights"):
+            rows = self.db.execute(_home_user_weights_stmt(user_id)).all()
+        user, latest_kg, previous_kg = _split_user_weights(rows)
         if not user:
             raise ValueError("User not found")
 
-        # ─────────────────────────────
-        # User info
-        # ─────────────────────────────
-        user_block = {
-            "name": user.name or "User",
-            "avatarUrl": None,
-        }
-
-        # ─────────────────────────────
-        # Targets (from onboarding)
-        # ─────────────────────────────
-        summary = user.onboarding_summary or {}
-        calorie_goal = int(summary.get("daily_calories", 0))
-        macro_targets = summary.get("macro_targets", {})
-
-        protein_pct = int(macro_targets.get("protein_pct", 0))
-        carbs_pct = int(macro_targets.get("carbs_pct", 0))
-        fat_pct = int(macro_targets.get("fat_pct", 0))
-
-        # ─────────────────────────────
-        # Consumed macros (ONE QUERY)
-        # ─────────────────────────────
-        calories_consumed, protein_g, carbs_g, fats_g = (
-            self.db.query(
-                func.coalesce(func.sum(FoodEntry.calories), 0),
-                func.coalesce(func.sum(FoodEntry.protein_g), 0),
-                func.coalesce(func.sum(FoodEntry.carbs_g), 0),
-                func.coalesce(func.sum(FoodEntry.fats_g), 0),
-            )
-            .filter(
-                FoodEntry.user_id == user_id,
-                FoodEntry.date == today,
-            )
-            .one()
-        )
-
-        # ─────────────────────────────
-        # Target macro grams
-        # ─────────────────────────────
-        target_protein_g = int((calorie_goal * protein_pct / 100) / 4) if calorie_goal else 0
-        target_carbs_g = int((calorie_goal * carbs_pct / 100) / 4) if calorie_goal else 0
-        target_fats_g = int((calorie_goal * fat_pct / 100) / 9) if calorie_goal else 0
-
-        # ─────────────────────────────
-        # Remaining macros
-        # ─────────────────────────────
-        remaining_macros = {
-            "proteinG": max(target_protein_g - protein_g, 0),
-            "carbsG": max(target_carbs_g - carbs_g, 0),
-            "fatG": max(target_fats_g - fats_g, 0),
-        }
-
-        nutrition_block = {
-            "caloriesConsumed": int(calories_consumed),
-            "calorieGoal": calorie_goal,
-
-            "macroTargets": {
-                "proteinPercent": protein_pct,
-                "carbsPercent": carbs_pct,
-                "fatPercent": fat_pct,
-            },
-
-            "macroConsumed": {
-                "proteinG": round(protein_g, 1),
-                "carbsG": round(carbs_g, 1),
-                "fatG": round(fats_g, 1),
-            },
-
-            "macroRemaining": remaining_macros,
-        }
-
-        # ─────────────────────────────
-        # Weight (latest)
-        # ─────────────────────────────
-        latest_weight = (
-            self.db.query(WeightEntry)
-            .filter(WeightEntry.user_id == user_id)
-            .order_by(WeightEntry.date.desc())
-            .first()
-        )
-
-        last_weight = (
-            self.db.query(WeightEntry)
-            .filter(
-                WeightEntry.user_id == user_id,
-                WeightEntry.date < (latest_weight.date if latest_weight else today),
-            )
-            .order_by(WeightEntry.date.desc())
-            .first()
-        )
-
-        weight_change = (
-            round(latest_weight.weight_kg - last_weight.weight_kg, 1)
-            if latest_weight and last_weight
-            else None
-        )
-
-        # ─────────────────────────────
-        # Diary (today)
-        # ─────────────────────────────
-        meals = (
-            self.db.query(
-                FoodEntry.meal_type,
-                func.sum(FoodEntry.calories).label("calories"),
-                func.min(FoodEntry.consumed_at).label("time"),
-            )
-            .filter(
-                FoodEntry.user_id == user_id,
-                FoodEntry.date == today,
-            )
-            .group_by(FoodEntry.meal_type)
-            .all()
-        )
-
-        diary_meals = [
-            {
-                "id": f"meal_{i+1}",
-                "type": m.meal_type.title(),
-                "time": m.time.strftime("%H:%M") if m.time else None,
-                "calories": int(m.calories),
-            }
-            for i, m in enumerate(meals)
-        ]
-
-        # ─────────────────────────────
-        # Final response
-        # ─────────────────────────────
-        return {
-            "user": user_block,
-            "nutrition": nutrition_block,
-            "vitals": {
-                "weight": {
-                    "value": latest_weight.weight_kg if latest_weight else None,
-                    "unit": "kg",
-                    "change": weight_change,
-                },
-                "water": {
-                    "consumed": 0.0,
-                    "goal": 3.0,
-                    "unit": "L",
-                },
-                "steps": {
-                    "count": 0,
-                    "goal": 10000,
-                },
-            },
-            "todaysDiary": {
-                "totalCalories": int(calories_consumed),
-                "meals": diary_meals,
-            },
-            "bodyMetrics": {
-                "heightCm": user.height_cm,
-                "weightKg": latest_weight.weight_kg if latest_weight else None,
-            },
-            "quickAccess": {
-                "showSnapMeal": True,
-                "showLogWater": True,
-            },
-        }
+        with timer.stage("meals"):
+            meals = self.db.execute(_home_meals_stmt(user_id, today)).all()
 
+        with timer.stage("build"):
+            return _build_home_payload(user, latest_kg, previous_kg, meals)
 
     # --------------------------
     # Daily dashboard
     # --------------------------
     def get_daily_dashboard(self, user_id: str, day: date) -> dict[str, Any]:
+        return self.cache.get_or_compute(user_id, "daily", (day,), lambda: self._daily_dashboard(user_id, day))
+
+    def _daily_dashboard(self, user_id: str, day: date) -> dict[str, Any]:
         """
         Returns:
          {
@@ -413,110 +527,86 @@ class DashboardService:
     # --------------------------
     # Time-series helper
     # --------------------------
-    def get_time_series(self, user_id: str, start: date, end: date) -> dict[str, Any]:
+    def get_time_series(self, user_id: str, start: date, end: date, layout: str = "rows") -> dict[str, Any]:
         """
-        Returns daily arrays for calories/protein/carbs/fats/weight/workout_volume between start..end inclusive.
+        Returns daily arrays for calories/protein/carbs/fats/weight/workout_volume between start..end inclusive
+        (layout "rows": one dict per day; "columns": parallel arrays, see app.services.timeseries).
         """
         if end < start:
             raise ValueError("end must be >= start")
-
-        # Food aggregates by date
-        food_q = (
-            self.db.query(
-                FoodEntry.date.label("d"),
-                func.coalesce(func.sum(FoodEntry.calories), 0).label("calories"),
-                func.coalesce(func.sum(FoodEntry.protein_g), 0).label("protein_g"),
-                func.coalesce(func.sum(FoodEntry.carbs_g), 0).label("carbs_g"),
-                func.coalesce(func.sum(FoodEntry.fats_g), 0).label("fats_g"),
-            )
-            .filter(FoodEntry.user_id == user_id, FoodEntry.date >= start, FoodEntry.date <= end)
-            .group_by(FoodEntry.date)
-        )
-        food_rows = {r.d: {"calories": int(r.calories), "protein_g": float(r.protein_g),
-                           "carbs_g": float(r.carbs_g), "fats_g": float(r.fats_g)} for r in food_q.all()}
-
-        # Weight aggregates by date (take latest weight of the day) — use MAX(weight)
-        weight_q = (
-            self.db.query(WeightEntry.date.label("d"), func.max(WeightEntry.weight_kg).label("weight_kg"))
-            .filter(WeightEntry.user_id == user_id, WeightEntry.date >= start, WeightEntry.date <= end)
-            .group_by(WeightEntry.date)
+        return self.cache.get_or_compute(
+            user_id, "time_series", (start, end, layout), lambda: self._time_series(user_id, start, end, layout)
         )
-        weight_rows = {r.d: float(r.weight_kg) for r in weight_q.all()}
-
-        # Workout volume by session date (join exercise_entries -> workout_sessions)
-        vol_q = (
-            self.db.query(WorkoutSession.date.label("d"), func.coalesce(func.sum(ExerciseEntry.total_volume), 0).label("volume"))
-            .join(ExerciseEntry, ExerciseEntry.session_id == WorkoutSession.session_id)
-            .filter(WorkoutSession.user_id == user_id, WorkoutSession.date >= start, WorkoutSession.date <= end)
-            .group_by(WorkoutSession.date)
-        )
-        vol_rows = {r.d: float(r.volume) for r in vol_q.all()}
-
-        series = []
-        for d in _date_range(start, end):
-            fd = food_rows.get(d, {"calories": 0, "protein_g": 0.0, "carbs_g": 0.0, "fats_g": 0.0})
-            series.append({
-                "date": d.isoformat(),
-                "calories": int(fd["calories"]),
-                "protein_g": float(fd["protein_g"]),
-                "carbs_g": float(fd["carbs_g"]),
-                "fats_g": float(fd["fats_g"]),
-                "weight_kg": weight_rows.get(d),
-                "workout_volume": vol_rows.get(d, 0.0),
-            })
-
-        # also compute totals & averages
-        totals = {"calories": sum(s["calories"] for s in series),
-                  "protein_g": sum(s["protein_g"] for s in series),
-                  "carbs_g": sum(s["carbs_g"] for s in series),
-                  "fats_g": sum(s["fats_g"] for s in series)}
-        avg = {k: (totals[k] / len(series) if series else 0) for k in totals}
-
-        return {"start": start.isoformat(), "end": end.isoformat(), "series": series, "totals": totals, "average": avg}
+
+    def _time_series(self, user_id: str, start: date, end: date, layout: str = "rows") -> dict[str, Any]:
+        food_q = self.db.execute(_food_by_day_stmt(user_id, start, end)).all()
+        weight_q = self.db.execute(_weight_by_day_stmt(user_id, start, end)).all()
+        vol_q = self.db.execute(_volume_by_day_stmt(user_id, start, end)).all()
+        return _build_time_series(start, end, food_q, weight_q, vol_q, layout)
 
     # --------------------------
     # Weekly / Monthly summaries
     # --------------------------
-    def _completed_week_range(self, ref: date | None = None) -> tuple[date, date]:
-        """
-        Returns (monday, sunday) for the *last completed* week relative to ref (or today).
-        Example: if today=Thu 2025-09-25, last completed week is Mon 2025-09-15 .. Sun 2025-09-21.
-        """
-        today = ref or date.today()
-        # last completed week's sunday = yesterday - offset (weekday+1)
-        last_sunday = today - timedelta(days=(today.weekday() + 1))
-        last_monday = last_sunday - timedelta(days=6)
-        return last_monday, last_sunday
-
-    def _completed_month_range(self, ref: date | None = None) -> tuple[date, date]:
-        """
-        Return first_day, last_day for last completed month relative to ref (or today).
-        """
-        today = ref or date.today()
-        first_this_month = date(today.year, today.month, 1)
-        last_day_prev_month = first_this_month - timedelta(days=1)
-        first_day_prev_month = date(last_day_prev_month.year, last_day_prev_month.month, 1)
-        return first_day_prev_month, last_day_prev_month
-
     def get_weekly_summary(self, user_id: str, week_monday: date | None = None) -> dict[str, Any]:
-        if week_monday is None:
-            start, end = self._completed_week_range()
-        else:
-            start = week_monday
-            end = start + timedelta(days=6)
-        times = self.get_time_series(user_id, start, end)
+        start, end = _week_bounds(week_monday)
         # Add simple week-level metrics (sum/avg)
-        totals = times["totals"]
-        return {"start": start.isoformat(), "end": end.isoformat(), "days": times["series"], "totals": totals, "average_per_day": times["average"]}
+        return self.cache.get_or_compute(
+            user_id, "weekly", (start, end), lambda: _period_summary(start, end, self._time_series(user_id, start, end))
+        )
 
     def get_monthly_summary(self, user_id: str, month_start: date | None = None) -> dict[str, Any]:
-        if month_start is None:
-            start, end = self._completed_month_range()
-        else:
-            # if user passed a particular month_start, normalize to first day of that month
-            start = date(month_start.year, month_start.month, 1)
-            # compute last day of that month
-            next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
-            end = next_month - timedelta(days=1)
-        times = self.get_time_series(user_id, start, end)
-        return {"start": start.isoformat(), "end": end.isoformat(), "days": times["series"], "totals": times["totals"], "average_per_day": times["average"]}
+        start, end = _month_bounds(month_start)
+        return self.cache.get_or_compute(
+            user_id, "monthly", (start, end), lambda: _period_summary(start, end, self._time_series(user_id, start, end))
+        )
+
+
+class AsyncDashboardService:
+    """
+    Async variant of the read-heavy dashboard endpoints (home, time-series,
+    weekly/monthly). Shares statements and payload builders with DashboardService.
+    """
+
+    def __init__(self, db: AsyncSession, cache: ResponseCache | None = None):
+        self.db = db
+        self.cache = cache or get_response_cache()
+
+    async def get_home_dashboard(self, user_id: str, timer: StageTimer | None = None):
+        timer = timer or home_stage_timer()
+        today = date.today()
+
+        with timer.stage("user_weights"):
+            rows = (await self.db.execute(_home_user_weights_stmt(user_id))).all()
+        user, latest_kg, previous_kg = _split_user_weights(rows)
+        if not user:
+            raise ValueError("User not found")
+
+        with timer.stage("meals"):
+            meals = (await self.db.execute(_home_meals_stmt(user_id, today))).all()
+
+        with timer.stage("build"):
+            return _build_home_payload(user, latest_kg, previous_kg, meals)
+
+    async def get_time_series(self, user_id: str, start: date, end: date, layout: str = "rows") -> dict[str, Any]:
+        if end < start:
+            raise ValueError("end must be >= start")
+        return await self.cache.aget_or_compute(
+            user_id, "time_series", (start, end, layout), lambda: self._time_series(user_id, start, end, layout)
+        )
+
+    async def _time_series(self, user_id: str, start: date, end: date, layout: str = "rows") -> dict[str, Any]:
+        food_q = (await self.db.execute(_food_by_day_stmt(user_id, start, end))).all()
+        weight_q = (await self.db.execute(_weight_by_day_stmt(user_id, start, end))).all()
+        vol_q = (await self.db.execute(_volume_by_day_stmt(user_id, start, end))).all()
+        return _build_time_series(start, end, food_q, weight_q, vol_q, layout)
+
+    async def get_weekly_summary(self, user_id: str, week_monday: date | None = None) -> dict[str, Any]:
+        start, end = _week_bounds(week_monday)
+        return await self.cache.aget_or_compute(user_id, "weekly", (start, end), lambda: self._period(user_id, start, end))
+
+    async def get_monthly_summary(self, user_id: str, month_start: date | None = None) -> dict[str, Any]:
+        start, end = _month_bounds(month_start)
+        return await self.cache.aget_or_compute(user_id, "monthly", (start, end), lambda: self._period(user_id, start, end))
+
+    async def _period(self, user_id: str, start: date, end: date) -> dict[str, Any]:
+        return _period_summary(start, end, await self._time_series(user_id, start, end))
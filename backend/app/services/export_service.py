@@ -0,0 +1,111 @@
+"""
+Full-history exports (food entries, weigh-ins, workouts) as NDJSON or CSV.
+
+Rows are read through a server-side cursor (AsyncSession.stream with
+yield_per) and encoded one partition at a time, so memory stays flat however
+long the history is. The export opens its own session: the response body is
+produced after the request's dependencies have been closed.
+"""
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable
+import csv
+import io
+import json
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sql_models import ExerciseEntry, FoodEntry, WeightEntry, WorkoutSession
+from app.services.food_log_service import _ITEM_COLUMNS
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_BATCH_ROWS = 1000
+
+
+def _food_stmt(user_id: str):
+    return select(*_ITEM_COLUMNS).where(FoodEntry.user_id == user_id).order_by(
+        FoodEntry.date, FoodEntry.consumed_at, FoodEntry.entry_id
+    )
+
+def _weights_stmt(user_id: str):
+    return (
+        select(WeightEntry.entry_id, WeightEntry.date, WeightEntry.weight_kg, WeightEntry.note, WeightEntry.created_at)
+        .where(WeightEntry.user_id == user_id)
+        .order_by(WeightEntry.date, WeightEntry.created_at, WeightEntry.entry_id)
+    )
+
+def _workouts_stmt(user_id: str):
+    """One row per exercise, with its session's day and name."""
+    return (
+        select(
+            WorkoutSession.session_id,
+            WorkoutSession.date,
+            WorkoutSession.name.label("session_name"),
+            ExerciseEntry.entry_id,
+            ExerciseEntry.exercise_name,
+            ExerciseEntry.sets,
+            ExerciseEntry.total_volume,
+            ExerciseEntry.notes,
+        )
+        .join(ExerciseEntry, ExerciseEntry.session_id == WorkoutSession.session_id)
+        .where(WorkoutSession.user_id == user_id)
+        .order_by(WorkoutSession.date, WorkoutSession.created_at, WorkoutSession.session_id, ExerciseEntry.created_at)
+    )
+
+EXPORT_KINDS: dict[str, Callable[[str], Any]] = {
+    "food": _food_stmt,
+    "weights": _weights_stmt,
+    "workouts": _workouts_stmt,
+}
+
+
+def _range(stmt, kind: str, start: date | None, end: date | None):
+    col = {"food": FoodEntry.date, "weights": WeightEntry.date, "workouts": WorkoutSession.date}[kind]
+    if start is not None:
+        stmt = stmt.where(col >= start)
+    if end is not None:
+        stmt = stmt.where(col <= end)
+    return stmt
+
+def _plain(v: Any) -> Any:
+    return v.isoformat() if isinstance(v, (date, datetime)) else v
+
+
+# ---------- encoders: one chunk of text per partition ----------
+def _ndjson(rows, header: bool) -> str:
+    return "".join(json.dumps({k: _plain(v) for k, v in r._mapping.items()}, separators=(",", ":")) + "\n" for r in rows)
+
+def _csv(rows, header: bool) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header and rows:
+        writer.writerow(rows[0]._fields)
+    for r in rows:
+        # nested values (workout sets) as JSON in a single cell
+        writer.writerow(json.dumps(v) if isinstance(v, (list, dict)) else _plain(v) for v in r)
+    return buf.getvalue()
+
+
+async def stream_export(
+    session_factory: Callable[[], AsyncSession],
+    kind: str,
+    user_id: str,
+    fmt: str = "ndjson",
+    start: date | None = None,
+    end: date | None = None,
+    batch_rows: int = EXPORT_BATCH_ROWS,
+) -> AsyncIterator[str]:
+    """Yield the export body in chunks of up to `batch_rows` rows."""
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"kind must be one of {sorted(EXPORT_KINDS)}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {sorted(EXPORT_FORMATS)}")
+    encode = _ndjson if fmt == "ndjson" else _csv
+    stmt = _range(EXPORT_KINDS[kind](user_id), kind, start, end).execution_options(yield_per=batch_rows)
+
+    async with session_factory() as db:
+        result = await db.stream(stmt)
+        first = True
+        async for rows in result.partitions():
+            yield encode(rows, header=first)
+            first = False
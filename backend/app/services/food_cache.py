@@ -0,0 +1,240 @@
+"""
+Two-tier cache for food provider lookups.
+
+- memory: per-process LRU (cachetools), entries expire at their own TTL
+- persistent: Mongo `food_api_cache` collection, shared by all workers and
+  surviving restarts; a TTL index lets Mongo purge expired docs
+
+Keys are `details:<provider>:<id>` and `search:<provider>:<page>:<size>:<query>`
+(query lower-cased, whitespace collapsed). Provider 404s are cached as
+negative entries and surface as FoodNotFoundError. Cached values are shared
+between callers and must be treated as read-only.
+"""
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+import logging
+import threading
+import time
+
+from cachetools import TLRUCache
+from pymongo.database import Database as MongoDatabase
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import Counter, register_source
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "food_api_cache"
+
+_MISSING = object()
+
+
+class FoodNotFoundError(LookupError):
+    """The provider has no food with this id (possibly answered from cache)."""
+
+
+def details_key(provider: str, food_id: str) -> str:
+    return f"details:{provider}:{str(food_id).strip()}"
+
+def search_key(provider: str, query: str, page: int, page_size: int) -> str:
+    normalized = " ".join(query.lower().split())
+    return f"search:{provider}:{page}:{page_size}:{normalized}"
+
+
+class FoodLookupCache:
+    def __init__(
+        self,
+        mongo: Callable[[], MongoDatabase] | None = None,
+        memory_size: int = 5000,
+    ):
+        # entry = (value, negative, expires_at epoch)
+        self._memory: TLRUCache[str, tuple[Any, bool, float]] = TLRUCache(
+            maxsize=memory_size, ttu=lambda _k, v, _now: v[2], timer=time.time
+        )
+        self._lock = threading.Lock()
+        self._mongo = mongo
+        self._indexed = False
+        # after a Mongo failure, skip the persistent tier for a while instead
+        # of paying the server-selection timeout on every lookup
+        self._persistent_down_until = 0.0
+        self.counters = Counter(
+            "memory_hits", "persistent_hits", "misses", "negative_hits", "stores", "persistent_errors"
+        )
+
+    # ---------- persistent tier ----------
+    def _collection(self):
+        if self._mongo is None or time.time() < self._persistent_down_until:
+            return None
+        try:
+            coll = self._mongo()[COLLECTION]
+            if not self._indexed:
+                coll.create_index("expires_at", expireAfterSeconds=0)
+                self._indexed = True
+            return coll
+        except Exception:
+            # Mongo not connected (scripts, tests) -> memory tier only
+            self._mark_persistent_down()
+            return None
+
+    def _mark_persistent_down(self) -> None:
+        self.counters.inc("persistent_errors")
+        self._persistent_down_until = time.time() + 60
+
+    def _persistent_get(self, key: str):
+        coll = self._collection()
+        if coll is None:
+            return None
+        try:
+            doc = coll.find_one({"_id": key})
+        except Exception as e:
+            self._mark_persistent_down()
+            logger.warning("food cache read failed for %s: %s", key, e)
+            return None
+        if not doc:
+            return None
+        expires_at = doc["expires_at"].replace(tzinfo=timezone.utc).timestamp()
+        # the TTL monitor only runs every ~60s
+        if expires_at <= time.time():
+            return None
+        return doc.get("value"), bool(doc.get("negative")), expires_at
+
+    def _persistent_set(self, key: str, value: Any, negative: bool, expires_at: float) -> None:
+        coll = self._collection()
+        if coll is None:
+            return
+        try:
+            coll.replace_one(
+                {"_id": key},
+                {
+                    "value": value,
+                    "negative": negative,
+                    "expires_at": datetime.fromtimestamp(expires_at, tz=timezone.utc),
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            self._mark_persistent_down()
+            logger.warning("food cache write failed for %s: %s", key, e)
+
+    # ---------- lookups ----------
+    def _memory_lookup(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is not None:
+            self.counters.inc("memory_hits")
+        return entry
+
+    def _persistent_lookup(self, key: str):
+        entry = self._persistent_get(key)
+        if entry is None:
+            self.counters.inc("misses")
+            return None
+        self.counters.inc("persistent_hits")
+        with self._lock:
+            self._memory[key] = entry
+        return entry
+
+    def _unwrap(self, key: str, entry):
+        if entry is None:
+            return _MISSING
+        value, negative, _ = entry
+        if negative:
+            self.counters.inc("negative_hits")
+            raise FoodNotFoundError(key)
+        return value
+
+    def _store(self, key: str, value: Any, ttl: float, negative: bool = False):
+        entry = (value, negative, time.time() + ttl)
+        with self._lock:
+            self._memory[key] = entry
+        self.counters.inc("stores")
+        return entry
+
+    # ---------- public ----------
+    def get(self, key: str) -> Any:
+        """Cached value, or _MISSING. Raises FoodNotFoundError for a cached negative."""
+        entry = self._memory_lookup(key)
+        if entry is None:
+            entry = self._persistent_lookup(key)
+        return self._unwrap(key, entry)
+
+    def set(self, key: str, value: Any, ttl: float, negative: bool = False) -> None:
+        self._persistent_set(key, *self._store(key, value, ttl, negative))
+
+    def set_not_found(self, key: str) -> None:
+        self.set(key, None, settings.FOOD_CACHE_NEGATIVE_TTL_S, negative=True)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any], ttl: float) -> Any:
+        """
+        Return the cached value for `key`, else call `fetch` and cache its result.
+        `fetch` raising FoodNotFoundError stores a negative entry (FOOD_CACHE_NEGATIVE_TTL_S).
+        """
+        value = self.get(key)
+        if value is not _MISSING:
+            return value
+        try:
+            value = fetch()
+        except FoodNotFoundError:
+            self.set_not_found(key)
+            raise
+        self.set(key, value, ttl)
+        return value
+
+    # ---------- async (Mongo I/O off the event loop) ----------
+    async def aget(self, key: str) -> Any:
+        entry = self._memory_lookup(key)
+        if entry is None and self._mongo is not None:
+            entry = await run_in_threadpool(self._persistent_lookup, key)
+        elif entry is None:
+            self.counters.inc("misses")
+        return self._unwrap(key, entry)
+
+    async def aset(self, key: str, value: Any, ttl: float, negative: bool = False) -> None:
+        entry = self._store(key, value, ttl, negative)
+        if self._mongo is not None:
+            await run_in_threadpool(self._persistent_set, key, *entry)
+
+    async def aset_not_found(self, key: str) -> None:
+        await self.aset(key, None, settings.FOOD_CACHE_NEGATIVE_TTL_S, negative=True)
+
+    async def aget_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        value = await self.aget(key)
+        if value is not _MISSING:
+            return value
+        try:
+            value = await fetch()
+        except FoodNotFoundError:
+            await self.aset_not_found(key)
+            raise
+        await self.aset(key, value, ttl)
+        return value
+
+    def is_missing(self, value: Any) -> bool:
+        return value is _MISSING
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            size = len(self._memory)
+        return {**self.counters.snapshot(), "memory_entries": size}
+
+
+_cache: FoodLookupCache | None = None
+
+def get_food_cache() -> FoodLookupCache:
+    """Process-wide cache shared by every FoodAPIClient."""
+    global _cache
+    if _cache is None:
+        from app.core.database import get_mongo_db
+
+        _cache = FoodLookupCache(
+            mongo=get_mongo_db if settings.FOOD_CACHE_PERSISTENT else None,
+            memory_size=settings.FOOD_CACHE_MEMORY_SIZE,
+        )
+    return _cache
+
+register_source("food_cache", lambda: _cache.metrics() if _cache else {})
@@ -0,0 +1,322 @@
+"""
+Canonical food catalog (MySQL `foods`).
+
+One row per provider food (USDA fdcId) or AI-recognised food (snap-meal
+results), with macros for a reference amount: `ref_quantity ref_unit` (the
+label serving, 100 g, or the amount the estimate was made for). Rows are
+added as foods are looked up: provider details fetched while logging or
+building recipes, GET /foods/{id}, and snap-meal results. A provider food's
+values don't change, so the first row stored wins. food_id is derived from
+(source, source_id), so writers never have to read ids back.
+
+Provider rows are shared. AI rows are model estimates, so they belong to the
+user whose photo produced them (`user_id`): lookups and search only see
+shared rows and the caller's own.
+
+Entries reference a food with food_id + quantity/unit; their macros are the
+catalog's scaled to that amount (and still stored on the entry, so rollups and
+past days don't move if a food is corrected later).
+
+Backfill from food_payloads, linking existing entries by food_api_id:
+
+    python -m app.services.food_catalog [--chunk 500]
+"""
+from typing import Any, Iterable
+import argparse
+import logging
+import uuid
+
+from sqlalchemy import bindparam, case, func, or_, select, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.sql_models import Food, FoodEntry, FoodPayload
+
+logger = logging.getLogger(__name__)
+
+# fixed: food ids must come out the same on every process
+_NAMESPACE = uuid.UUID("6f1c2a9e-4b7d-4e38-9a51-0c8d3f2e7b64")
+_INSERT_CHUNK = 500
+
+_MASS_G = {"g": 1.0, "kg": 1000.0, "mg": 0.001, "oz": 28.3495, "lb": 453.592}
+_VOLUME_ML = {"ml": 1.0, "l": 1000.0, "fl oz": 29.5735}
+# USDA servingSizeUnit spellings
+_UNIT_ALIASES = {"grm": "g", "gram": "g", "grams": "g", "mlt": "ml", "milliliter": "ml", "milliliters": "ml"}
+
+_FOOD_COLUMNS = (
+    Food.food_id,
+    Food.source,
+    Food.source_id,
+    Food.name,
+    Food.brand,
+    Food.ref_quantity,
+    Food.ref_unit,
+    Food.calories,
+    Food.protein_g,
+    Food.carbs_g,
+    Food.fats_g,
+)
+
+
+def name_key(name: str) -> str:
+    return " ".join(str(name).lower().split())[:255]
+
+def food_id_for(source: str, source_id: str) -> str:
+    return uuid.uuid5(_NAMESPACE, f"{source}:{source_id}").hex
+
+def _unit(unit: str | None) -> str:
+    u = " ".join((unit or "").lower().split())
+    return _UNIT_ALIASES.get(u, u)
+
+def _num(v: Any) -> float | None:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------- rows from lookups ----------
+def _usda_basis(raw: dict[str, Any] | None) -> tuple[float, str]:
+    """The amount FoodAPIClient's macros are for: label nutrients are per serving, foodNutrients per 100 g."""
+    raw = raw or {}
+    label = raw.get("labelNutrients") or {}
+    if (label.get("calories") or {}).get("value") is None:
+        return 100.0, "g"
+    size = _num(raw.get("servingSize"))
+    if size:
+        return size, _unit(raw.get("servingSizeUnit")) or "g"
+    return 1.0, "serving"
+
+def provider_row(details: dict[str, Any]) -> dict[str, Any] | None:
+    """Catalog row for a FoodAPIClient details dict (None without an id or calories)."""
+    source_id = details.get("id")
+    if not source_id or details.get("calories") is None:
+        return None
+    source = details.get("provider") or "usda"
+    ref_quantity, ref_unit = _usda_basis(details.get("raw"))
+    name = details.get("name") or "Unknown"
+    return {
+        "food_id": food_id_for(source, str(source_id)),
+        "source": source,
+        "source_id": str(source_id),
+        "user_id": None,
+        "name": name[:255],
+        "name_key": name_key(name),
+        "brand": details.get("brand"),
+        "ref_quantity": ref_quantity,
+        "ref_unit": ref_unit,
+        "calories": _num(details.get("calories")),
+        "protein_g": _num(details.get("protein_g")),
+        "carbs_g": _num(details.get("carbs_g")),
+        "fats_g": _num(details.get("fats_g")),
+    }
+
+def snap_row(user_id: str, item: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    The user's catalog row for one snap-meal food, keyed by normalized name +
+    unit: their first estimate for "grilled chicken breast" in g becomes it.
+    """
+    quantity = _num(item.get("quantity"))
+    unit = _unit(item.get("unit"))
+    if not item.get("name") or not quantity or quantity <= 0 or not unit or item.get("calories") is None:
+        return None
+    key = name_key(item["name"])
+    source_id = f"{user_id}|{key}|{unit}"[:255]
+    return {
+        "food_id": food_id_for("ai", source_id),
+        "source": "ai",
+        "source_id": source_id,
+        "user_id": user_id,
+        "name": str(item["name"])[:255],
+        "name_key": key,
+        "brand": None,
+        "ref_quantity": quantity,
+        "ref_unit": unit,
+        "calories": _num(item.get("calories")),
+        "protein_g": _num(item.get("protein_g")),
+        "carbs_g": _num(item.get("carbs_g")),
+        "fats_g": _num(item.get("fats_g")),
+    }
+
+def provider_rows(details: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [r for r in map(provider_row, details) if r is not None]
+
+
+# ---------- scaling ----------
+def _base(quantity: float, unit: str) -> tuple[float, str]:
+    """Mass in g, volume in ml; other units (piece, slice, serving) only convert to themselves."""
+    if unit in _MASS_G:
+        return quantity * _MASS_G[unit], "g"
+    if unit in _VOLUME_ML:
+        return quantity * _VOLUME_ML[unit], "ml"
+    return quantity, unit
+
+def scale_factor(food: Any, quantity: float | None, unit: str | None) -> float:
+    """quantity/unit as a multiple of the food's reference amount. Raises ValueError if they don't convert."""
+    if quantity is None:
+        return 1.0
+    q, u = _base(float(quantity), _unit(unit) or food.ref_unit)
+    ref_q, ref_u = _base(food.ref_quantity, food.ref_unit)
+    if u != ref_u or not ref_q:
+        raise ValueError(f"can't convert {unit} to {food.ref_unit} for food {food.food_id}")
+    return q / ref_q
+
+def scaled(food: Any, quantity: float | None = None, unit: str | None = None) -> dict[str, Any]:
+    """Food dict (as logged: name, brand, quantity, unit, macros) for an amount of a catalog food."""
+    factor = scale_factor(food, quantity, unit)
+    return {
+        "food_id": food.food_id,
+        "food_api_id": food.source_id if food.source != "ai" else None,
+        "name": food.name,
+        "brand": food.brand,
+        "quantity": quantity if quantity is not None else food.ref_quantity,
+        "unit": unit or food.ref_unit,
+        "calories": round(food.calories * factor) if food.calories is not None else None,
+        "protein_g": round(food.protein_g * factor, 2) if food.protein_g is not None else None,
+        "carbs_g": round(food.carbs_g * factor, 2) if food.carbs_g is not None else None,
+        "fats_g": round(food.fats_g * factor, 2) if food.fats_g is not None else None,
+    }
+
+def to_dict(food: Any) -> dict[str, Any]:
+    return {c.key: getattr(food, c.key) for c in _FOOD_COLUMNS}
+
+
+# ---------- statements ----------
+def _visible(user_id: str):
+    return or_(Food.user_id.is_(None), Food.user_id == user_id)
+
+def foods_stmt(food_ids: list[str], user_id: str):
+    return select(*_FOOD_COLUMNS).where(Food.food_id.in_(food_ids), _visible(user_id))
+
+def _stored_stmt(food_ids: list[str]):
+    return select(Food.food_id).where(Food.food_id.in_(food_ids))
+
+def insert_statements(dialect: str, rows: list[dict[str, Any]]) -> list:
+    """Insert-if-absent statements for catalog `rows`."""
+    stmts = []
+    for i in range(0, len(rows), _INSERT_CHUNK):
+        chunk = rows[i:i + _INSERT_CHUNK]
+        if dialect == "mysql":
+            stmt = mysql.insert(Food).values(chunk)
+            stmt = stmt.on_duplicate_key_update(food_id=stmt.inserted.food_id)
+        else:
+            stmt = sqlite.insert(Food).values(chunk).on_conflict_do_nothing()
+        stmts.append(stmt)
+    return stmts
+
+def search_stmt(q: str, user_id: str, limit: int):
+    """Foods visible to the user whose name contains `q`: prefix matches first, then shorter names."""
+    key = name_key(q).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    prefix = Food.name_key.like(f"{key}%", escape="\\")
+    return (
+        select(*_FOOD_COLUMNS)
+        .where(Food.name_key.like(f"%{key}%", escape="\\"), _visible(user_id))
+        .order_by(case((prefix, 0), else_=1), func.length(Food.name_key), Food.name_key)
+        .limit(limit)
+    )
+
+
+# ---------- sync ----------
+def _unique(rows: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    by_id: dict[str, dict[str, Any]] = {}
+    for r in rows:
+        by_id.setdefault(r["food_id"], r)
+    return by_id
+
+def store_foods(db: Session, rows: list[dict[str, Any]]) -> None:
+    """Add catalog rows not stored yet, in the caller's transaction."""
+    by_id = _unique(rows)
+    if not by_id:
+        return
+    stored = set(db.execute(_stored_stmt(list(by_id))).scalars())
+    missing = [r for k, r in by_id.items() if k not in stored]
+    for stmt in insert_statements(db.get_bind().dialect.name, missing):
+        db.execute(stmt)
+
+def get_foods(db: Session, food_ids: Iterable[str], user_id: str) -> dict[str, Any]:
+    """Catalog rows by id, among those visible to the user (shared + their own)."""
+    ids = list(set(food_ids))
+    if not ids:
+        return {}
+    return {r.food_id: r for r in db.execute(foods_stmt(ids, user_id)).all()}
+
+def search(db: Session, q: str, user_id: str, limit: int = 20) -> list[dict[str, Any]]:
+    return [to_dict(r) for r in db.execute(search_stmt(q, user_id, limit)).all()]
+
+
+# ---------- async ----------
+async def astore_foods(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    by_id = _unique(rows)
+    if not by_id:
+        return
+    stored = set((await db.execute(_stored_stmt(list(by_id)))).scalars())
+    missing = [r for k, r in by_id.items() if k not in stored]
+    for stmt in insert_statements(db.get_bind().dialect.name, missing):
+        await db.execute(stmt)
+
+async def aget_foods(db: AsyncSession, food_ids: Iterable[str], user_id: str) -> dict[str, Any]:
+    ids = list(set(food_ids))
+    if not ids:
+        return {}
+    return {r.food_id: r for r in (await db.execute(foods_stmt(ids, user_id))).all()}
+
+async def asearch(db: AsyncSession, q: str, user_id: str, limit: int = 20) -> list[dict[str, Any]]:
+    return [to_dict(r) for r in (await db.execute(search_stmt(q, user_id, limit))).all()]
+
+async def acatalog_snap_foods(db: AsyncSession, user_id: str, foods: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Add snap-meal foods to the user's catalog; returns them with their food_id (None if not catalogued)."""
+    rows = [snap_row(user_id, f) for f in foods]
+    await astore_foods(db, [r for r in rows if r is not None])
+    await db.commit()
+    return [{**f, "food_id": r["food_id"] if r else None} for f, r in zip(foods, rows)]
+
+
+# ---------- backfill ----------
+def backfill(db: Session, chunk: int = 500) -> dict[str, int]:
+    """Catalog rows for every stored provider payload; link entries that don't reference one yet."""
+    from app.services.food_service import FoodAPIClient
+
+    mapper = FoodAPIClient()
+    entries = FoodEntry.__table__
+    link = (
+        update(entries)
+        .where(entries.c.food_api_id == bindparam("aid"), entries.c.food_id.is_(None))
+        .values(food_id=bindparam("fid"))
+    )
+    counts = {"payloads": 0, "foods": 0, "linked": 0}
+    after = ""
+    while True:
+        batch = db.execute(
+            select(FoodPayload.food_api_id, FoodPayload.payload)
+            .where(FoodPayload.food_api_id > after)
+            .order_by(FoodPayload.food_api_id)
+            .limit(chunk)
+        ).all()
+        if not batch:
+            break
+        after = batch[-1].food_api_id
+        rows = provider_rows(mapper._map_usda_detailed(p.payload) for p in batch if isinstance(p.payload, dict))
+        store_foods(db, rows)
+        if rows:
+            result = db.execute(link, [{"aid": r["source_id"], "fid": r["food_id"]} for r in rows])
+            counts["linked"] += max(result.rowcount, 0)
+        db.commit()
+        counts["payloads"] += len(batch)
+        counts["foods"] += len(rows)
+    return counts
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk", type=int, default=500, help="payloads per transaction")
+    args = parser.parse_args(argv)
+
+    from app.core.database import SessionLocal
+    with SessionLocal() as db:
+        counts = backfill(db, args.chunk)
+    logger.info("food catalog backfill: %s", counts)
+    print(counts)
+
+if __name__ == "__main__":
+    main()
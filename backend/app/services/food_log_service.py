@@ -1,10 +1,26 @@
+from sqlalchemy import func, insert, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Any
 from datetime import datetime, date
+from time import perf_counter
+from types import SimpleNamespace
+import base64
+import json
 import uuid
 
+from app.core.config import settings
+from app.core.metrics import Counter, LatencyStat, register_source
 from app.models.sql_models import FoodEntry
 from app.services.food_service import FoodAPIClient
+from app.services import food_catalog, food_payloads
+from app.services import nutrition_rollup as rollup
+from app.services.sync_tombstones import record_deletes
+from app.services.user_service import publish_event
+
+def _publish_food_changed(db: Session | AsyncSession, user_id: str, deltas: rollup.Deltas) -> None:
+    """FoodEntriesChanged for the touched days (dashboard projection), in the write's transaction."""
+    publish_event("FoodEntriesChanged", {"user_id": user_id, "dates": sorted(deltas)}, session=db)
 
 def _generate_id() -> str:
     return uuid.uuid4().hex
@@ -12,6 +28,432 @@ def _generate_id() -> str:
 class NotFoundError(Exception):
     pass
 
+UPDATABLE_FIELDS = {"quantity","unit","calories","protein_g","carbs_g","fats_g","food_name","brand","consumed_at","meal_type","date"}
+
+def _needs_details(f: dict[str, Any]) -> bool:
+    """True if any macro is missing and we have a provider id to fetch it with."""
+    missing = any(f.get(k) is None for k in ("calories", "protein_g", "carbs_g", "fats_g"))
+    return missing and bool(f.get("food_api_id"))
+
+def _whole_seconds(v: datetime) -> datetime:
+    # TIMESTAMP columns store whole seconds; values returned without a refresh must match
+    return v.replace(microsecond=0)
+
+def _entry_values(
+    user_id: str,
+    day: date,
+    meal_type: str,
+    f: dict[str, Any],
+    consumed_at: datetime | None = None,
+    details: dict[str, Any] | None = None,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    """
+    Column values for a food_entries row from an incoming food dict, including
+    the ones the server would default (entry_id, consumed_at, created_at).
+    details: optional provider details used to fill only the missing values.
+    """
+    food_api_id = f.get("food_api_id")
+    name = f.get("name") or (f.get("food_name") if f.get("food_name") else "Unknown")
+    calories = f.get("calories")
+    protein = f.get("protein_g")
+    carbs = f.get("carbs_g")
+    fats = f.get("fats_g")
+    raw = f.get("raw")
+
+    if details:
+        # fill only missing values
+        calories = calories if calories is not None else details.get("calories")
+        protein  = protein  if protein  is not None else details.get("protein_g")
+        carbs    = carbs    if carbs    is not None else details.get("carbs_g")
+        fats     = fats     if fats     is not None else details.get("fats_g")
+        raw = raw if raw is not None else details.get("raw")
+
+    now = now or _whole_seconds(datetime.utcnow())
+    return {
+        "entry_id": f.get("entry_id") or _generate_id(),
+        "user_id": user_id,
+        "date": day,
+        "meal_type": meal_type,
+        "consumed_at": _whole_seconds(consumed_at) if consumed_at else now,
+        "food_api_id": food_api_id,
+        "food_id": f.get("food_id"),
+        "food_name": name,
+        "brand": f.get("brand"),
+        "quantity": f.get("quantity"),
+        "unit": f.get("unit"),
+        "calories": int(calories) if calories is not None else None,
+        "protein_g": float(protein) if protein is not None else None,
+        "carbs_g": float(carbs) if carbs is not None else None,
+        "fats_g": float(fats) if fats is not None else None,
+        "raw": raw,
+        "created_at": now,
+    }
+
+def _apply_updates(row: FoodEntry, updates: dict[str, Any]) -> None:
+    for k, v in updates.items():
+        if k not in UPDATABLE_FIELDS:
+            continue
+
+        if k in ("calories"):
+            setattr(row, k, int(v) if v is not None else None)
+
+        elif k in ("protein_g","carbs_g","fats_g","quantity"):
+            setattr(row, k, float(v) if v is not None else None)
+
+        elif k == "date":
+            if isinstance(v, str):
+                setattr(row, k, datetime.fromisoformat(v))
+            else:
+                setattr(row, k, v)
+
+        elif k == "consumed_at":
+            if isinstance(v, str):
+                setattr(row, k, datetime.fromisoformat(v))
+            else:
+                setattr(row, k, v)
+        else:
+            setattr(row, k, v)
+
+# ---------- catalog ----------
+def _catalog_ids(foods: list[dict[str, Any]]) -> set[str]:
+    """Catalog ids to look up: explicit food_id, else the provider food's."""
+    return {
+        f.get("food_id") or food_catalog.food_id_for("usda", str(f["food_api_id"]))
+        for f in foods if f.get("food_id") or f.get("food_api_id")
+    }
+
+def _with_catalog(foods: list[dict[str, Any]], catalog: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Foods with food_id get the catalog's name/brand/macros scaled to their
+    quantity (values sent explicitly win); provider foods in the catalog get
+    linked to it. Raises ValueError for unknown ids or units that don't convert.
+    """
+    out = []
+    for f in foods:
+        if f.get("food_id"):
+            food = catalog.get(f["food_id"])
+            if food is None:
+                raise ValueError(f"unknown food_id: {f['food_id']}")
+            f = {**food_catalog.scaled(food, f.get("quantity"), f.get("unit")),
+                 **{k: v for k, v in f.items() if v is not None}}
+        elif f.get("food_api_id"):
+            food_id = food_catalog.food_id_for("usda", str(f["food_api_id"]))
+            if food_id in catalog:
+                f = {**f, "food_id": food_id}
+        out.append(f)
+    return out
+
+_MACROS = ("calories", "protein_g", "carbs_g", "fats_g")
+
+def _rescales(row: FoodEntry, updates: dict[str, Any]) -> bool:
+    """True if the update changes a catalog entry's amount without setting its macros."""
+    return (
+        row.food_id is not None
+        and ("quantity" in updates or "unit" in updates)
+        and not any(k in updates for k in _MACROS)
+    )
+
+def _rescaled(row: FoodEntry, updates: dict[str, Any], food: Any | None) -> dict[str, Any]:
+    """
+    A new quantity / unit on a catalog entry recomputes its macros from the
+    catalog row `food` (ValueError if the unit doesn't convert to the food's).
+    """
+    if not _rescales(row, updates):
+        return updates
+    quantity = updates.get("quantity", row.quantity)
+    unit = updates.get("unit", row.unit)
+    if quantity is None:
+        return updates
+    if food is not None:
+        values = food_catalog.scaled(food, quantity, unit)
+        return {**updates, **{k: values[k] for k in _MACROS}}
+    # catalog row not visible any more: only a same-unit quantity change scales
+    if unit != row.unit or not row.quantity:
+        return updates
+    factor = float(quantity) / float(row.quantity)
+    out = dict(updates)
+    if row.calories is not None:
+        out["calories"] = round(row.calories * factor)
+    for k in ("protein_g", "carbs_g", "fats_g"):
+        if getattr(row, k) is not None:
+            out[k] = round(getattr(row, k) * factor, 2)
+    return out
+
+def _summarize_day(rows, day: date, user_summary: dict | None = None) -> dict[str, Any]:
+    total_cal = 0
+    total_pro = 0
+    total_carbs = 0
+    total_fats = 0
+    meals = {}
+    for r in rows:
+        c = r.calories or 0
+        p = r.protein_g or 0
+        ca = r.carbs_g or 0
+        f = r.fats_g or 0
+        total_cal += c
+        total_pro += p
+        total_carbs += ca
+        total_fats += f
+        meals.setdefault(r.meal_type, []).append(_to_dict(r))
+
+    target_cal = None
+    target_macros = None
+    if user_summary:
+        target_cal = user_summary.get("daily_calories")
+        target_macros = user_summary.get("macro_targets")
+
+    return {
+        "date": day.isoformat(),
+        "totals": {
+            "calories": int(total_cal),
+            "protein_g": float(total_pro),
+            "carbs_g": float(total_carbs),
+            "fats_g": float(total_fats),
+        },
+        "targets": {
+            "calories": target_cal,
+            "macro_targets": target_macros
+        },
+        "meals": meals
+    }
+
+def _summarize_range(
+    totals_rows, start: date, end: date, user_summary: dict | None = None, item_rows=None, meal_rows=None
+) -> dict[str, Any]:
+    """
+    totals_rows: daily_nutrition_totals rows for the range.
+    meal_rows: optional _meal_totals_stmt rows, per day under "meal_totals".
+    item_rows: optional food entries (_range_items_stmt rows), grouped per day under "meals".
+    """
+    per_day: dict[str, dict[str, Any]] = {}
+    totals = {"calories": 0, "protein_g": 0.0, "carbs_g": 0.0, "fats_g": 0.0}
+
+    for r in totals_rows:
+        day_totals = {
+            "calories": int(r.calories),
+            "protein_g": float(r.protein_g),
+            "carbs_g": float(r.carbs_g),
+            "fats_g": float(r.fats_g),
+        }
+        per_day[r.date.isoformat()] = {"totals": day_totals, "entry_count": r.entry_count}
+        for k, v in day_totals.items():
+            totals[k] += v
+
+    if meal_rows is not None:
+        for r in meal_rows:
+            day = per_day.get(rollup._day(r.date).isoformat())
+            if day is not None:
+                day.setdefault("meal_totals", {})[r.meal_type] = {
+                    "calories": int(r.calories),
+                    "protein_g": float(r.protein_g),
+                    "carbs_g": float(r.carbs_g),
+                    "fats_g": float(r.fats_g),
+                    "entry_count": r.entry_count,
+                }
+
+    if item_rows is not None:
+        for r in item_rows:
+            day = per_day.get(rollup._day(r.date).isoformat())
+            if day is not None:
+                day.setdefault("meals", {}).setdefault(r.meal_type, []).append(_to_dict(r))
+
+    num_days = (end - start).days + 1
+    averages = {k: (v / num_days if num_days > 0 else 0) for k, v in totals.items()}
+
+    return {
+        "range": {"start": start.isoformat(), "end": end.isoformat()},
+        "totals": totals,
+        "averages": averages,
+        "daily": per_day,
+        "targets": {
+            "calories": user_summary.get("daily_calories") if user_summary else None,
+            "macro_targets": user_summary.get("macro_targets") if user_summary else None,
+        },
+    }
+
+# the columns _to_dict reads: summaries never load the (possibly large) raw provider payload
+_ITEM_COLUMNS = (
+    FoodEntry.entry_id,
+    FoodEntry.user_id,
+    FoodEntry.date,
+    FoodEntry.meal_type,
+    FoodEntry.consumed_at,
+    FoodEntry.food_api_id,
+    FoodEntry.food_id,
+    FoodEntry.food_name,
+    FoodEntry.brand,
+    FoodEntry.quantity,
+    FoodEntry.unit,
+    FoodEntry.calories,
+    FoodEntry.protein_g,
+    FoodEntry.carbs_g,
+    FoodEntry.fats_g,
+)
+
+# Read paths select these columns only (never the deferred `raw`) and build
+# responses from the rows with _to_dict.
+def _entry_stmt(entry_id: str, user_id: str):
+    return select(*_ITEM_COLUMNS).where(FoodEntry.entry_id == entry_id, FoodEntry.user_id == user_id)
+
+def _entries_by_day_stmt(user_id: str, day: date, limit: int, offset: int):
+    return (
+        select(*_ITEM_COLUMNS)
+        .where(FoodEntry.user_id == user_id, FoodEntry.date == day)
+        .order_by(FoodEntry.consumed_at.asc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+def _day_items_stmt(user_id: str, day: date):
+    return select(*_ITEM_COLUMNS).where(FoodEntry.user_id == user_id, FoodEntry.date == day)
+
+def _range_items_stmt(user_id: str, start: date, end: date):
+    return (
+        select(*_ITEM_COLUMNS)
+        .where(FoodEntry.user_id == user_id, FoodEntry.date >= start, FoodEntry.date <= end)
+        .order_by(FoodEntry.date, FoodEntry.consumed_at)
+    )
+
+def _meal_totals_stmt(user_id: str, start: date, end: date):
+    """Per (day, meal_type) totals, aggregated in SQL."""
+    return (
+        select(
+            FoodEntry.date,
+            FoodEntry.meal_type,
+            func.coalesce(func.sum(FoodEntry.calories), 0).label("calories"),
+            func.coalesce(func.sum(FoodEntry.protein_g), 0).label("protein_g"),
+            func.coalesce(func.sum(FoodEntry.carbs_g), 0).label("carbs_g"),
+            func.coalesce(func.sum(FoodEntry.fats_g), 0).label("fats_g"),
+            func.count().label("entry_count"),
+        )
+        .where(FoodEntry.user_id == user_id, FoodEntry.date >= start, FoodEntry.date <= end)
+        .group_by(FoodEntry.date, FoodEntry.meal_type)
+    )
+
+# ---------- keyset pagination on (date, consumed_at, entry_id) ----------
+def encode_cursor(item: dict[str, Any]) -> str:
+    """Opaque cursor for the position after `item` (a _to_dict result)."""
+    key = json.dumps([item["date"], item["consumed_at"], item["entry_id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[date, datetime, str]:
+    try:
+        d, consumed_at, entry_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return date.fromisoformat(d), datetime.fromisoformat(consumed_at), str(entry_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("invalid cursor") from e
+
+def _page_stmt(user_id: str, start: date | None, end: date | None, limit: int, cursor: str | None, descending: bool):
+    """One page (+1 row to tell if there is another) in (date, consumed_at, entry_id) order."""
+    key = tuple_(FoodEntry.date, FoodEntry.consumed_at, FoodEntry.entry_id)
+    stmt = select(*_ITEM_COLUMNS).where(FoodEntry.user_id == user_id)
+    if start is not None:
+        stmt = stmt.where(FoodEntry.date >= start)
+    if end is not None:
+        stmt = stmt.where(FoodEntry.date <= end)
+    if cursor:
+        after = tuple_(*map(literal, decode_cursor(cursor)))
+        stmt = stmt.where(key < after if descending else key > after)
+    cols = (FoodEntry.date, FoodEntry.consumed_at, FoodEntry.entry_id)
+    return stmt.order_by(*(c.desc() if descending else c.asc() for c in cols)).limit(limit + 1)
+
+def _page(rows, limit: int) -> dict[str, Any]:
+    items = [_to_dict(r) for r in rows[:limit]]
+    return {
+        "count": len(items),
+        "items": items,
+        "next_cursor": encode_cursor(items[-1]) if len(rows) > limit else None,
+    }
+
+# ---------- bulk inserts ----------
+_ingest_stat = LatencyStat()  # observed per request as ms per 10k rows
+_ingest_counters = Counter("requests", "rows", "duplicates")
+register_source("food_ingest", lambda: {**_ingest_counters.snapshot(), "ms_per_10k_rows": _ingest_stat.snapshot()})
+
+def _chunks(rows: list, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+def _existing_ids_stmt(entry_ids: list[str]):
+    return select(FoodEntry.entry_id, FoodEntry.user_id).where(FoodEntry.entry_id.in_(entry_ids))
+
+def _own_existing(rows, user_id: str) -> set[str]:
+    """
+    entry_ids (from _existing_ids_stmt rows) the user already stored: skipped as
+    duplicates. Raises ValueError if any belongs to another user.
+    """
+    foreign = sorted(r.entry_id for r in rows if r.user_id != user_id)
+    if foreign:
+        raise ValueError(f"entry_id already in use: {', '.join(foreign)}")
+    return {r.entry_id for r in rows}
+
+def _regroup(meals: list[dict[str, Any]] | None, foods: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """`meals` with their foods replaced, in order, by `foods` (the flattened, resolved list)."""
+    it = iter(foods)
+    return [{**m, "foods": [next(it) for _ in m.get("foods") or []]} for m in meals or []]
+
+def _check_ingest_size(meals: list[dict[str, Any]]) -> None:
+    """Shape and FOOD_INGEST_MAX_ROWS checks, before any provider call or catalog query."""
+    if not meals:
+        raise ValueError("meals must be a non-empty list")
+    if not all(meal.get("foods") for meal in meals):
+        raise ValueError("every meal needs a non-empty foods list")
+    if sum(len(meal["foods"]) for meal in meals) > settings.FOOD_INGEST_MAX_ROWS:
+        raise ValueError(f"at most {settings.FOOD_INGEST_MAX_ROWS} foods per request")
+
+def _ingest_rows(
+    user_id: str, meals: list[dict[str, Any]], details_by_id: dict[str, dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Row values for every food of every meal, in request order. Raises ValueError on bad input."""
+    now = _whole_seconds(datetime.utcnow())
+    rows, seen = [], set()
+    for meal in meals:
+        for f in meal["foods"]:
+            details = details_by_id.get(str(f["food_api_id"])) if _needs_details(f) else None
+            row = _entry_values(user_id, meal["date"], meal["meal_type"], f, meal.get("consumed_at"), details, now)
+            if len(row["entry_id"]) > 36:
+                raise ValueError("entry_id must be at most 36 characters")
+            if row["entry_id"] in seen:
+                raise ValueError(f"duplicate entry_id in request: {row['entry_id']}")
+            seen.add(row["entry_id"])
+            rows.append(row)
+    return rows
+
+def _ingest_result(rows: list[dict[str, Any]], existing: set[str], started: float) -> dict[str, Any]:
+    created = len(rows) - len(existing)
+    if created:
+        _ingest_stat.observe((perf_counter() - started) * 1000.0 * 10_000 / created)
+    _ingest_counters.inc("requests")
+    _ingest_counters.inc("rows", created)
+    _ingest_counters.inc("duplicates", len(existing))
+    return {
+        "created": created,
+        "entry_ids": [r["entry_id"] for r in rows],
+        # client ids that were already stored (e.g. a retried sync): skipped
+        "duplicates": [r["entry_id"] for r in rows if r["entry_id"] in existing],
+    }
+
+def _to_dict(e: Any) -> dict[str, Any]:
+    """`e`: a FoodEntry, a row of its _ITEM_COLUMNS, or a SimpleNamespace of inserted values."""
+    return {
+        "entry_id": e.entry_id,
+        "user_id": e.user_id,
+        "date": e.date.isoformat(),
+        "meal_type": e.meal_type,
+        "consumed_at": e.consumed_at.isoformat() if e.consumed_at else None,
+        "food_api_id": e.food_api_id,
+        "food_id": e.food_id,
+        "food_name": e.food_name,
+        "brand": e.brand,
+        "quantity": e.quantity,
+        "unit": e.unit,
+        "calories": e.calories,
+        "protein_g": e.protein_g,
+        "carbs_g": e.carbs_g,
+        "fats_g": e.fats_g,
+    }
+
 class FoodLogService:
     def __init__(self, db: Session):
         self.db = db
@@ -34,89 +476,112 @@ class FoodLogService:
         if not foods or not isinstance(foods, list):
             raise ValueError("foods must be a non-empty list")
 
-        created = []
-        for f in foods:
-            entry_id = _generate_id()
-            food_api_id = f.get("food_api_id")
-            name = f.get("name") or (f.get("food_name") if f.get("food_name") else "Unknown")
-            brand = f.get("brand")
-            qty = f.get("quantity")
-            unit = f.get("unit")
-            calories = f.get("calories")
-            protein = f.get("protein_g")
-            carbs = f.get("carbs_g")
-            fats = f.get("fats_g")
-            raw = f.get("raw")
-
-            # if calories missing and we have a provider id -> fetch details
-            if (calories is None or protein is None or carbs is None or fats is None) and food_api_id:
-                try:
-                    details = self.food_api.get_details(food_api_id)
-                    # fill only missing values
-                    calories = calories if calories is not None else details.get("calories")
-                    protein  = protein  if protein  is not None else details.get("protein_g")
-                    carbs    = carbs    if carbs    is not None else details.get("carbs_g")
-                    fats     = fats     if fats     is not None else details.get("fats_g")
-                    raw = raw if raw is not None else details.get("raw")
-                except Exception:
-                    # ignore fetch errors; continue with whatever we have
-                    pass
-
-            consumed_at_ts = consumed_at or datetime.utcnow()
-
-            entry = FoodEntry(
-                entry_id=entry_id,
-                user_id=user_id,
-                date=day,
-                meal_type=meal_type,
-                consumed_at=consumed_at_ts,
-                food_api_id=food_api_id,
-                food_name=name,
-                brand=brand,
-                quantity=qty,
-                unit=unit,
-                calories=int(calories) if calories is not None else None,
-                protein_g=float(protein) if protein is not None else None,
-                carbs_g=float(carbs) if carbs is not None else None,
-                fats_g=float(fats) if fats is not None else None,
-                raw=raw
-            )
-            self.db.add(entry)
-            created.append(entry)
+        # if calories missing and we have a provider id -> fetch details (one bulk call)
+        details_by_id: dict[str, dict[str, Any]] = {}
+        wanted = [f["food_api_id"] for f in foods if _needs_details(f)]
+        if wanted:
+            try:
+                details_by_id = self.food_api.get_details_many(wanted)
+            except Exception:
+                # ignore fetch errors; continue with whatever we have
+                pass
+        foods = self._catalog(user_id, foods, details_by_id)
+
+        rows = [
+            _entry_values(user_id, day, meal_type, f, consumed_at,
+                          details_by_id.get(str(f["food_api_id"])) if _needs_details(f) else None)
+            for f in foods
+        ]
+        self._insert(rows)
+        # every column is known locally: no refresh round-trips
+        created = [SimpleNamespace(**r) for r in rows]
+
+        # keep daily_nutrition_totals in step, same transaction
+        deltas = rollup.deltas_for(created)
+        rollup.apply_deltas(self.db, user_id, deltas)
+        _publish_food_changed(self.db, user_id, deltas)
 
         # commit batch
         self.db.commit()
 
-        # Refresh created objects and return dictionaries
-        for e in created:
-            self.db.refresh(e)
-
         # return created entries as dict
         return [self._to_dict(e) for e in created]
 
+    def ingest_meals(self, user_id: str, meals: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Bulk create: meals is a list of {date, meal_type, consumed_at?, foods}, foods as
+        in add_food_entries plus an optional client-generated entry_id. Entries whose
+        entry_id this user already stored are skipped, so a retried upload is
+        harmless; an entry_id owned by another user raises ValueError. One
+        transaction, multi-row INSERTs of FOOD_INGEST_CHUNK_ROWS.
+        """
+        started = perf_counter()
+        _check_ingest_size(meals)
+        wanted = [f["food_api_id"] for m in meals for f in m["foods"] if _needs_details(f)]
+        details_by_id: dict[str, dict[str, Any]] = {}
+        if wanted:
+            try:
+                details_by_id = self.food_api.get_details_many(wanted)
+            except Exception:
+                pass
+        catalog_foods = self._catalog(user_id, [f for m in meals for f in m["foods"]], details_by_id)
+        rows = _ingest_rows(user_id, _regroup(meals, catalog_foods), details_by_id)
+
+        found = []
+        for chunk in _chunks([r["entry_id"] for r in rows], settings.FOOD_INGEST_CHUNK_ROWS):
+            found.extend(self.db.execute(_existing_ids_stmt(chunk)).all())
+        existing = _own_existing(found, user_id)
+        new_rows = [r for r in rows if r["entry_id"] not in existing]
+
+        if new_rows:
+            self._insert(new_rows)
+            deltas = rollup.deltas_for(SimpleNamespace(**r) for r in new_rows)
+            rollup.apply_deltas(self.db, user_id, deltas)
+            _publish_food_changed(self.db, user_id, deltas)
+            self.db.commit()
+        return _ingest_result(rows, existing, started)
+
+    def _catalog(
+        self, user_id: str, foods: list[dict[str, Any]], details_by_id: dict[str, dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Catalog the fetched provider foods, then resolve `foods` against the catalog."""
+        food_catalog.store_foods(self.db, food_catalog.provider_rows(details_by_id.values()))
+        return _with_catalog(foods, food_catalog.get_foods(self.db, _catalog_ids(foods), user_id))
+
+    def _insert(self, rows: list[dict[str, Any]]) -> None:
+        food_payloads.store_payloads(self.db, food_payloads.split_payloads(rows))
+        # executemany: the MySQL drivers send each chunk as one multi-row INSERT
+        for chunk in _chunks(rows, settings.FOOD_INGEST_CHUNK_ROWS):
+            self.db.execute(insert(FoodEntry), chunk)
+
     # -------------------------------
     # Read
     # -------------------------------
     def get_entry(self, entry_id: str, user_id: str) -> dict[str, Any] | None:
-        row = (
-            self.db.query(FoodEntry)
-            .filter(FoodEntry.entry_id == entry_id, FoodEntry.user_id == user_id)
-            .first()
-        )
+        row = self.db.execute(_entry_stmt(entry_id, user_id)).first()
         return self._to_dict(row) if row else None
 
     def get_entries_by_day(self, user_id: str, day: date, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
-        rows = (
-            self.db.query(FoodEntry)
-            .filter(FoodEntry.user_id == user_id, FoodEntry.date == day)
-            .order_by(FoodEntry.consumed_at.asc())
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
+        rows = self.db.execute(_entries_by_day_stmt(user_id, day, limit, offset)).all()
 
         return [self._to_dict(r) for r in rows]
 
+    def list_entries(
+        self,
+        user_id: str,
+        start: date | None = None,
+        end: date | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        descending: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Keyset-paginated entries across any range: pass the returned
+        next_cursor back to continue. Raises ValueError for a bad cursor.
+        """
+        rows = self.db.execute(_page_stmt(user_id, start, end, limit, cursor, descending)).all()
+        return _page(rows, limit)
+
     # -------------------------------
     # Update
     # -------------------------------
@@ -124,7 +589,6 @@ class FoodLogService:
         """
         updates: allowed keys: ['quantity','unit','calories','protein_g','carbs_g','fats_g','food_name','brand','consumed_at','meal_type','date']
         """
-        allowed = {"quantity","unit","calories","protein_g","carbs_g","fats_g","food_name","brand","consumed_at","meal_type","date"}
         row = (
             self.db.query(FoodEntry)
             .filter(FoodEntry.entry_id == entry_id, FoodEntry.user_id == user_id)
@@ -133,29 +597,17 @@ class FoodLogService:
         if not row:
             raise NotFoundError("entry not found")
 
-        for k, v in updates.items():
-            if k not in allowed:
-                continue
+        food = None
+        if row.food_id and _rescales(row, updates):
+            food = food_catalog.get_foods(self.db, [row.food_id], user_id).get(row.food_id)
+        updates = _rescaled(row, updates, food)
 
-            if k in ("calories"):
-                setattr(row, k, int(v) if v is not None else None)
-
-            elif k in ("protein_g","carbs_g","fats_g","quantity"):
-                setattr(row, k, int(v) if v is not None else None)
-
-            elif k == "date":
-                if isinstance(v, str):
-                    setattr(row, k, datetime.fromisoformat(v))
-                else:
-                    setattr(row, k, v)
-
-            elif k == "consumed_at":
-                if isinstance(v, str):
-                    setattr(row, k, datetime.fromisoformat(v))
-                else:
-                    setattr(row, k, v)
-            else:
-                setattr(row, k, v)
+        before = rollup.snapshot(row)
+        _apply_updates(row, updates)
+        deltas = rollup.deltas_for([before], sign=-1)
+        rollup.add_entry(deltas, row)
+        rollup.apply_deltas(self.db, user_id, deltas)
+        _publish_food_changed(self.db, user_id, deltas)
 
         self.db.add(row)
         self.db.commit()
@@ -174,6 +626,10 @@ class FoodLogService:
         if not row:
             raise NotFoundError("entry not found")
 
+        deltas = rollup.deltas_for([row], sign=-1)
+        rollup.apply_deltas(self.db, user_id, deltas)
+        _publish_food_changed(self.db, user_id, deltas)
+        record_deletes(self.db, user_id, "food_entries", [row.entry_id])
         self.db.delete(row)
         self.db.commit()
         return True
@@ -183,120 +639,209 @@ class FoodLogService:
         Returns daily summary totals and meal grouping.
         Optionally take user_summary (from users.onboarding_summary) to include targets.
         """
-        rows = self.db.query(FoodEntry).filter(FoodEntry.user_id == user_id, FoodEntry.date == day).all()
-        total_cal = 0
-        total_pro = 0
-        total_carbs = 0
-        total_fats = 0
-        meals = {}
-        for r in rows:
-            c = r.calories or 0
-            p = r.protein_g or 0
-            ca = r.carbs_g or 0
-            f = r.fats_g or 0
-            total_cal += c
-            total_pro += p
-            total_carbs += ca
-            total_fats += f
-            meals.setdefault(r.meal_type, []).append(self._to_dict(r))
-
-        target_cal = None
-        target_macros = None
-        if user_summary:
-            target_cal = user_summary.get("daily_calories")
-            target_macros = user_summary.get("macro_targets")
-
-        return {
-            "date": day.isoformat(),
-            "totals": {
-                "calories": int(total_cal),
-                "protein_g": float(total_pro),
-                "carbs_g": float(total_carbs),
-                "fats_g": float(total_fats),
-            },
-            "targets": {
-                "calories": target_cal,
-                "macro_targets": target_macros
-            },
-            "meals": meals
-        }
+        rows = self.db.execute(_day_items_stmt(user_id, day)).all()
+        return _summarize_day(rows, day, user_summary)
 
     def get_range_summary(
         self,
         user_id: str,
         start: date,
         end: date,
-        user_summary: dict | None = None
+        user_summary: dict | None = None,
+        include_items: bool = True,
     ) -> dict[str, Any]:
         """
         Aggregate entries from start to end date (inclusive).
-        Returns daily breakdown + totals + averages.
+        Returns daily breakdown + totals + averages. Day totals come from
+        daily_nutrition_totals and per-meal totals from a GROUP BY, so no
+        entries are loaded unless include_items asks for them (without `raw`).
         """
-        rows = (
-            self.db.query(FoodEntry)
-            .filter(FoodEntry.user_id == user_id, FoodEntry.date >= start, FoodEntry.date <= end)
-            .all()
+        totals_rows = self.db.scalars(rollup.range_stmt(user_id, start, end)).all()
+        meal_rows = self.db.execute(_meal_totals_stmt(user_id, start, end)).all()
+        item_rows = self.db.execute(_range_items_stmt(user_id, start, end)).all() if include_items else None
+        return _summarize_range(totals_rows, start, end, user_summary, item_rows, meal_rows)
+
+    # -------------------------------
+    # Helpers
+    # -------------------------------
+    def _to_dict(self, e: Any) -> dict[str, Any]:
+        return _to_dict(e)
+
+
+class AsyncFoodLogService:
+    """
+    Same API as FoodLogService, bound to an AsyncSession so the hot logging
+    routes don't hold a threadpool worker during MySQL round-trips.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.food_api = FoodAPIClient()
+
+    async def _apply_rollup(self, user_id: str, deltas: rollup.Deltas) -> None:
+        for stmt in rollup.rollup_statements(self.db.get_bind().dialect.name, user_id, deltas):
+            await self.db.execute(stmt)
+
+    async def _get_row(self, entry_id: str, user_id: str) -> FoodEntry | None:
+        return await self.db.scalar(
+            select(FoodEntry)
+            .where(FoodEntry.entry_id == entry_id, FoodEntry.user_id == user_id)
         )
 
-        per_day: dict[str, dict[str, Any]] = {}
-        totals = {"calories": 0, "protein_g": 0.0, "carbs_g": 0.0, "fats_g": 0.0}
+    # -------------------------------
+    # Create
+    # -------------------------------
+    async def add_food_entries(
+        self,
+        user_id: str,
+        day: date,
+        meal_type: str,
+        foods: list[dict[str, Any]],
+        consumed_at: datetime | None = None
+    ) -> list[dict[str, Any]]:
+        if not foods or not isinstance(foods, list):
+            raise ValueError("foods must be a non-empty list")
 
-        for r in rows:
-            d = r.date.isoformat()
-            if d not in per_day:
-                per_day[d] = {
-                    "totals": {"calories": 0, "protein_g": 0.0, "carbs_g": 0.0, "fats_g": 0.0},
-                    "meals": {}
-                }
+        details_by_id: dict[str, dict[str, Any]] = {}
+        wanted = [f["food_api_id"] for f in foods if _needs_details(f)]
+        if wanted:
+            try:
+                details_by_id = await self.food_api.aget_details_many(wanted)
+            except Exception:
+                pass
+        foods = await self._catalog(user_id, foods, details_by_id)
+
+        rows = [
+            _entry_values(user_id, day, meal_type, f, consumed_at,
+                          details_by_id.get(str(f["food_api_id"])) if _needs_details(f) else None)
+            for f in foods
+        ]
+        await self._insert(rows)
+        created = [SimpleNamespace(**r) for r in rows]
+
+        deltas = rollup.deltas_for(created)
+        await self._apply_rollup(user_id, deltas)
+        _publish_food_changed(self.db, user_id, deltas)
+        await self.db.commit()
+
+        return [_to_dict(e) for e in created]
+
+    async def ingest_meals(self, user_id: str, meals: list[dict[str, Any]]) -> dict[str, Any]:
+        started = perf_counter()
+        _check_ingest_size(meals)
+        wanted = [f["food_api_id"] for m in meals for f in m["foods"] if _needs_details(f)]
+        details_by_id: dict[str, dict[str, Any]] = {}
+        if wanted:
+            try:
+                details_by_id = await self.food_api.aget_details_many(wanted)
+            except Exception:
+                pass
+        catalog_foods = await self._catalog(user_id, [f for m in meals for f in m["foods"]], details_by_id)
+        rows = _ingest_rows(user_id, _regroup(meals, catalog_foods), details_by_id)
+
+        found = []
+        for chunk in _chunks([r["entry_id"] for r in rows], settings.FOOD_INGEST_CHUNK_ROWS):
+            found.extend((await self.db.execute(_existing_ids_stmt(chunk))).all())
+        existing = _own_existing(found, user_id)
+        new_rows = [r for r in rows if r["entry_id"] not in existing]
+
+        if new_rows:
+            await self._insert(new_rows)
+            deltas = rollup.deltas_for(SimpleNamespace(**r) for r in new_rows)
+            await self._apply_rollup(user_id, deltas)
+            _publish_food_changed(self.db, user_id, deltas)
+            await self.db.commit()
+        return _ingest_result(rows, existing, started)
+
+    async def _catalog(
+        self, user_id: str, foods: list[dict[str, Any]], details_by_id: dict[str, dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        await food_catalog.astore_foods(self.db, food_catalog.provider_rows(details_by_id.values()))
+        return _with_catalog(foods, await food_catalog.aget_foods(self.db, _catalog_ids(foods), user_id))
 
-            c = r.calories or 0
-            p = r.protein_g or 0.0
-            ca = r.carbs_g or 0.0
-            f = r.fats_g or 0.0
-
-            per_day[d]["totals"]["calories"] += c
-            per_day[d]["totals"]["protein_g"] += p
-            per_day[d]["totals"]["carbs_g"] += ca
-            per_day[d]["totals"]["fats_g"] += f
-            per_day[d]["meals"].setdefault(r.meal_type, []).append(self._to_dict(r))
-
-            totals["calories"] += c
-            totals["protein_g"] += p
-            totals["carbs_g"] += ca
-            totals["fats_g"] += f
-
-        num_days = (end - start).days + 1
-        averages = {k: (v / num_days if num_days > 0 else 0) for k, v in totals.items()}
-        
-        return {
-            "range": {"start": start.isoformat(), "end": end.isoformat()},
-            "totals": totals,
-            "averages": averages,
-            "daily": per_day,
-            "targets": {
-                "calories": user_summary.get("daily_calories") if user_summary else None,
-                "macro_targets": user_summary.get("macro_targets") if user_summary else None,
-            },
-        }
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        await food_payloads.astore_payloads(self.db, food_payloads.split_payloads(rows))
+        for chunk in _chunks(rows, settings.FOOD_INGEST_CHUNK_ROWS):
+            await self.db.execute(insert(FoodEntry), chunk)
 
     # -------------------------------
-    # Helpers
+    # Read
     # -------------------------------
-    def _to_dict(self, e: FoodEntry) -> dict[str, Any]:
-        return {
-            "entry_id": e.entry_id,
-            "user_id": e.user_id,
-            "date": e.date.isoformat(),
-            "meal_type": e.meal_type,
-            "consumed_at": e.consumed_at.isoformat() if e.consumed_at else None,
-            "food_api_id": e.food_api_id,
-            "food_name": e.food_name,
-            "brand": e.brand,
-            "quantity": e.quantity,
-            "unit": e.unit,
-            "calories": e.calories,
-            "protein_g": e.protein_g,
-            "carbs_g": e.carbs_g,
-            "fats_g": e.fats_g,
-        }
-        
+    async def get_entry(self, entry_id: str, user_id: str) -> dict[str, Any] | None:
+        row = (await self.db.execute(_entry_stmt(entry_id, user_id))).first()
+        return _to_dict(row) if row else None
+
+    async def get_entries_by_day(self, user_id: str, day: date, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        rows = (await self.db.execute(_entries_by_day_stmt(user_id, day, limit, offset))).all()
+        return [_to_dict(r) for r in rows]
+
+    async def list_entries(
+        self,
+        user_id: str,
+        start: date | None = None,
+        end: date | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        descending: bool = False,
+    ) -> dict[str, Any]:
+        rows = (await self.db.execute(_page_stmt(user_id, start, end, limit, cursor, descending))).all()
+        return _page(rows, limit)
+
+    # -------------------------------
+    # Update / Delete
+    # -------------------------------
+    async def update_entry(self, entry_id: str, user_id: str, updates: dict[str, Any]) -> dict[str, Any]:
+        row = await self._get_row(entry_id, user_id)
+        if not row:
+            raise NotFoundError("entry not found")
+
+        food = None
+        if row.food_id and _rescales(row, updates):
+            food = (await food_catalog.aget_foods(self.db, [row.food_id], user_id)).get(row.food_id)
+        updates = _rescaled(row, updates, food)
+
+        before = rollup.snapshot(row)
+        _apply_updates(row, updates)
+        deltas = rollup.deltas_for([before], sign=-1)
+        rollup.add_entry(deltas, row)
+        await self._apply_rollup(user_id, deltas)
+        _publish_food_changed(self.db, user_id, deltas)
+
+        await self.db.commit()
+        await self.db.refresh(row)
+        return _to_dict(row)
+
+    async def delete_entry(self, entry_id: str, user_id: str) -> bool:
+        row = await self._get_row(entry_id, user_id)
+        if not row:
+            raise NotFoundError("entry not found")
+
+        deltas = rollup.deltas_for([row], sign=-1)
+        await self._apply_rollup(user_id, deltas)
+        _publish_food_changed(self.db, user_id, deltas)
+        record_deletes(self.db, user_id, "food_entries", [row.entry_id])
+        await self.db.delete(row)
+        await self.db.commit()
+        return True
+
+    # -------------------------------
+    # Summaries
+    # -------------------------------
+    async def get_summary(self, user_id: str, day: date, user_summary: dict | None = None) -> dict[str, Any]:
+        rows = (await self.db.execute(_day_items_stmt(user_id, day))).all()
+        return _summarize_day(rows, day, user_summary)
+
+    async def get_range_summary(
+        self,
+        user_id: str,
+        start: date,
+        end: date,
+        user_summary: dict | None = None,
+        include_items: bool = True,
+    ) -> dict[str, Any]:
+        totals_rows = (await self.db.scalars(rollup.range_stmt(user_id, start, end))).all()
+        meal_rows = (await self.db.execute(_meal_totals_stmt(user_id, start, end))).all()
+        item_rows = None
+        if include_items:
+            item_rows = (await self.db.execute(_range_items_stmt(user_id, start, end))).all()
+        return _summarize_range(totals_rows, start, end, user_summary, item_rows, meal_rows)
@@ -0,0 +1,89 @@
+"""
+Provider payloads, deduplicated by food_api_id.
+
+Food entries and recipe ingredients used to carry the full provider response
+(`raw`) on every row. Rows that reference a provider food now store it once
+in food_payloads; only custom foods (no food_api_id) keep `raw` inline.
+A food's payload doesn't change, so the first one stored wins.
+"""
+from typing import Any
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.sql_models import FoodEntry, FoodPayload
+
+logger = logging.getLogger(__name__)
+
+# payloads per INSERT; they can be tens of KB each
+_INSERT_CHUNK = 100
+
+
+def split_payloads(records: list[dict[str, Any]], pop: bool = False) -> dict[str, Any]:
+    """
+    Take `raw` off every record that has a food_api_id and return
+    {food_api_id: payload}. `pop` removes the key, otherwise it is set to None
+    (row dicts for executemany need the same keys).
+    """
+    payloads: dict[str, Any] = {}
+    for rec in records:
+        food_api_id = rec.get("food_api_id")
+        if not food_api_id or rec.get("raw") is None:
+            continue
+        payloads.setdefault(str(food_api_id), rec["raw"])
+        if pop:
+            del rec["raw"]
+        else:
+            rec["raw"] = None
+    return payloads
+
+def _stored_stmt(food_api_ids: list[str]):
+    return select(FoodPayload.food_api_id).where(FoodPayload.food_api_id.in_(food_api_ids))
+
+def insert_statements(dialect: str, payloads: dict[str, Any]) -> list:
+    """Insert-if-absent statements for `payloads`."""
+    rows = [{"food_api_id": k, "payload": v} for k, v in payloads.items()]
+    stmts = []
+    for i in range(0, len(rows), _INSERT_CHUNK):
+        chunk = rows[i:i + _INSERT_CHUNK]
+        if dialect == "mysql":
+            stmt = mysql.insert(FoodPayload).values(chunk)
+            # concurrent writer got there first: keep its row
+            stmt = stmt.on_duplicate_key_update(food_api_id=stmt.inserted.food_api_id)
+        else:
+            stmt = sqlite.insert(FoodPayload).values(chunk).on_conflict_do_nothing(index_elements=["food_api_id"])
+        stmts.append(stmt)
+    return stmts
+
+
+def store_payloads(db: Session, payloads: dict[str, Any]) -> None:
+    """Store payloads not stored yet, in the caller's transaction (known ones aren't re-sent)."""
+    if not payloads:
+        return
+    stored = set(db.execute(_stored_stmt(list(payloads))).scalars())
+    missing = {k: v for k, v in payloads.items() if k not in stored}
+    for stmt in insert_statements(db.get_bind().dialect.name, missing):
+        db.execute(stmt)
+
+async def astore_payloads(db: AsyncSession, payloads: dict[str, Any]) -> None:
+    if not payloads:
+        return
+    stored = set((await db.execute(_stored_stmt(list(payloads)))).scalars())
+    missing = {k: v for k, v in payloads.items() if k not in stored}
+    for stmt in insert_statements(db.get_bind().dialect.name, missing):
+        await db.execute(stmt)
+
+
+def entry_payload(db: Session, entry_id: str, user_id: str) -> Any | None:
+    """An entry's raw payload: inline for custom foods, else the shared one."""
+    row = db.execute(
+        select(FoodEntry.raw, FoodPayload.payload)
+        .outerjoin(FoodPayload, FoodPayload.food_api_id == FoodEntry.food_api_id)
+        .where(FoodEntry.entry_id == entry_id, FoodEntry.user_id == user_id)
+    ).first()
+    if row is None:
+        return None
+    return row.raw if row.raw is not None else row.payload
@@ -1,12 +1,58 @@
-from typing import Any
-import requests
+from typing import Any, Iterable
+import asyncio
+import httpx
 from app.core.config import settings
+from app.services.food_cache import (
+    FoodLookupCache,
+    FoodNotFoundError,
+    details_key,
+    get_food_cache,
+    search_key,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+USDA_BASE_URL = "https://api.nal.usda.gov/fdc/v1"
+USDA_BULK_MAX_IDS = 20  # /foods accepts at most 20 fdcIds per request
+USDA_BULK_CONCURRENCY = 4
+
+# ─────────────────────────────
+# Shared keep-alive HTTP clients (one TLS connection pool per process)
+# ─────────────────────────────
+_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60)
+_http: httpx.Client | None = None
+_ahttp: httpx.AsyncClient | None = None
+
+def _client() -> httpx.Client:
+    global _http
+    if _http is None:
+        _http = httpx.Client(base_url=USDA_BASE_URL, limits=_LIMITS, timeout=20)
+    return _http
+
+def _async_client() -> httpx.AsyncClient:
+    global _ahttp
+    if _ahttp is None:
+        _ahttp = httpx.AsyncClient(base_url=USDA_BASE_URL, limits=_LIMITS, timeout=20)
+    return _ahttp
+
+async def close_http_clients():
+    """Close the shared clients (call on shutdown)."""
+    global _http, _ahttp
+    if _ahttp is not None:
+        await _ahttp.aclose()
+        _ahttp = None
+    if _http is not None:
+        _http.close()
+        _http = None
+
+def _chunks(ids: list[str], size: int) -> Iterable[list[str]]:
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
 class FoodAPIClient:
-    def __init__(self):
+    def __init__(self, cache: FoodLookupCache | None = None):
+        self.cache = cache or get_food_cache()
         self.provider = getattr(settings, "FOOD_API_PROVIDER", "usda").lower()
         key = getattr(settings, "USDA_API_KEY", None)
 
@@ -17,40 +63,164 @@ class FoodAPIClient:
         if self.provider == "usda" and not self.usda_key:
             logger.warning("USDA_API_KEY not set in settings - search will fail for USDA provider")
 
+    def _require_usda(self):
+        if self.provider != "usda":
+            raise NotImplementedError("Only USDA provider is implemented in this client (you can extend it)")
+
     # ---------- PUBLIC ----------
     def search(self, query: str, page: int = 1, page_size: int = 25) -> dict[str, Any]:
-        if self.provider == "usda":
-            return self._search_usda(query, page, page_size)
-        raise NotImplementedError("Only USDA provider is implemented in this client (you can extend it)")
+        self._require_usda()
+        return self.cache.get_or_fetch(
+            search_key(self.provider, query, page, page_size),
+            lambda: self._map_search(self._post("/foods/search", self._search_payload(query, page, page_size), 20)),
+            settings.FOOD_CACHE_SEARCH_TTL_S,
+        )
 
     def get_details(self, food_id: str) -> dict[str, Any]:
-        if self.provider == "usda":
-            return self._get_details_usda(food_id)
-        raise NotImplementedError("Only USDA provider is implemented in this client")
-
-    # ---------- USDA implementation ----------
-    def _search_usda(self, query: str, page: int = 1, page_size: int = 25) -> dict[str, Any]:
-        url = f"https://api.nal.usda.gov/fdc/v1/foods/search?api_key={self.usda_key}"
-        payload = {
+        """Raises FoodNotFoundError when the provider doesn't know `food_id`."""
+        self._require_usda()
+        return self.cache.get_or_fetch(
+            details_key(self.provider, food_id),
+            lambda: self._map_usda_detailed(self._get(f"/{food_id}", 10, not_found=food_id)),
+            settings.FOOD_CACHE_DETAILS_TTL_S,
+        )
+
+    def get_details_many(self, food_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Details for several ids: cache first, then USDA's bulk /foods endpoint
+        (20 ids per request). Returns {id: details}; unknown ids are left out.
+        """
+        self._require_usda()
+        found, missing = self._split_cached(food_ids)
+        for chunk in _chunks(missing, USDA_BULK_MAX_IDS):
+            found.update(self._store_bulk(chunk, self._post("/foods", {"fdcIds": chunk}, 20)))
+        return found
+
+    # ---------- PUBLIC (async) ----------
+    async def asearch(self, query: str, page: int = 1, page_size: int = 25) -> dict[str, Any]:
+        self._require_usda()
+
+        async def fetch():
+            return self._map_search(await self._apost("/foods/search", self._search_payload(query, page, page_size), 20))
+
+        return await self.cache.aget_or_fetch(
+            search_key(self.provider, query, page, page_size), fetch, settings.FOOD_CACHE_SEARCH_TTL_S
+        )
+
+    async def aget_details(self, food_id: str) -> dict[str, Any]:
+        self._require_usda()
+
+        async def fetch():
+            return self._map_usda_detailed(await self._aget(f"/{food_id}", 10, not_found=food_id))
+
+        return await self.cache.aget_or_fetch(
+            details_key(self.provider, food_id), fetch, settings.FOOD_CACHE_DETAILS_TTL_S
+        )
+
+    async def aget_details_many(self, food_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Async get_details_many; bulk chunks run concurrently (USDA_BULK_CONCURRENCY)."""
+        self._require_usda()
+        found: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+        for fid in dict.fromkeys(str(i) for i in food_ids if i):
+            try:
+                value = await self.cache.aget(details_key(self.provider, fid))
+            except FoodNotFoundError:
+                continue
+            if self.cache.is_missing(value):
+                missing.append(fid)
+            else:
+                found[fid] = value
+
+        sem = asyncio.Semaphore(USDA_BULK_CONCURRENCY)
+
+        async def fetch(chunk: list[str]):
+            async with sem:
+                return chunk, await self._apost("/foods", {"fdcIds": chunk}, 20)
+
+        for chunk, data in await asyncio.gather(*(fetch(c) for c in _chunks(missing, USDA_BULK_MAX_IDS))):
+            found.update(self._map_bulk(chunk, data))
+            for fid in chunk:
+                key = details_key(self.provider, fid)
+                if fid in found:
+                    await self.cache.aset(key, found[fid], settings.FOOD_CACHE_DETAILS_TTL_S)
+                else:
+                    await self.cache.aset_not_found(key)
+        return found
+
+    # ---------- cache helpers ----------
+    def _split_cached(self, food_ids: Iterable[str]) -> tuple[dict[str, dict[str, Any]], list[str]]:
+        found: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+        for fid in dict.fromkeys(str(i) for i in food_ids if i):
+            try:
+                value = self.cache.get(details_key(self.provider, fid))
+            except FoodNotFoundError:
+                continue
+            if self.cache.is_missing(value):
+                missing.append(fid)
+            else:
+                found[fid] = value
+        return found, missing
+
+    def _store_bulk(self, chunk: list[str], data: Any) -> dict[str, dict[str, Any]]:
+        mapped = self._map_bulk(chunk, data)
+        for fid in chunk:
+            key = details_key(self.provider, fid)
+            if fid in mapped:
+                self.cache.set(key, mapped[fid], settings.FOOD_CACHE_DETAILS_TTL_S)
+            else:
+                self.cache.set_not_found(key)
+        return mapped
+
+    # ---------- USDA transport ----------
+    def _params(self) -> dict[str, Any]:
+        return {"api_key": self.usda_key}
+
+    def _search_payload(self, query: str, page: int, page_size: int) -> dict[str, Any]:
+        return {
             "query": query,
             "pageNumber": page,
             "pageSize": page_size,
         }
-        resp = requests.post(url, json=payload, timeout=20)
+
+    def _get(self, path: str, timeout: float, not_found: str | None = None) -> Any:
+        resp = _client().get(path, params=self._params(), timeout=timeout)
+        return self._json(resp, not_found)
+
+    def _post(self, path: str, payload: dict[str, Any], timeout: float) -> Any:
+        resp = _client().post(path, params=self._params(), json=payload, timeout=timeout)
+        return self._json(resp)
+
+    async def _aget(self, path: str, timeout: float, not_found: str | None = None) -> Any:
+        resp = await _async_client().get(path, params=self._params(), timeout=timeout)
+        return self._json(resp, not_found)
+
+    async def _apost(self, path: str, payload: dict[str, Any], timeout: float) -> Any:
+        resp = await _async_client().post(path, params=self._params(), json=payload, timeout=timeout)
+        return self._json(resp)
+
+    def _json(self, resp: httpx.Response, not_found: str | None = None) -> Any:
+        if not_found is not None and resp.status_code == 404:
+            raise FoodNotFoundError(not_found)
         resp.raise_for_status()
-        data = resp.json()
+        return resp.json()
+
+    def _map_search(self, data: dict[str, Any]) -> dict[str, Any]:
         results = []
         for f in data.get("foods", []):
             item = self._map_usda_shallow(f)
             results.append(item)
         return {"totalHits": data.get("totalHits", 0), "foods": results}
 
-    def _get_details_usda(self, fdc_id: str) -> dict[str, Any]:
-        url = f"https://api.nal.usda.gov/fdc/v1/{fdc_id}?api_key={self.usda_key}"
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        return self._map_usda_detailed(data)
+    def _map_bulk(self, chunk: list[str], data: Any) -> dict[str, dict[str, Any]]:
+        wanted = set(chunk)
+        out = {}
+        for f in data or []:
+            fid = str(f.get("fdcId"))
+            if fid in wanted:
+                out[fid] = self._map_usda_detailed(f)
+        return out
 
     # ---------- mappers ----------
     def _map_usda_shallow(self, f: dict[str, Any]) -> dict[str, Any]:
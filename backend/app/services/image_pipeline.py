@@ -0,0 +1,171 @@
+"""
+Snap-meal upload pre-processing.
+
+    read_capped   stream the upload in chunks, reject past SNAP_UPLOAD_MAX_BYTES
+    prepare_image detect the real format from magic bytes, apply the EXIF
+                  orientation, downsize to SNAP_IMAGE_MAX_SIDE, re-encode as
+                  JPEG without metadata, and fingerprint for the result cache
+
+Decoding a phone photo is tens of ms of CPU, so `prepare_image` runs
+`_prepare` in a small process pool rather than on the event loop.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from time import perf_counter
+from typing import NamedTuple
+import asyncio
+import io
+import logging
+import multiprocessing
+import threading
+
+from fastapi import UploadFile
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.core.metrics import Counter, LatencyStat, register_source
+from app.services.snap_cache import dhash_image
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 64 * 1024
+
+# magic bytes -> (format, mime type)
+_SIGNATURES = (
+    (b"\xff\xd8\xff", ("jpeg", "image/jpeg")),
+    (b"\x89PNG\r\n\x1a\n", ("png", "image/png")),
+)
+
+
+class ImageTooLargeError(ValueError):
+    """Upload exceeds SNAP_UPLOAD_MAX_BYTES."""
+
+
+class UnsupportedImageError(ValueError):
+    """Upload is not a decodable JPEG / PNG / WebP image."""
+
+
+class PreparedImage(NamedTuple):
+    data: bytes
+    mime_type: str
+    digest: str  # sha256 of the original upload
+    phash: int  # dHash of the decoded image
+    source_format: str
+    source_bytes: int
+    width: int
+    height: int
+
+
+def detect_format(head: bytes) -> tuple[str, str] | None:
+    """(format, mime type) from the first bytes of a file, or None."""
+    for magic, fmt in _SIGNATURES:
+        if head.startswith(magic):
+            return fmt
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp", "image/webp"
+    return None
+
+
+async def read_capped(file: UploadFile, max_bytes: int) -> bytes:
+    """Read `file` in chunks, raising ImageTooLargeError as soon as it passes `max_bytes`."""
+    if file.size is not None and file.size > max_bytes:
+        raise ImageTooLargeError(f"Image exceeds {max_bytes // (1024 * 1024)} MB")
+    buf = bytearray()
+    while chunk := await file.read(_CHUNK):
+        buf += chunk
+        if len(buf) > max_bytes:
+            raise ImageTooLargeError(f"Image exceeds {max_bytes // (1024 * 1024)} MB")
+    return bytes(buf)
+
+
+def _prepare(data: bytes, max_side: int, quality: int) -> PreparedImage:
+    """Decode -> orient -> downsize -> re-encode. Runs in a worker process."""
+    detected = detect_format(data[:16])
+    if detected is None:
+        raise UnsupportedImageError("Only JPEG, PNG or WebP images are supported")
+    source_format = detected[0]
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            # JPEG: let libjpeg decode at a reduced scale (1/2..1/8) close to the target
+            img.draft("RGB", (max_side, max_side))
+            img = ImageOps.exif_transpose(img)
+            if img.mode in ("RGBA", "LA", "P"):
+                img = img.convert("RGBA")
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                background.paste(img, mask=img.getchannel("A"))
+                img = background
+            elif img.mode != "RGB":
+                img = img.convert("RGB")
+            img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+            out = io.BytesIO()
+            # no exif= / icc_profile= -> metadata (GPS etc.) is dropped
+            img.save(out, "JPEG", quality=quality, optimize=True)
+            phash = dhash_image(img)
+            width, height = img.size
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as e:
+        raise UnsupportedImageError(f"Could not decode image: {e}") from e
+
+    return PreparedImage(
+        data=out.getvalue(),
+        mime_type="image/jpeg",
+        digest=sha256(data).hexdigest(),
+        phash=phash,
+        source_format=source_format,
+        source_bytes=len(data),
+        width=width,
+        height=height,
+    )
+
+
+# ─────────────────────────────
+# Process pool
+# ─────────────────────────────
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+_prepare_stat = LatencyStat()
+_counters = Counter("prepared", "rejected", "bytes_in", "bytes_out")
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # created lazily inside a threaded server process: forking there can copy
+            # held locks (pymongo monitors, the anyio threadpool) into the children
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.SNAP_IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+async def prepare_image(data: bytes) -> PreparedImage:
+    loop = asyncio.get_running_loop()
+    started = perf_counter()
+    try:
+        prepared = await loop.run_in_executor(
+            _get_pool(), _prepare, data, settings.SNAP_IMAGE_MAX_SIDE, settings.SNAP_IMAGE_JPEG_QUALITY
+        )
+    except UnsupportedImageError:
+        _counters.inc("rejected")
+        raise
+    _prepare_stat.observe((perf_counter() - started) * 1000.0)
+    _counters.inc("prepared")
+    _counters.inc("bytes_in", prepared.source_bytes)
+    _counters.inc("bytes_out", len(prepared.data))
+    return prepared
+
+def _metrics() -> dict:
+    counts = _counters.snapshot()
+    ratio = counts["bytes_in"] / counts["bytes_out"] if counts["bytes_out"] else 0.0
+    return {**counts, "reduction_ratio": round(ratio, 2), "prepare": _prepare_stat.snapshot()}
+
+register_source("snap_image", _metrics)
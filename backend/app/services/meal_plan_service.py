@@ -12,6 +12,7 @@ from app.models.sql_models import MealPlan, User
 # from app.ai.ai_meal_planner import GeminiMealPlanner
 from app.services.ai_meal_planner import GeminiMealPlanner
 from app.core.config import settings
+from app.services.response_cache import invalidate_user
 
 
 class MealPlanService:
@@ -87,6 +88,8 @@ class MealPlanService:
         )
 
         self.db.add(plan)
+        # new plan -> /meal-plans ETags change once committed
+        invalidate_user(user_id, session=self.db)
         self.db.commit()
         self.db.refresh(plan)
 
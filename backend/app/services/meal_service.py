@@ -1,14 +1,19 @@
 from datetime import date, timedelta
 import math
 from typing import Any
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 import uuid
 import logging
 
 from app.models.sql_models import Recipe, MealPlan, User
-from app.services.food_service import FoodAPIClient
+from app.services import food_catalog
+from app.services.food_service import FoodAPIClient, FoodNotFoundError
 from app.services.food_log_service import FoodLogService
+from app.services.food_payloads import split_payloads, store_payloads
 from app.services.nutrition_utils import calculate_calories_and_macros  # use your util
+from app.services.response_cache import invalidate_user
+from app.services.sync_tombstones import record_deletes
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +28,12 @@ class MealService:
         self.food_log = FoodLogService(db)
 
     # ---------- Recipe CRUD ----------
-    def create_recipe(self, user_id: str, payload: dict[str, Any]) -> dict[str, Any]:
+    def create_recipe(self, user_id: str, payload: dict[str, Any], recipe_id: str | None = None) -> dict[str, Any]:
         """
         payload: {
             title, description, servings, ingredients: [ {food_api_id?, name, quantity, unit, calories?, protein_g?, carbs_g?, fats_g?, raw?} ]
         }
+        recipe_id: client-generated id (sync only; callers check it is free first).
         Tries to compute nutrition for the recipe by fetching provider details for each ingredient when possible.
         """
         title = payload.get("title") or "Untitled"
@@ -37,6 +43,19 @@ class MealService:
         computed = {"calories": 0.0, "protein_g": 0.0, "carbs_g": 0.0, "fats_g": 0.0}
         ingredient_records = []
 
+        # one bulk provider round-trip for every ingredient missing nutrition
+        wanted = [
+            ing["food_api_id"] for ing in ingredients
+            if ing.get("food_api_id")
+            and any(ing.get(k) is None for k in ("calories", "protein_g", "carbs_g", "fats_g"))
+        ]
+        prefetched: dict[str, dict[str, Any]] = {}
+        if wanted:
+            try:
+                prefetched = self.food_api.get_details_many(wanted)
+            except Exception:
+                logger.exception("Food API bulk details fetch failed")
+
         for ing in ingredients:
             rec = dict(ing)
             # allow client-provided nutrition values
@@ -48,7 +67,10 @@ class MealService:
             # if missing nutrition but food_api_id present, try fetching
             if (cal is None or prot is None or carbs is None or fats is None) and rec.get("food_api_id"):
                 try:
-                    details = self.food_api.get_details(rec["food_api_id"])
+                    fetched = prefetched.get(str(rec["food_api_id"]))
+                    if fetched is None:
+                        raise FoodNotFoundError(rec["food_api_id"])
+                    details: dict[str, Any] = fetched
                     # try to extract calories/protein/carbs/fats in flexible ways
                     # support several possible keys
                     # prefer per 100g scaling if provided
@@ -143,9 +165,24 @@ class MealService:
             except Exception:
                 nutrition["per_serving"] = None
 
+        # fetched provider foods join the catalog; ingredients reference their row
+        food_catalog.store_foods(self.db, food_catalog.provider_rows(prefetched.values()))
+        by_api_id = {
+            str(rec["food_api_id"]): food_catalog.food_id_for("usda", str(rec["food_api_id"]))
+            for rec in ingredient_records if rec.get("food_api_id")
+        }
+        catalogued = food_catalog.get_foods(self.db, by_api_id.values(), user_id)
+        for rec in ingredient_records:
+            food_id = by_api_id.get(str(rec.get("food_api_id")))
+            if food_id in catalogued:
+                rec["food_id"] = food_id
+
+        # provider payloads go to food_payloads, once per food
+        store_payloads(self.db, split_payloads(ingredient_records, pop=True))
+
         # persist
         recipe = Recipe(
-            recipe_id=_generate_id(),
+            recipe_id=recipe_id or _generate_id(),
             user_id=user_id,
             title=title,
             description=description,
@@ -154,6 +191,8 @@ class MealService:
             nutrition=nutrition
         )
         self.db.add(recipe)
+        # recipes / meal plans publish no events: bump the user's version (ETags) directly
+        invalidate_user(user_id, session=self.db)
         self.db.commit()
         self.db.refresh(recipe)
         return self._to_dict(recipe)
@@ -171,6 +210,8 @@ class MealService:
         if not r:
             return False
         self.db.delete(r)
+        record_deletes(self.db, user_id, "recipes", [recipe_id])
+        invalidate_user(user_id, session=self.db)
         self.db.commit()
         return True
 
@@ -224,7 +265,10 @@ class MealService:
                 raise ValueError("Cannot compute target calories: " + str(e))
 
         # collection of candidate items (recipes + quick foods)
-        recipes = self.db.query(Recipe).filter(Recipe.user_id == user_id).all()
+        # candidates need no ingredients (the largest column)
+        recipes = self.db.execute(
+            select(Recipe.recipe_id, Recipe.title, Recipe.nutrition).where(Recipe.user_id == user_id)
+        ).all()
         candidates = []
         for r in recipes:
             nut = r.nutrition or {}
@@ -309,6 +353,7 @@ class MealService:
             days=plan_obj["days"]
         )
         self.db.add(p)
+        invalidate_user(user_id, session=self.db)
         self.db.commit()
         self.db.refresh(p)
         return self._plan_to_dict(p)
@@ -331,6 +376,8 @@ class MealService:
         if not r:
             return False
         self.db.delete(r)
+        record_deletes(self.db, user_id, "meal_plans", [plan_id])
+        invalidate_user(user_id, session=self.db)
         self.db.commit()
         return True
 
@@ -1,10 +1,16 @@
+import asyncio
 import json
+import random
 import time
 from typing import Any, List
 from google import genai
 from google.genai import types
 
 
+class AnalyzerBusyError(RuntimeError):
+    """No analysis slot became free within the queue timeout."""
+
+
 class MealSnapAnalyzer:
     """
     AI-powered meal image analyzer.
@@ -19,10 +25,17 @@ class MealSnapAnalyzer:
         api_key: str,
         model: str = "gemini-2.5-flash",
         retry_delay: float = 1.0,
+        max_concurrency: int = 4,
+        attempt_timeout: float = 30.0,
+        queue_timeout: float = 10.0,
     ):
         self.client = genai.Client(api_key=api_key)
         self.model = model
         self.retry_delay = retry_delay
+        # async path only: bounds in-flight Gemini calls per worker
+        self.attempt_timeout = attempt_timeout
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
 
     # ---------------------------------------------------------
     # Public API
@@ -32,6 +45,7 @@ class MealSnapAnalyzer:
         self,
         image_bytes: bytes,
         max_retries: int = 3,
+        mime_type: str = "image/jpeg",
     ) -> dict[str, Any]:
         prompt = self._build_prompt()
 
@@ -40,36 +54,9 @@ class MealSnapAnalyzer:
             try:
                 response = self.client.models.generate_content(
                     model=self.model,
-                    contents=[
-                        prompt,
-                        # {
-                        #     "mime_type": "image/jpeg",
-                        #     "data": image_bytes,
-                        # },
-                        types.Part.from_bytes(
-                            data=image_bytes,
-                            mime_type="image/jpeg"
-                        )
-                    ],
+                    contents=self._contents(prompt, image_bytes, mime_type),
                 )
-
-                if (
-                    response is None
-                    or not getattr(response, "candidates", None)
-                    or not response.candidates
-                ):
-                    raise ValueError("Gemini returned no candidates")
-
-                content = getattr(response.candidates[0], "content", None)
-                if content is None:
-                    raise ValueError("Gemini returned empty content")
-
-                text = str(content).strip()
-                json_text = self._extract_json(text)
-                parsed = json.loads(json_text)
-
-                self._validate_response(parsed)
-                return parsed
+                return self._parse_response(response)
 
             except Exception as e:
                 last_error = e
@@ -80,6 +67,86 @@ class MealSnapAnalyzer:
             f"Meal image analysis failed after {max_retries} attempts: {last_error}"
         )
 
+    async def analyze_meal_image_async(
+        self,
+        image_bytes: bytes,
+        max_retries: int = 3,
+        mime_type: str = "image/jpeg",
+    ) -> dict[str, Any]:
+        """
+        Non-blocking analyze_meal_image: uses the genai async client, holds one
+        of `max_concurrency` slots for the whole call, and backs off with
+        asyncio.sleep (exponential + jitter) between attempts.
+        Raises AnalyzerBusyError if no slot frees up within queue_timeout.
+        """
+        prompt = self._build_prompt()
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise AnalyzerBusyError("Meal image analysis is busy, try again shortly")
+
+        try:
+            last_error = None
+            for attempt in range(1, max_retries + 1):
+                try:
+                    response = await asyncio.wait_for(
+                        self.client.aio.models.generate_content(
+                            model=self.model,
+                            contents=self._contents(prompt, image_bytes, mime_type),
+                        ),
+                        timeout=self.attempt_timeout,
+                    )
+                    return self._parse_response(response)
+
+                except Exception as e:
+                    last_error = e
+                    if attempt < max_retries:
+                        delay = self.retry_delay * (2 ** (attempt - 1))
+                        await asyncio.sleep(delay + random.uniform(0, delay / 2))
+        finally:
+            self._slots.release()
+
+        raise RuntimeError(
+            f"Meal image analysis failed after {max_retries} attempts: {last_error}"
+        )
+
+    # ---------------------------------------------------------
+    # Request / response
+    # ---------------------------------------------------------
+
+    def _contents(self, prompt: str, image_bytes: bytes, mime_type: str) -> list:
+        return [
+            prompt,
+            # {
+            #     "mime_type": "image/jpeg",
+            #     "data": image_bytes,
+            # },
+            types.Part.from_bytes(
+                data=image_bytes,
+                mime_type=mime_type
+            )
+        ]
+
+    def _parse_response(self, response) -> dict[str, Any]:
+        if (
+            response is None
+            or not getattr(response, "candidates", None)
+            or not response.candidates
+        ):
+            raise ValueError("Gemini returned no candidates")
+
+        content = getattr(response.candidates[0], "content", None)
+        if content is None:
+            raise ValueError("Gemini returned empty content")
+
+        text = str(content).strip()
+        json_text = self._extract_json(text)
+        parsed = json.loads(json_text)
+
+        self._validate_response(parsed)
+        return parsed
+
     # ---------------------------------------------------------
     # Prompt
     # ---------------------------------------------------------
@@ -8,6 +8,7 @@ from datetime import timedelta
 from sqlalchemy.orm import Session
 
 from app.models.sql_models import MealPlan
+from app.services.response_cache import invalidate_user
 
 def map_days_to_dates(start_date: date, ai_days: dict) -> dict:
     mapped = {}
@@ -155,6 +156,7 @@ class MealPlanService:
         )
 
         self.db.add(plan)
+        invalidate_user(user_id, session=self.db)
         self.db.commit()
         self.db.refresh(plan)
         return plan
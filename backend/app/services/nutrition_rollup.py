@@ -0,0 +1,161 @@
+"""
+daily_nutrition_totals maintenance.
+
+Writes to food_entries add their per-day deltas to the rollup inside the same
+transaction (`rollup_statements`), so range reads can scan one row per day
+instead of every entry. `rebuild` recomputes rows from food_entries.
+
+    python -m app.services.nutrition_rollup [--user UID] [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+from datetime import date, datetime
+from typing import Any, Iterable
+import argparse
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import Executable
+
+from app.models.sql_models import DailyNutritionTotal, FoodEntry
+
+MACROS = ("calories", "protein_g", "carbs_g", "fats_g")
+
+Deltas = dict[date, dict[str, Any]]
+
+def _day(v) -> date:
+    # _apply_updates may leave a datetime in FoodEntry.date
+    return v.date() if isinstance(v, datetime) else v
+
+def add_entry(deltas: Deltas, e: FoodEntry, sign: int = 1) -> Deltas:
+    """Accumulate +/- one entry's macros into `deltas` (keyed by day)."""
+    d = deltas.setdefault(_day(e.date), {"calories": 0, "protein_g": 0.0, "carbs_g": 0.0, "fats_g": 0.0, "entry_count": 0})
+    for k in MACROS:
+        d[k] += sign * (getattr(e, k) or 0)
+    d["entry_count"] += sign
+    return deltas
+
+def snapshot(e: FoodEntry) -> FoodEntry:
+    """Detached copy of the rollup-relevant fields (taken before an update)."""
+    return FoodEntry(date=e.date, **{k: getattr(e, k) for k in MACROS})
+
+def rollup_statements(dialect: str, user_id: str, deltas: Deltas) -> list:
+    """
+    Upserts adding `deltas` to the user's rollup rows, followed by a cleanup of
+    rows whose entry_count dropped to zero. Execute in the caller's transaction.
+    """
+    rows = [{"user_id": user_id, "date": day, **vals} for day, vals in deltas.items() if any(vals.values())]
+    if not rows:
+        return []
+
+    cols = (*MACROS, "entry_count")
+    if dialect == "mysql":
+        stmt = mysql.insert(DailyNutritionTotal).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            {c: getattr(DailyNutritionTotal, c) + stmt.inserted[c] for c in cols}
+        )
+    else:
+        # sqlite (local/dev); postgres would take the same ON CONFLICT form
+        stmt = sqlite.insert(DailyNutritionTotal).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={c: getattr(DailyNutritionTotal, c) + stmt.excluded[c] for c in cols},
+        )
+
+    stmts: list[Executable] = [stmt]
+    if any(r["entry_count"] < 0 for r in rows):
+        stmts.append(
+            delete(DailyNutritionTotal).where(
+                DailyNutritionTotal.user_id == user_id,
+                DailyNutritionTotal.date.in_([r["date"] for r in rows]),
+                DailyNutritionTotal.entry_count <= 0,
+            )
+        )
+    return stmts
+
+def apply_deltas(db: Session, user_id: str, deltas: Deltas) -> None:
+    for stmt in rollup_statements(db.get_bind().dialect.name, user_id, deltas):
+        db.execute(stmt)
+
+def deltas_for(entries: Iterable[Any], sign: int = 1) -> Deltas:
+    """`entries`: FoodEntry rows or SimpleNamespaces of inserted row values."""
+    deltas: Deltas = {}
+    for e in entries:
+        add_entry(deltas, e, sign)
+    return deltas
+
+# ─────────────────────────────
+# Reads
+# ─────────────────────────────
+def range_stmt(user_id: str, start: date, end: date):
+    return (
+        select(DailyNutritionTotal)
+        .where(
+            DailyNutritionTotal.user_id == user_id,
+            DailyNutritionTotal.date >= start,
+            DailyNutritionTotal.date <= end,
+        )
+        .order_by(DailyNutritionTotal.date)
+    )
+
+# ─────────────────────────────
+# Rebuild / backfill
+# ─────────────────────────────
+def rebuild(db: Session, user_id: str | None = None, start: date | None = None, end: date | None = None) -> int:
+    """
+    Recompute rollup rows from food_entries for the given scope (all users /
+    all dates by default). Commits; returns the number of rows written.
+    """
+    scope_rollup = []
+    scope_food = []
+    if user_id:
+        scope_rollup.append(DailyNutritionTotal.user_id == user_id)
+        scope_food.append(FoodEntry.user_id == user_id)
+    if start:
+        scope_rollup.append(DailyNutritionTotal.date >= start)
+        scope_food.append(FoodEntry.date >= start)
+    if end:
+        scope_rollup.append(DailyNutritionTotal.date <= end)
+        scope_food.append(FoodEntry.date <= end)
+
+    db.execute(delete(DailyNutritionTotal).where(*scope_rollup))
+    agg = (
+        select(
+            FoodEntry.user_id,
+            FoodEntry.date,
+            func.coalesce(func.sum(FoodEntry.calories), 0),
+            func.coalesce(func.sum(FoodEntry.protein_g), 0),
+            func.coalesce(func.sum(FoodEntry.carbs_g), 0),
+            func.coalesce(func.sum(FoodEntry.fats_g), 0),
+            func.count(),
+            literal(datetime.utcnow()),
+        )
+        .where(*scope_food)
+        .group_by(FoodEntry.user_id, FoodEntry.date)
+    )
+    result = db.execute(
+        insert(DailyNutritionTotal).from_select(
+            ["user_id", "date", "calories", "protein_g", "carbs_g", "fats_g", "entry_count", "updated_at"],
+            agg,
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild daily_nutrition_totals from food_entries")
+    parser.add_argument("--user", dest="user_id")
+    parser.add_argument("--start", type=date.fromisoformat)
+    parser.add_argument("--end", type=date.fromisoformat)
+    args = parser.parse_args(argv)
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        n = rebuild(db, args.user_id, args.start, args.end)
+        print(f"daily_nutrition_totals: {n} rows rebuilt")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ from sqlalchemy.exc import SQLAlchemyError
 import uuid
 
 from app.models.sql_models import User, UserOnboarding, WeightEntry
-from app.services.user_service import publish_event
+from app.services.user_service import publish_event, user_profile_snapshot
 from app.services.nutrition_utils import (
     calculate_calories_and_macros,
     _lbs_to_kg,
@@ -172,20 +172,19 @@ class OnboardingService:
         rec.updated_at = datetime.utcnow()
         try:
             self.db.add(rec)
+            # Publish an event (same transaction) so projection service updates Mongo quickly
+            publish_event("UserOnboardingStepSaved", {
+                "user_id": user_id,
+                "step": step_name,
+                "payload": payload,
+                "timestamp": datetime.utcnow().isoformat()
+            }, session=self.db)
             self.db.commit()
             self.db.refresh(rec)
         except SQLAlchemyError:
             self.db.rollback()
             raise
 
-        # Publish an event so projection service updates Mongo quickly
-        publish_event("UserOnboardingStepSaved", {
-            "user_id": user_id,
-            "step": step_name,
-            "payload": payload,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-
         return {"ok": True, "step": step_name}
 
     def complete_onboarding(self, user_id: str) -> dict[str, Any]:
@@ -368,6 +367,13 @@ class OnboardingService:
         try:
             self.db.add(user)
             self.db.add(rec)
+            # publish event for projection / recommender (same transaction)
+            publish_event("OnboardingCompleted", {
+                "user_id": user_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "summary": rec.progress,
+                "profile": user_profile_snapshot(user)
+            }, session=self.db)
             self.db.commit()
             self.db.refresh(user)
             self.db.refresh(rec)
@@ -375,13 +381,6 @@ class OnboardingService:
             self.db.rollback()
             raise
 
-        # publish event for projection / recommender
-        publish_event("OnboardingCompleted", {
-            "user_id": user_id,
-            "timestamp": datetime.utcnow().isoformat(),
-            "summary": rec.progress
-        })
-
         return {
             "ok": True,
             "user_id": user.user_id,
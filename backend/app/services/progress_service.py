@@ -3,14 +3,21 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from calendar import monthrange
 
-from app.models.sql_models import User, WeightEntry, FoodEntry
+from app.models.sql_models import User, WeightEntry, DailyNutritionTotal
+from app.services.response_cache import ResponseCache, get_response_cache
 
 
 class ProgressService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: ResponseCache | None = None):
         self.db = db
+        self.cache = cache or get_response_cache()
 
     def get_monthly_progress(self, user_id: str, year: int, month: int):
+        return self.cache.get_or_compute(
+            user_id, "monthly_progress", (year, month), lambda: self._monthly_progress(user_id, year, month)
+        )
+
+    def _monthly_progress(self, user_id: str, year: int, month: int):
         start_date = date(year, month, 1)
         end_date = date(year, month, monthrange(year, month)[1])
 
@@ -60,19 +67,19 @@ class ProgressService:
             )
 
         # ─────────────────────────────
-        # Average calories
+        # Average calories (per logged entry, from the daily rollup)
         # ─────────────────────────────
-        avg_calories = (
-            self.db.query(func.avg(FoodEntry.calories))
+        total_calories, entry_count = (
+            self.db.query(func.sum(DailyNutritionTotal.calories), func.sum(DailyNutritionTotal.entry_count))
             .filter(
-                FoodEntry.user_id == user_id,
-                FoodEntry.date >= start_date,
-                FoodEntry.date <= end_date,
+                DailyNutritionTotal.user_id == user_id,
+                DailyNutritionTotal.date >= start_date,
+                DailyNutritionTotal.date <= end_date,
             )
-            .scalar()
+            .one()
         )
 
-        avg_calories = int(avg_calories) if avg_calories else 0
+        avg_calories = int(total_calories / entry_count) if entry_count else 0
 
         # ─────────────────────────────
         # User info (BMI & goals)
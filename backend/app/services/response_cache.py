@@ -0,0 +1,298 @@
+"""
+Per-user versioned cache for the read-heavy summary responses (daily
+dashboard, weekly / monthly summaries, time series, monthly progress).
+
+Entries are keyed `resp:<user_id>:<version>:<name>:<args>`. Every write that
+publishes a user event (food, weight, workout, profile) bumps the user's
+version once its transaction commits (`invalidate_user`), so older entries are
+never read again and simply age out. Versions are time_ns stamps rather than
+counters: an evicted version key (or a restarted process) can't bring back a
+version that older entries were stored under.
+
+Backends (RESPONSE_CACHE_BACKEND):
+- "local": per-process LRU (cachetools). Invalidation only reaches the process
+  that handled the write, so use it with a single worker per host.
+- "redis": shared by all workers (`redis` package, RESPONSE_CACHE_REDIS_URL)
+- "fake": in-memory stand-in for the redis client, for tests
+- "off": no caching
+
+Cached values are shared between callers and must be treated as read-only.
+"""
+from typing import Any, Callable, Awaitable, Protocol
+import json
+import logging
+import threading
+import time
+
+from cachetools import TLRUCache
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import Counter, register_source
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Any | None:
+        ...
+
+    def set(self, key: str, value: Any, ttl: int, nx: bool = False) -> bool:
+        """Store `value` for `ttl` seconds; with `nx`, only if `key` is absent. True if stored."""
+        ...
+
+
+class LocalBackend:
+    def __init__(self, maxsize: int):
+        # entry = (value, expires_at epoch)
+        self._cache: TLRUCache[str, tuple[Any, float]] = TLRUCache(maxsize=maxsize, ttu=lambda _k, v, _now: v[1], timer=time.time)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._cache.get(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key: str, value: Any, ttl: int, nx: bool = False) -> bool:
+        with self._lock:
+            if nx and key in self._cache:
+                return False
+            self._cache[key] = (value, time.time() + ttl)
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+
+class RedisBackend:
+    """Values as JSON (same encoding as the response body) in a redis-compatible client."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def get(self, key: str) -> Any | None:
+        raw = self._client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int, nx: bool = False) -> bool:
+        return bool(self._client.set(key, json.dumps(jsonable_encoder(value)), ex=ttl, nx=nx))
+
+
+class FakeRedis:
+    """The part of the redis.Redis API RedisBackend uses, in memory (tests / local runs)."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[bytes, float | None]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.time():
+                del self._data[key]
+                return None
+            return entry[0]
+
+    def set(self, key: str, value: str | bytes, ex: int | None = None, nx: bool = False) -> bool | None:
+        if nx and self.get(key) is not None:
+            return None
+        with self._lock:
+            self._data[key] = (
+                value.encode() if isinstance(value, str) else value,
+                time.time() + ex if ex else None,
+            )
+        return True
+
+    def flushall(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend | None, ttl: int, remote: bool = False):
+        self.backend = backend
+        self.ttl = ttl
+        # remote backends do network I/O: keep it off the event loop
+        self.remote = remote
+        self.counters = Counter("hits", "misses", "stores", "invalidations", "errors")
+
+    @property
+    def shared_backend(self) -> CacheBackend | None:
+        """The backend when every worker sees the same one (versions, fences), else None."""
+        return None if isinstance(self.backend, LocalBackend) else self.backend
+
+    @property
+    def shared(self) -> bool:
+        return self.shared_backend is not None
+
+    # ---------- versions ----------
+    def _version_key(self, user_id: str) -> str:
+        return f"resp-ver:{user_id}"
+
+    def _live_backend(self) -> CacheBackend:
+        # callers check `backend is None` first
+        assert self.backend is not None, "response cache is off"
+        return self.backend
+
+    def version(self, user_id: str) -> int:
+        backend = self._live_backend()
+        key = self._version_key(user_id)
+        v = backend.get(key)
+        if v is None:
+            v = time.time_ns()
+            # another worker may have set it first
+            if not backend.set(key, v, self.ttl, nx=True):
+                v = backend.get(key) or v
+        return v
+
+    def data_version(self, user_id: str) -> int | None:
+        """The user's current version (ETags), or None when there is no backend to keep one."""
+        if self.backend is None:
+            return None
+        try:
+            return self.version(user_id)
+        except Exception as e:
+            self.counters.inc("errors")
+            logger.warning("response cache version read failed for %s: %s", user_id, e)
+            return None
+
+    def bump(self, user_id: str) -> None:
+        """Start a new version for the user: everything cached so far is ignored."""
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(self._version_key(user_id), time.time_ns(), self.ttl)
+            self.counters.inc("invalidations")
+        except Exception as e:
+            self.counters.inc("errors")
+            logger.warning("response cache invalidation failed for %s: %s", user_id, e)
+
+    # ---------- lookups ----------
+    def _key(self, user_id: str, name: str, args: tuple) -> str:
+        return f"resp:{user_id}:{self.version(user_id)}:{name}:" + ":".join(str(a) for a in args)
+
+    def _lookup(self, user_id: str, name: str, args: tuple) -> tuple[str | None, Any | None]:
+        """(key to store under, cached value | None); key is None when the backend failed."""
+        try:
+            key = self._key(user_id, name, args)
+            value = self._live_backend().get(key)
+        except Exception as e:
+            self.counters.inc("errors")
+            logger.warning("response cache read failed for %s: %s", user_id, e)
+            return None, None
+        self.counters.inc("hits" if value is not None else "misses")
+        return key, value
+
+    def _store(self, key: str, value: Any) -> None:
+        try:
+            self._live_backend().set(key, value, self.ttl)
+            self.counters.inc("stores")
+        except Exception as e:
+            self.counters.inc("errors")
+            logger.warning("response cache write failed for %s: %s", key, e)
+
+    def get_or_compute(self, user_id: str, name: str, args: tuple, compute: Callable[[], Any]) -> Any:
+        """Cached `compute()` for (user's current version, name, args)."""
+        if self.backend is None:
+            return compute()
+        key, value = self._lookup(user_id, name, args)
+        if value is not None:
+            return value
+        value = compute()
+        if key is not None:
+            self._store(key, value)
+        return value
+
+    async def aget_or_compute(
+        self, user_id: str, name: str, args: tuple, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        if self.backend is None:
+            return await compute()
+        if self.remote:
+            key, value = await run_in_threadpool(self._lookup, user_id, name, args)
+        else:
+            key, value = self._lookup(user_id, name, args)
+        if value is not None:
+            return value
+        value = await compute()
+        if key is not None:
+            if self.remote:
+                await run_in_threadpool(self._store, key, value)
+            else:
+                self._store(key, value)
+        return value
+
+    def metrics(self) -> dict[str, Any]:
+        out: dict[str, Any] = {**self.counters.snapshot(), "backend": settings.RESPONSE_CACHE_BACKEND}
+        if isinstance(self.backend, LocalBackend):
+            out["entries"] = len(self.backend)
+        return out
+
+
+def _make_backend(name: str) -> tuple[CacheBackend | None, bool]:
+    if name == "off":
+        return None, False
+    if name == "local":
+        return LocalBackend(settings.RESPONSE_CACHE_SIZE), False
+    if name == "fake":
+        return RedisBackend(FakeRedis()), False
+    if name == "redis":
+        try:
+            import redis  # pyright: ignore[reportMissingImports]  (optional dependency)
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the `redis` package") from e
+        return RedisBackend(redis.Redis.from_url(settings.RESPONSE_CACHE_REDIS_URL)), True
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {settings.RESPONSE_CACHE_BACKEND}")
+
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            backend, remote = _make_backend(settings.RESPONSE_CACHE_BACKEND.lower())
+            _cache = ResponseCache(backend, settings.RESPONSE_CACHE_TTL_S, remote=remote)
+        return _cache
+
+def set_response_cache(cache: ResponseCache | None) -> None:
+    """Swap the process-wide cache (tests); None re-reads RESPONSE_CACHE_BACKEND on next use."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+register_source("response_cache", lambda: _cache.metrics() if _cache else {})
+
+
+# ---------- invalidation ----------
+def invalidate_user(user_id: str, session: Session | AsyncSession | None = None) -> None:
+    """
+    Bump the user's version. With `session` (sync or async), the bump waits for
+    its commit: bumping earlier would let a concurrent read cache pre-commit
+    data under the new version.
+    """
+    if session is None:
+        get_response_cache().bump(user_id)
+        return
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    sync_session.info.setdefault("response_cache_users", set()).add(user_id)
+    if not sync_session.info.get("response_cache_listening"):
+        sync_session.info["response_cache_listening"] = True
+        event.listen(sync_session, "after_commit", _on_commit)
+        event.listen(sync_session, "after_rollback", _on_rollback)
+
+def _on_commit(session: Session) -> None:
+    cache = get_response_cache()
+    for user_id in session.info.pop("response_cache_users", ()):
+        cache.bump(user_id)
+
+def _on_rollback(session: Session) -> None:
+    session.info.pop("response_cache_users", None)
@@ -0,0 +1,251 @@
+"""
+Result cache for meal photo analysis.
+
+Each upload is fingerprinted twice:
+- sha256 of the bytes: exact re-uploads by the same user hit directly
+- 64-bit dHash of a tiny grayscale thumbnail: re-encoded / resized copies of a
+  photo the same user sent recently hit if within SNAP_PHASH_MAX_DISTANCE bits
+
+Both are scoped per user: a shared hit would tell a user (through the
+response's cache info, or its latency) that someone else sent the same photo.
+
+Entries hold the validated analyzer output, in a per-process LRU and in the
+Mongo `snap_analysis_cache` collection (TTL index on expires_at).
+"""
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from typing import Any, Callable
+import io
+import logging
+import threading
+import time
+
+from cachetools import LRUCache, TLRUCache
+from PIL import Image
+from pymongo.database import Database as MongoDatabase
+
+from app.core.config import settings
+from app.core.metrics import Counter, register_source
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "snap_analysis_cache"
+_RECENT_PER_USER = 50
+
+
+def image_digest(image_bytes: bytes) -> str:
+    return sha256(image_bytes).hexdigest()
+
+def dhash_image(img: Image.Image, size: int = 8) -> int:
+    """Difference hash (size*size bits) of an already-decoded image."""
+    small = img.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS)
+    px = small.tobytes()
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (px[offset + col] > px[offset + col + 1])
+    return bits
+
+def dhash(image_bytes: bytes, size: int = 8) -> int | None:
+    """dhash_image of encoded bytes, or None if they aren't a decodable image."""
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # JPEG: decode at reduced scale, far cheaper than a full decode
+            img.draft("L", (size * 8, size * 8))
+            return dhash_image(img, size)
+    except Exception:
+        return None
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+def _entry_key(user_id: str, digest: str) -> str:
+    return f"{user_id}:{digest}"
+
+
+class SnapResultCache:
+    def __init__(
+        self,
+        mongo: Callable[[], MongoDatabase] | None = None,
+        memory_size: int = 1000,
+        ttl: float = 7 * 24 * 3600,
+        max_distance: int = 4,
+    ):
+        self.ttl = ttl
+        self.max_distance = max_distance
+        # user_id:sha256 -> (result, expires_at)
+        self._memory: TLRUCache[str, tuple[dict[str, Any], float]] = TLRUCache(
+            maxsize=memory_size, ttu=lambda _k, v, _now: v[1], timer=time.time
+        )
+        # user_id -> recent (phash, entry key, expires_at); least recently active users
+        # fall out and are re-read from Mongo on their next near-duplicate lookup
+        self._recent: LRUCache[str, deque[tuple[int, str, float]]] = LRUCache(maxsize=memory_size)
+        self._lock = threading.Lock()
+        self._mongo = mongo
+        self._indexed = False
+        self._persistent_down_until = 0.0
+        self.counters = Counter("exact_hits", "near_hits", "misses", "stores", "persistent_errors")
+
+    # ---------- persistent tier ----------
+    def _collection(self):
+        if self._mongo is None or time.time() < self._persistent_down_until:
+            return None
+        try:
+            coll = self._mongo()[COLLECTION]
+            if not self._indexed:
+                coll.create_index("expires_at", expireAfterSeconds=0)
+                coll.create_index([("user_id", 1), ("created_at", -1)])
+                self._indexed = True
+            return coll
+        except Exception:
+            self._mark_persistent_down()
+            return None
+
+    def _mark_persistent_down(self) -> None:
+        self.counters.inc("persistent_errors")
+        self._persistent_down_until = time.time() + 60
+
+    # ---------- public (blocking; call via run_in_threadpool from async code) ----------
+    def lookup(self, user_id: str, digest: str, phash: int | None) -> tuple[dict[str, Any], dict[str, Any]] | None:
+        """(result, cache_info) or None on a miss."""
+        now = time.time()
+        key = _entry_key(user_id, digest)
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None:
+            entry = self._persistent_exact(key, now)
+        if entry is not None:
+            self.counters.inc("exact_hits")
+            return entry[0], {"hit": True, "match": "exact", "distance": 0}
+
+        if phash is not None and self.max_distance >= 0:
+            near = self._near(user_id, phash, now)
+            if near is not None:
+                result, distance = near
+                self.counters.inc("near_hits")
+                return result, {"hit": True, "match": "near", "distance": distance}
+
+        self.counters.inc("misses")
+        return None
+
+    def store(self, user_id: str, digest: str, phash: int | None, result: dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl
+        key = _entry_key(user_id, digest)
+        with self._lock:
+            self._memory[key] = (result, expires_at)
+            if phash is not None:
+                self._recent.setdefault(user_id, deque(maxlen=_RECENT_PER_USER)).appendleft((phash, key, expires_at))
+        self.counters.inc("stores")
+
+        coll = self._collection()
+        if coll is None:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            coll.replace_one(
+                {"_id": key},
+                {
+                    "user_id": user_id,
+                    "phash": f"{phash:016x}" if phash is not None else None,
+                    "result": result,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl),
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            self._mark_persistent_down()
+            logger.warning("snap cache write failed: %s", e)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            size = len(self._memory)
+        return {**self.counters.snapshot(), "memory_entries": size}
+
+    # ---------- internals ----------
+    def _persistent_exact(self, key: str, now: float):
+        coll = self._collection()
+        if coll is None:
+            return None
+        try:
+            doc = coll.find_one({"_id": key}, {"result": 1, "expires_at": 1})
+        except Exception as e:
+            self._mark_persistent_down()
+            logger.warning("snap cache read failed: %s", e)
+            return None
+        if not doc:
+            return None
+        expires_at = doc["expires_at"].replace(tzinfo=timezone.utc).timestamp()
+        if expires_at <= now:
+            return None
+        entry = (doc["result"], expires_at)
+        with self._lock:
+            self._memory[key] = entry
+        return entry
+
+    def _near(self, user_id: str, phash: int, now: float):
+        with self._lock:
+            recent = list(self._recent.get(user_id) or ())
+        candidates = [(h, d) for h, d, exp in recent if exp > now]
+        if not candidates:
+            candidates = self._persistent_recent(user_id)
+
+        best = None
+        for h, d in candidates:
+            distance = hamming(phash, h)
+            if distance <= self.max_distance and (best is None or distance < best[1]):
+                best = (d, distance)
+        if best is None:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(best[0])
+        if entry is None:
+            entry = self._persistent_exact(best[0], now)
+        return (entry[0], best[1]) if entry is not None else None
+
+    def _persistent_recent(self, user_id: str) -> list[tuple[int, str]]:
+        coll = self._collection()
+        if coll is None:
+            return []
+        try:
+            docs = list(
+                coll.find(
+                    {"user_id": user_id, "phash": {"$ne": None}, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+                    {"phash": 1, "expires_at": 1},
+                )
+                .sort("created_at", -1)
+                .limit(_RECENT_PER_USER)
+            )
+        except Exception as e:
+            self._mark_persistent_down()
+            logger.warning("snap cache read failed: %s", e)
+            return []
+        recent = [
+            (int(doc["phash"], 16), doc["_id"], doc["expires_at"].replace(tzinfo=timezone.utc).timestamp())
+            for doc in docs
+        ]
+        # warm the per-user index so the next lookup stays in memory
+        with self._lock:
+            self._recent[user_id] = deque(recent, maxlen=_RECENT_PER_USER)
+        return [(h, d) for h, d, _ in recent]
+
+
+_cache: SnapResultCache | None = None
+
+def get_snap_cache() -> SnapResultCache:
+    global _cache
+    if _cache is None:
+        from app.core.database import get_mongo_db
+
+        _cache = SnapResultCache(
+            mongo=get_mongo_db if settings.SNAP_CACHE_PERSISTENT else None,
+            memory_size=settings.SNAP_CACHE_MEMORY_SIZE,
+            ttl=settings.SNAP_CACHE_TTL_S,
+            max_distance=settings.SNAP_PHASH_MAX_DISTANCE,
+        )
+    return _cache
+
+register_source("snap_cache", lambda: _cache.metrics() if _cache else {})
@@ -0,0 +1,273 @@
+"""
+Delta sync for offline-first clients (POST /api/sync).
+
+Pull: per table, the client sends the opaque token from its previous sync and
+gets back only the rows created / updated since (by (updated_at, primary key))
+plus the ids deleted since (sync_tombstones, by (deleted_at, tombstone_id)).
+Pages hold at most SYNC_PAGE_ROWS of each; `has_more` means call again with
+the new tokens. A finished table's token is set SYNC_OVERLAP_S before the
+database clock, so rows whose transactions committed after this read are
+picked up next time (a few rows may be sent twice; applying them is idempotent).
+
+Push: a batch of client mutations, applied in order through the regular
+services (so rollups, events and cache invalidation all happen as usual), one
+commit each. Food entry data is validated with the REST request schemas
+(app/schemas/nutrition.py); an invalid mutation is rejected on its own. Creates carry client-generated ids and are skipped as duplicates
+when replayed.
+
+Clients apply a table's upserts, then its deletes. A `reset` table means the
+token outlived tombstone retention: replace the local table with what follows.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Sequence
+import base64
+import json
+import logging
+
+from sqlalchemy import exists, func, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.sql_models import (
+    ExerciseEntry, FoodEntry, MealPlan, Recipe, SyncTombstone, WeightEntry, WorkoutSession,
+)
+from app.schemas.nutrition import BulkMealIn, UpdateEntryPayload
+from app.services.food_log_service import _ITEM_COLUMNS, FoodLogService, NotFoundError
+from app.services.meal_service import MealService
+from app.services.weight_service import WeightService
+from app.services.workout_service import WorkoutService
+
+logger = logging.getLogger(__name__)
+
+# table -> (model, primary key, columns sent to the client)
+SYNC_TABLES: dict[str, tuple[Any, Any, tuple]] = {
+    # raw provider payloads stay server-side
+    "food_entries": (FoodEntry, FoodEntry.entry_id, (*_ITEM_COLUMNS, FoodEntry.created_at, FoodEntry.updated_at)),
+    "weight_entries": (WeightEntry, WeightEntry.entry_id, tuple(WeightEntry.__table__.c)),
+    "workout_sessions": (WorkoutSession, WorkoutSession.session_id, tuple(WorkoutSession.__table__.c)),
+    "exercise_entries": (ExerciseEntry, ExerciseEntry.entry_id, tuple(ExerciseEntry.__table__.c)),
+    "recipes": (Recipe, Recipe.recipe_id, tuple(Recipe.__table__.c)),
+    "meal_plans": (MealPlan, MealPlan.plan_id, tuple(MealPlan.__table__.c)),
+}
+
+
+# ---------- tokens ----------
+def _encode_token(upserts: tuple[datetime, str], deletes: tuple[datetime, int]) -> str:
+    key = json.dumps([upserts[0].isoformat(), upserts[1], deletes[0].isoformat(), deletes[1]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+def _decode_token(token: str) -> tuple[tuple[datetime, str], tuple[datetime, int]]:
+    try:
+        up_at, up_id, del_at, del_id = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return (datetime.fromisoformat(up_at), str(up_id)), (datetime.fromisoformat(del_at), int(del_id))
+    except (ValueError, TypeError) as e:
+        raise ValueError("invalid sync token") from e
+
+
+# ---------- pull ----------
+def _changed_stmt(table: str, user_id: str, after: tuple[datetime, str] | None, limit: int):
+    model, pk, cols = SYNC_TABLES[table]
+    stmt = select(*cols).where(model.user_id == user_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(model.updated_at, pk) > tuple_(*map(literal, after)))
+    return stmt.order_by(model.updated_at, pk).limit(limit + 1)
+
+def _deleted_stmt(table: str, user_id: str, after: tuple[datetime, int], limit: int):
+    _, pk, _ = SYNC_TABLES[table]
+    return (
+        select(SyncTombstone.tombstone_id, SyncTombstone.row_id, SyncTombstone.deleted_at)
+        .where(
+            SyncTombstone.user_id == user_id,
+            SyncTombstone.table_name == table,
+            tuple_(SyncTombstone.deleted_at, SyncTombstone.tombstone_id) > tuple_(*map(literal, after)),
+            # re-created since (client ids): the row is alive, don't delete it
+            ~exists().where(pk == SyncTombstone.row_id),
+        )
+        .order_by(SyncTombstone.deleted_at, SyncTombstone.tombstone_id)
+        .limit(limit + 1)
+    )
+
+
+# ---------- push ----------
+def _day(v: Any) -> date:
+    return v if isinstance(v, date) else date.fromisoformat(v)
+
+class _Rejected(Exception):
+    pass
+
+
+class SyncService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def sync(
+        self,
+        user_id: str,
+        tokens: dict[str, str | None] | None = None,
+        mutations: list[dict[str, Any]] | None = None,
+        tables: Sequence[str] | None = None,
+        limit: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Apply `mutations`, then return what changed in `tables` (default: all) since
+        `tokens`. Raises ValueError for unknown tables or malformed tokens.
+        """
+        tokens = tokens or {}
+        tables = list(tables or SYNC_TABLES)
+        unknown = (set(tables) | set(tokens)) - set(SYNC_TABLES)
+        if unknown:
+            raise ValueError(f"unknown sync tables: {sorted(unknown)}")
+        decoded = {t: _decode_token(token) if (token := tokens.get(t)) else None for t in tables}
+        limit = min(limit or settings.SYNC_PAGE_ROWS, settings.SYNC_PAGE_ROWS)
+
+        results = [self._apply(user_id, m) for m in mutations or []]
+
+        # database clock: updated_at / deleted_at are stamped by it
+        now = self.db.execute(select(func.now())).scalar_one()
+        out = {t: self._pull(user_id, t, decoded[t], now, limit) for t in tables}
+        return {
+            "server_time": now,
+            "mutations": results,
+            "tables": out,
+            "has_more": any(t["has_more"] for t in out.values()),
+        }
+
+    def _pull(self, user_id: str, table: str, token, now: datetime, limit: int) -> dict[str, Any]:
+        floor = now - timedelta(seconds=settings.SYNC_OVERLAP_S)
+        reset = False
+        if token is not None and token[1][0] < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+            token, reset = None, True
+        _, pk, _ = SYNC_TABLES[table]
+
+        rows = self.db.execute(_changed_stmt(table, user_id, token[0] if token else None, limit)).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]._mapping
+            up_key, up_more = (last["updated_at"], last[pk.key]), True
+        else:
+            # everything past the old token was returned: step back to the overlap
+            # even if a has_more page left the token later than that
+            up_key, up_more = (floor, ""), False
+
+        deleted = []
+        if token is None:
+            # nothing local to delete yet
+            del_key, del_more = (floor, 0), False
+        else:
+            deleted = self.db.execute(_deleted_stmt(table, user_id, token[1], limit)).all()
+            if len(deleted) > limit:
+                deleted = deleted[:limit]
+                del_key, del_more = (deleted[-1].deleted_at, deleted[-1].tombstone_id), True
+            else:
+                del_key, del_more = (floor, 0), False
+
+        return {
+            "upserts": [dict(r._mapping) for r in rows],
+            "deletes": [d.row_id for d in deleted],
+            "token": _encode_token(up_key, del_key),
+            "has_more": up_more or del_more,
+            "reset": reset,
+        }
+
+    # ---------- mutations ----------
+    def _apply(self, user_id: str, m: dict[str, Any]) -> dict[str, Any]:
+        result: dict[str, Any] = {"id": m.get("id"), "table": m.get("table"), "row_id": m.get("row_id")}
+        handler = self._handlers().get((m.get("table", ""), m.get("op", "")))
+        if handler is None:
+            return {**result, "status": "rejected", "detail": f"unsupported mutation {m.get('op')} on {m.get('table')}"}
+        try:
+            status = handler(user_id, m["row_id"], m.get("data") or {})
+            return {**result, "status": status}
+        except (_Rejected, ValueError, KeyError, TypeError) as e:
+            self.db.rollback()
+            return {**result, "status": "rejected", "detail": str(e)}
+        except NotFoundError:
+            self.db.rollback()
+            return {**result, "status": "not_found"}
+        except Exception as e:
+            self.db.rollback()
+            logger.exception("sync mutation failed for %s: %s", user_id, e)
+            return {**result, "status": "error"}
+
+    def _handlers(self) -> dict[tuple[str, str], Callable[[str, str, dict], str]]:
+        return {
+            ("food_entries", "create"): self._create_food,
+            ("food_entries", "update"): self._update_food,
+            ("food_entries", "delete"): self._delete_food,
+            ("weight_entries", "create"): self._create_weight,
+            ("weight_entries", "delete"): lambda u, r, d: _found(WeightService(self.db).delete_entry(r, u)),
+            ("workout_sessions", "create"): self._create_session,
+            ("workout_sessions", "update"): self._update_session,
+            ("workout_sessions", "delete"): lambda u, r, d: _found(WorkoutService(self.db).delete_session(r, u)),
+            ("exercise_entries", "create"): self._create_exercise,
+            ("exercise_entries", "update"): lambda u, r, d: _found(WorkoutService(self.db).update_exercise(r, u, d)),
+            ("exercise_entries", "delete"): lambda u, r, d: _found(WorkoutService(self.db).delete_exercise(r, u)),
+            ("recipes", "create"): self._create_recipe,
+            ("recipes", "delete"): lambda u, r, d: _found(MealService(self.db).delete_recipe(r, u)),
+            ("meal_plans", "delete"): lambda u, r, d: _found(MealService(self.db).delete_plan(r, u)),
+        }
+
+    def _exists(self, table: str, user_id: str, row_id: str) -> bool:
+        """True if the row was already created by this user (a replayed create)."""
+        model, pk, _ = SYNC_TABLES[table]
+        owner = self.db.execute(select(model.user_id).where(pk == row_id)).scalar_one_or_none()
+        if owner is not None and owner != user_id:
+            raise _Rejected("row_id already in use")
+        return owner is not None
+
+    def _create_food(self, user_id: str, row_id: str, data: dict) -> str:
+        # same validation as POST /nutrition/logs/bulk (pydantic errors are ValueErrors: rejected)
+        meal = BulkMealIn.model_validate({
+            "date": data["date"],
+            "meal_type": data.get("meal_type"),
+            "consumed_at": data.get("consumed_at"),
+            "foods": [{**data, "entry_id": row_id}],
+        })
+        if self._exists("food_entries", user_id, row_id):
+            return "duplicate"
+        FoodLogService(self.db).ingest_meals(user_id, [meal.model_dump()])
+        return "applied"
+
+    def _update_food(self, user_id: str, row_id: str, data: dict) -> str:
+        # same validation as PATCH /nutrition/log/{entry_id}
+        payload = UpdateEntryPayload.model_validate(data)
+        FoodLogService(self.db).update_entry(row_id, user_id, payload.model_dump(exclude_unset=True))
+        return "applied"
+
+    def _delete_food(self, user_id: str, row_id: str, data: dict) -> str:
+        FoodLogService(self.db).delete_entry(row_id, user_id)
+        return "applied"
+
+    def _create_weight(self, user_id: str, row_id: str, data: dict) -> str:
+        if self._exists("weight_entries", user_id, row_id):
+            return "duplicate"
+        WeightService(self.db).add_entry(user_id, _day(data["date"]), float(data["weight_kg"]), data.get("note"), entry_id=row_id)
+        return "applied"
+
+    def _create_session(self, user_id: str, row_id: str, data: dict) -> str:
+        if self._exists("workout_sessions", user_id, row_id):
+            return "duplicate"
+        WorkoutService(self.db).create_session(user_id, _day(data["date"]), data.get("name"), data.get("notes"), session_id=row_id)
+        return "applied"
+
+    def _update_session(self, user_id: str, row_id: str, data: dict) -> str:
+        payload = {k: v for k, v in data.items() if k in ("date", "name", "notes")}
+        if "date" in payload:
+            payload["date"] = _day(payload["date"])
+        return _found(WorkoutService(self.db).update_session(row_id, user_id, payload))
+
+    def _create_exercise(self, user_id: str, row_id: str, data: dict) -> str:
+        if self._exists("exercise_entries", user_id, row_id):
+            return "duplicate"
+        WorkoutService(self.db).add_exercise(data["session_id"], user_id, data, entry_id=row_id)
+        return "applied"
+
+    def _create_recipe(self, user_id: str, row_id: str, data: dict) -> str:
+        if self._exists("recipes", user_id, row_id):
+            return "duplicate"
+        MealService(self.db).create_recipe(user_id, data, recipe_id=row_id)
+        return "applied"
+
+
+def _found(result: Any) -> str:
+    return "applied" if result else "not_found"
@@ -0,0 +1,45 @@
+"""
+Tombstones for rows deleted from the tables served by POST /api/sync
+(see sync_service). Delete paths call `record_deletes` before committing, so
+a tombstone exists exactly when its delete committed.
+
+Tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS are pruned; clients whose
+high-water mark is older than that get a full resync of the table instead.
+
+    python -m app.services.sync_tombstones [--days N]   # prune
+"""
+from datetime import datetime, timedelta
+from typing import Iterable
+import argparse
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.sql_models import SyncTombstone
+
+
+def record_deletes(db: Session | AsyncSession, user_id: str, table: str, row_ids: Iterable[str]) -> None:
+    """Add tombstones for `row_ids` of `table` to the caller's transaction."""
+    db.add_all([SyncTombstone(user_id=user_id, table_name=table, row_id=row_id) for row_id in row_ids])
+
+def prune_tombstones(db: Session, older_than: datetime) -> int:
+    result = db.execute(delete(SyncTombstone).where(SyncTombstone.deleted_at < older_than))
+    db.commit()
+    return result.rowcount
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Delete sync tombstones past retention")
+    parser.add_argument("--days", type=int, default=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    args = parser.parse_args(argv)
+
+    from app.core.database import SessionLocal
+
+    with SessionLocal() as db:
+        pruned = prune_tombstones(db, datetime.utcnow() - timedelta(days=args.days))
+    print(f"sync_tombstones: {pruned} pruned")
+
+if __name__ == "__main__":
+    main()
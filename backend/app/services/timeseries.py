@@ -0,0 +1,197 @@
+"""
+Columnar per-day time series for the dashboard (DashboardService.get_time_series).
+
+The per-day query rows (one row per logged day, see _food_by_day_stmt /
+_weight_by_day_stmt / _volume_by_day_stmt) are scattered into dense NumPy
+arrays indexed by day offset from `start`, so gap filling, totals, rolling
+means and smoothing are array operations instead of per-day Python loops.
+
+Two response layouts:
+- "rows": the original list of per-day dicts (default, unchanged shape)
+- "columns": parallel arrays (dates implied by `start` + index), plus
+  7-day rolling means and a smoothed weight trend
+"""
+from datetime import date
+from typing import Any, Iterable, NamedTuple
+
+import numpy as np
+
+ROLLING_WINDOW_DAYS = 7
+# exponential smoothing of daily weigh-ins (~ a 10-day trend line)
+WEIGHT_TREND_ALPHA = 0.1
+
+_EWMA_BLOCK = 64
+
+
+class DailyColumns(NamedTuple):
+    start: date
+    end: date
+    calories: np.ndarray  # int64, 0 on days without entries
+    protein_g: np.ndarray  # float64
+    carbs_g: np.ndarray
+    fats_g: np.ndarray
+    weight_kg: np.ndarray  # float64, NaN on days without a weigh-in
+    workout_volume: np.ndarray  # float64, 0 on rest days
+
+    @property
+    def days(self) -> int:
+        return len(self.calories)
+
+
+def _offsets(days: Iterable[date], start: date) -> np.ndarray:
+    # ordinals: much cheaper than converting date objects to datetime64
+    return np.fromiter((d.toordinal() for d in days), dtype=np.int64) - start.toordinal()
+
+def _scatter(n: int, idx: np.ndarray, values: Iterable, fill: float) -> np.ndarray:
+    out = np.full(n, fill, dtype=np.float64)
+    if len(idx):
+        out[idx] = np.fromiter(values, dtype=np.float64, count=len(idx))
+    return out
+
+
+def dense_columns(start: date, end: date, food_q, weight_q, vol_q) -> DailyColumns:
+    """Dense per-day arrays for start..end (inclusive) from the per-day query rows."""
+    n = (end - start).days + 1
+    food = list(food_q)
+    weight = list(weight_q)
+    vol = list(vol_q)
+
+    food_idx = _offsets((r.d for r in food), start)
+    weight_idx = _offsets((r.d for r in weight), start)
+    vol_idx = _offsets((r.d for r in vol), start)
+
+    return DailyColumns(
+        start=start,
+        end=end,
+        calories=_scatter(n, food_idx, (r.calories for r in food), 0).astype(np.int64),
+        protein_g=_scatter(n, food_idx, (r.protein_g for r in food), 0.0),
+        carbs_g=_scatter(n, food_idx, (r.carbs_g for r in food), 0.0),
+        fats_g=_scatter(n, food_idx, (r.fats_g for r in food), 0.0),
+        weight_kg=_scatter(n, weight_idx, (r.weight_kg for r in weight), np.nan),
+        workout_volume=_scatter(n, vol_idx, (r.volume for r in vol), 0.0),
+    )
+
+
+# ---------- array helpers ----------
+def forward_fill(x: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value forward (leading NaNs stay NaN)."""
+    # positions before the first value map to x[0], which is then NaN itself
+    idx = np.where(np.isnan(x), 0, np.arange(len(x)))
+    np.maximum.accumulate(idx, out=idx)
+    return x[idx]
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over up to `window` days, ignoring NaNs (NaN where the window has no values)."""
+    valid = ~np.isnan(x)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, x, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    hi = np.arange(1, len(x) + 1)
+    lo = np.maximum(hi - window, 0)
+    n = counts[hi] - counts[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, (sums[hi] - sums[lo]) / n, np.nan)
+
+def ewma(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponentially weighted moving average of a gap-free series (leading NaNs
+    allowed), y[t] = y[t-1] + alpha * (x[t] - y[t-1]), seeded with the first value.
+    Computed in fixed-size blocks with a precomputed lower-triangular weight
+    matrix, so there is no per-day Python loop.
+    """
+    out = np.full(len(x), np.nan)
+    valid = ~np.isnan(x)
+    if not valid.any():
+        return out
+    first = int(np.argmax(valid))
+    xs = x[first:]
+
+    decay = 1.0 - alpha
+    powers = decay ** np.arange(_EWMA_BLOCK + 1)
+    lag = np.arange(_EWMA_BLOCK)[:, None] - np.arange(_EWMA_BLOCK)[None, :]
+    weights = np.where(lag >= 0, alpha * powers[np.clip(lag, 0, None)], 0.0)
+    carry_w = powers[1:]
+
+    ys = np.empty(len(xs))
+    prev = xs[0]
+    for b in range(0, len(xs), _EWMA_BLOCK):
+        block = xs[b:b + _EWMA_BLOCK]
+        k = len(block)
+        ys[b:b + k] = weights[:k, :k] @ block + carry_w[:k] * prev
+        prev = ys[b + k - 1]
+    out[first:] = ys
+    return out
+
+
+def _nullable(x: np.ndarray, ndigits: int) -> list:
+    """JSON-ready list: rounded floats, None for NaN."""
+    out = np.round(x, ndigits).astype(object)
+    out[np.isnan(x)] = None
+    return out.tolist()
+
+
+# ---------- payloads ----------
+def totals(cols: DailyColumns) -> tuple[dict[str, Any], dict[str, Any]]:
+    t = {
+        "calories": int(cols.calories.sum()),
+        "protein_g": float(cols.protein_g.sum()),
+        "carbs_g": float(cols.carbs_g.sum()),
+        "fats_g": float(cols.fats_g.sum()),
+    }
+    avg = {k: (v / cols.days if cols.days else 0) for k, v in t.items()}
+    return t, avg
+
+def rows_payload(cols: DailyColumns) -> dict[str, Any]:
+    """The original `series` list-of-dicts shape."""
+    dates = np.arange(np.datetime64(cols.start, "D"), np.datetime64(cols.end, "D") + 1).astype(str).tolist()
+    weights = cols.weight_kg.astype(object)
+    weights[np.isnan(cols.weight_kg)] = None
+    weights = weights.tolist()
+    series = [
+        {
+            "date": d,
+            "calories": cal,
+            "protein_g": p,
+            "carbs_g": c,
+            "fats_g": f,
+            "weight_kg": w,
+            "workout_volume": v,
+        }
+        for d, cal, p, c, f, w, v in zip(
+            dates,
+            cols.calories.tolist(),
+            cols.protein_g.tolist(),
+            cols.carbs_g.tolist(),
+            cols.fats_g.tolist(),
+            weights,
+            cols.workout_volume.tolist(),
+        )
+    ]
+    t, avg = totals(cols)
+    return {"start": cols.start.isoformat(), "end": cols.end.isoformat(), "series": series, "totals": t, "average": avg}
+
+def columns_payload(cols: DailyColumns) -> dict[str, Any]:
+    """Parallel per-day arrays; day i is start + i days."""
+    logged = cols.calories > 0
+    calories_logged = np.where(logged, cols.calories.astype(np.float64), np.nan)
+    t, avg = totals(cols)
+    return {
+        "start": cols.start.isoformat(),
+        "end": cols.end.isoformat(),
+        "layout": "columns",
+        "days": cols.days,
+        "columns": {
+            "calories": cols.calories.tolist(),
+            "protein_g": np.round(cols.protein_g, 1).tolist(),
+            "carbs_g": np.round(cols.carbs_g, 1).tolist(),
+            "fats_g": np.round(cols.fats_g, 1).tolist(),
+            "weight_kg": _nullable(cols.weight_kg, 2),
+            "workout_volume": np.round(cols.workout_volume, 1).tolist(),
+            # derived; the calorie mean is over logged days only, so unlogged days don't read as fasting
+            f"calories_avg_{ROLLING_WINDOW_DAYS}d": _nullable(rolling_mean(calories_logged, ROLLING_WINDOW_DAYS), 1),
+            "weight_filled_kg": _nullable(forward_fill(cols.weight_kg), 2),
+            "weight_trend_kg": _nullable(ewma(forward_fill(cols.weight_kg), WEIGHT_TREND_ALPHA), 2),
+        },
+        "totals": t,
+        "average": avg,
+        "logged_days": int(logged.sum()),
+    }
@@ -0,0 +1,199 @@
+"""
+Read model for the hot per-user reads (profile, profile status, daily targets,
+onboarding progress), served from the Mongo `users_projection` document that
+the projection worker maintains, with MySQL as the fallback.
+
+The projection is used only when it is fresh enough:
+- the document exists and carries the needed part (profile / onboarding)
+- it has caught up with this user's latest write (`note_user_write` fence vs
+  the document's `last_event_at`)
+- the event bus is not lagging more than READ_MODEL_MAX_LAG_S overall
+
+Fences are kept in process memory and, when the response cache backend is
+shared (RESPONSE_CACHE_BACKEND=redis), in that backend too, so a write served
+by one worker fences reads on all of them. With the per-process "local"
+backend a write only fences the worker that handled it: run a single worker,
+or a read on another worker may return the pre-write projection while the bus
+lags less than READ_MODEL_MAX_LAG_S.
+
+Every read reports the source that served it ("projection" or "mysql").
+"""
+from datetime import datetime, timedelta
+from typing import Any, Callable
+import logging
+import threading
+import time
+
+from cachetools import TTLCache
+from pymongo.database import Database as MongoDatabase
+
+from app.core.config import settings
+from app.core.metrics import Counter, register_source
+from app.services.response_cache import get_response_cache
+
+logger = logging.getLogger(__name__)
+
+PROJECTION = "projection"
+MYSQL = "mysql"
+
+_counters = Counter(
+    "projection", "mysql", "fallback_missing", "fallback_write_fence", "fallback_bus_lag", "fallback_error"
+)
+register_source("user_read_model", _counters.snapshot)
+
+# user_id -> publish time of the user's latest event from this process
+_write_fences: TTLCache = TTLCache(maxsize=50_000, ttl=settings.READ_MODEL_FENCE_TTL_S)
+_fences_lock = threading.Lock()
+
+def _fence_key(user_id: str) -> str:
+    return f"read-fence:{user_id}"
+
+def note_user_write(user_id: str) -> None:
+    """Called on publish: until the projection reaches this point, read this user from MySQL."""
+    now = datetime.utcnow()
+    with _fences_lock:
+        _write_fences[user_id] = now
+    backend = get_response_cache().shared_backend
+    if backend is not None:
+        try:
+            backend.set(_fence_key(user_id), now.isoformat(), settings.READ_MODEL_FENCE_TTL_S)
+        except Exception as e:
+            logger.warning("shared write fence failed for %s: %s", user_id, e)
+
+def _fence(user_id: str) -> datetime | None:
+    """The user's latest write fence, from this process or (shared backend) any worker."""
+    with _fences_lock:
+        fence = _write_fences.get(user_id)
+    backend = get_response_cache().shared_backend
+    if backend is not None:
+        try:
+            shared = backend.get(_fence_key(user_id))
+        except Exception as e:
+            logger.warning("shared write fence read failed for %s: %s", user_id, e)
+            # can't tell what other workers wrote: treat as just written
+            return datetime.utcnow()
+        if shared is not None:
+            shared = datetime.fromisoformat(shared)
+            fence = shared if fence is None else max(fence, shared)
+    return fence
+
+
+# bus lag, re-checked at most once a second (the outbox backlog is a MySQL query)
+_lag_lock = threading.Lock()
+_lag_checked_at = 0.0
+_lag_s = 0.0
+
+def _bus_lag_s() -> float:
+    global _lag_checked_at, _lag_s
+    with _lag_lock:
+        if time.monotonic() - _lag_checked_at < 1.0:
+            return _lag_s
+        _lag_checked_at = time.monotonic()
+    from app.events.bus import get_event_bus
+
+    try:
+        _, oldest = get_event_bus().backlog()
+        lag = (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+    except Exception as e:
+        logger.warning("event bus backlog check failed: %s", e)
+        lag = float("inf")
+    with _lag_lock:
+        _lag_s = lag
+    return lag
+
+
+def stale_reason(user_id: str, last_event_at: datetime | None, max_lag_s: float) -> str | None:
+    """
+    Why a projection document last updated at `last_event_at` can't answer for
+    this user ("write_fence" / "bus_lag"), or None when it is fresh enough.
+    """
+    fence = _fence(user_id)
+    # Mongo keeps milliseconds; the fence has microseconds
+    if fence is not None and (last_event_at is None or last_event_at + timedelta(milliseconds=1) < fence):
+        return "write_fence"
+    if _bus_lag_s() > max_lag_s:
+        return "bus_lag"
+    return None
+
+
+def _user_view(user) -> dict[str, Any]:
+    """MySQL User row -> the same shape as users_projection.profile."""
+    return {
+        "user_id": user.user_id,
+        "email": user.email,
+        "name": user.name,
+        "dob": user.dob,
+        "gender": user.gender,
+        "height_cm": user.height_cm,
+        "preferences": user.preferences,
+        "goal": user.goal,
+        "allergies": user.allergies,
+        "is_profile_complete": bool(user.is_profile_complete),
+        "onboarding_summary": user.onboarding_summary,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+    }
+
+
+class UserReadModel:
+    def __init__(
+        self,
+        mongo_db: MongoDatabase | Callable[[], MongoDatabase] | None,
+        user_service,
+        onboarding_service=None,
+        max_lag_s: float | None = None,
+    ):
+        self._mongo = mongo_db
+        self.user_service = user_service
+        self.onboarding_service = onboarding_service
+        self.max_lag_s = max_lag_s if max_lag_s is not None else settings.READ_MODEL_MAX_LAG_S
+
+    def _collection(self):
+        mongo = self._mongo() if callable(self._mongo) else self._mongo
+        return mongo.get_collection("users_projection") if mongo is not None else None
+
+    def _fresh_projection(self, user_id: str, part: str) -> dict[str, Any] | None:
+        """The projection's `part` subdocument, or None when MySQL should answer."""
+        if not settings.READ_MODEL_ENABLED:
+            return None
+        try:
+            coll = self._collection()
+            doc = coll.find_one({"_id": user_id}, {part: 1, "last_event_at": 1}) if coll is not None else None
+        except Exception as e:
+            _counters.inc("fallback_error")
+            logger.warning("users_projection read failed for %s: %s", user_id, e)
+            return None
+        if not doc or not doc.get(part):
+            _counters.inc("fallback_missing")
+            return None
+        reason = stale_reason(user_id, doc.get("last_event_at"), self.max_lag_s)
+        if reason is not None:
+            _counters.inc(f"fallback_{reason}")
+            return None
+        return doc[part]
+
+    def _served(self, source: str) -> str:
+        _counters.inc(source)
+        return source
+
+    # ---------- reads ----------
+    def get_user(self, user_id: str) -> tuple[dict[str, Any] | None, str]:
+        """(profile view | None when the user does not exist, source)."""
+        profile = self._fresh_projection(user_id, "profile")
+        if profile is not None:
+            return profile, self._served(PROJECTION)
+        user = self.user_service.get_user(user_id)
+        return (_user_view(user) if user else None), self._served(MYSQL)
+
+    def get_onboarding_progress(self, user_id: str) -> tuple[dict[str, Any], str]:
+        onboarding = self._fresh_projection(user_id, "onboarding")
+        # a projection without any saved step can't tell the default current_step
+        if onboarding is not None and onboarding.get("current_step"):
+            return {
+                "current_step": onboarding["current_step"],
+                "progress": onboarding.get("progress") or {},
+                "is_complete": bool(onboarding.get("is_complete")),
+            }, self._served(PROJECTION)
+        if self.onboarding_service is None:
+            raise RuntimeError("UserReadModel was built without an onboarding_service")
+        return self.onboarding_service.get_progress(user_id), self._served(MYSQL)
@@ -1,16 +1,47 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.models.sql_models import User
 from app.schemas.user import UserCreate, UserUpdate
 from fastapi import HTTPException, status
 from datetime import datetime
-
-event_queue = []
-
-def publish_event(event_type: str, payload: dict):
-    """Publishes a simple event to the in-memory queue."""
-    event_queue.append({"type": event_type, "payload": payload, "timestamp": datetime.utcnow()})
-    print(f"Event published: {event_type} with payload {payload}")
+from app.events.bus import get_event_bus
+from app.services.response_cache import invalidate_user
+from app.services.user_read_model import note_user_write
+
+def publish_event(event_type: str, payload: dict, session: Session | AsyncSession | None = None):
+    """
+    Publishes an event to the event bus. Pass the session doing the write (before
+    its commit) so the event is stored in the same transaction. The user's
+    cached responses are invalidated once that transaction commits.
+    """
+    user_id = payload.get("user_id")
+    if user_id:
+        note_user_write(user_id)
+        invalidate_user(user_id, session=session)
+    get_event_bus().publish(event_type, payload, session=session)
+
+def user_profile_snapshot(user: User) -> dict:
+    """
+    The user's profile as mirrored into users_projection.profile (served by
+    UserReadModel). Taken before commit, so server-side timestamps are approximated.
+    """
+    now = datetime.utcnow()
+    return {
+        "user_id": user.user_id,
+        "email": user.email,
+        "name": user.name,
+        "dob": user.dob,
+        "gender": user.gender,
+        "height_cm": user.height_cm,
+        "preferences": user.preferences,
+        "goal": user.goal,
+        "allergies": user.allergies,
+        "is_profile_complete": bool(user.is_profile_complete),
+        "onboarding_summary": user.onboarding_summary,
+        "created_at": user.created_at or now,
+        "updated_at": now,
+    }
 
 
 class UserService:
@@ -37,9 +68,6 @@ class UserService:
 
         try:
             self.db.add(db_user)
-            self.db.commit()
-            self.db.refresh(db_user)
-
             publish_event("UserCreated", {
                 "user_id": db_user.user_id,
                 "email": db_user.email,
@@ -49,8 +77,11 @@ class UserService:
                 "allergies": db_user.allergies,
                 "status": "active",
                 "is_profile_complete": db_user.is_profile_complete,
+                "profile": user_profile_snapshot(db_user),
                 "timestamp": datetime.utcnow()
-            })
+            }, session=self.db)
+            self.db.commit()
+            self.db.refresh(db_user)
 
             return db_user
         except IntegrityError:
@@ -86,13 +117,14 @@ class UserService:
 
         try:
             self.db.add(db_user)
+            publish_event("UserUpdated", {
+                "user_id": db_user.user_id,
+                "updated_fields": update_data, # Send only the fields that changed
+                "profile": user_profile_snapshot(db_user)
+            }, session=self.db)
             self.db.commit()
             self.db.refresh(db_user)
 
-            publish_event("UserUpdated", {
-                "user_id": db_user.user_id,
-                "updated_fields": update_data # Send only the fields that changed
-            })
             return db_user
         except Exception as e:
             self.db.rollback()
@@ -133,6 +165,11 @@ class UserService:
 
             user.preferences = prefs
             self.db.add(user)
+            publish_event("UserUpdated", {
+                "user_id": user_id,
+                "updated_fields": {"preferences": prefs},
+                "profile": user_profile_snapshot(user)
+            }, session=self.db)
             self.db.commit()
             self.db.refresh(user)
             return user.preferences
@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 
 from app.models.sql_models import User, WeightEntry
 from app.services.nutrition_utils import calculate_calories_and_macros
+from app.services.sync_tombstones import record_deletes
+from app.services.user_service import publish_event, user_profile_snapshot
 
 def _generate_id() -> str:
     return uuid.uuid4().hex
@@ -28,9 +30,11 @@ class WeightService:
             "updated_at": e.updated_at.isoformat() if e.updated_at else None,
         }
 
-    def add_entry(self, user_id: str, entry_date: date, weight_kg: float, note: str | None = None) -> dict[str, Any]:
+    def add_entry(
+        self, user_id: str, entry_date: date, weight_kg: float, note: str | None = None, entry_id: str | None = None
+    ) -> dict[str, Any]:
         """Create a new weight entry and compute a metabolic adjustment based on last entry."""
-        entry_id = _generate_id()
+        entry_id = entry_id or _generate_id()
         entry = WeightEntry(
             entry_id=entry_id,
             user_id=user_id,
@@ -39,6 +43,7 @@ class WeightService:
             note=note,
         )
         self.db.add(entry)
+        publish_event("WeightEntriesChanged", {"user_id": user_id, "dates": [entry_date]}, session=self.db)
         self.db.commit()
         self.db.refresh(entry)
 
@@ -66,6 +71,8 @@ class WeightService:
         if not r:
             return False
         self.db.delete(r)
+        record_deletes(self.db, user_id, "weight_entries", [r.entry_id])
+        publish_event("WeightEntriesChanged", {"user_id": user_id, "dates": [r.date]}, session=self.db)
         self.db.commit()
 
         # after deletion, recompute adjustment from last two entries (best-effort)
@@ -128,6 +135,11 @@ class WeightService:
             user.onboarding_summary = summary
             user.updated_at = datetime.utcnow()
             self.db.add(user)
+            publish_event("UserUpdated", {
+                "user_id": user_id,
+                "updated_fields": {},
+                "profile": user_profile_snapshot(user)
+            }, session=self.db)
             self.db.commit()
             self.db.refresh(user)
 
@@ -187,6 +199,11 @@ class WeightService:
                 summary["metabolic_adjustment_kcal"] = 0.0
                 user.onboarding_summary = summary
                 self.db.add(user)
+                publish_event("UserUpdated", {
+                    "user_id": user_id,
+                    "updated_fields": {},
+                    "profile": user_profile_snapshot(user)
+                }, session=self.db)
                 self.db.commit()
             return {"ok": True, "reason": "not_enough_entries_reset_adj"}
 
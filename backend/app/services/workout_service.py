@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.models.sql_models import ExerciseEntry, WorkoutSession
+from app.services.sync_tombstones import record_deletes
+from app.services.user_service import publish_event
 
 def _generate_id() -> str:
     return uuid.uuid4().hex
@@ -65,6 +67,10 @@ class WorkoutService:
     def __init__(self, db: Session):
         self.db = db
 
+    def _publish_changed(self, user_id: str) -> None:
+        # dashboard projection (last_workout_summary); goes out with the next commit
+        publish_event("WorkoutsChanged", {"user_id": user_id}, session=self.db)
+
     # ---------- helpers ----------
     # def _session_to_dict(self, s: WorkoutSession) -> dict[str, Any]:
     #     return {
@@ -110,10 +116,13 @@ class WorkoutService:
 
 
     # ---------- sessions CRUD ----------
-    def create_session(self, user_id: str, session_date: date, name: str | None = None, notes: str | None = None) -> dict[str, Any]:
-        session_id = _generate_id()
+    def create_session(
+        self, user_id: str, session_date: date, name: str | None = None, notes: str | None = None, session_id: str | None = None
+    ) -> dict[str, Any]:
+        session_id = session_id or _generate_id()
         s = WorkoutSession(session_id=session_id, user_id=user_id, date=session_date, name=name, notes=notes)
         self.db.add(s)
+        self._publish_changed(user_id)
         self.db.commit()
         self.db.refresh(s)
         return self._session_to_dict(s)
@@ -143,6 +152,7 @@ class WorkoutService:
             s.notes = payload["notes"]
         s.updated_at = datetime.utcnow()
         self.db.add(s)
+        self._publish_changed(user_id)
         self.db.commit()
         self.db.refresh(s)
         return self._session_to_dict(s)
@@ -152,13 +162,20 @@ class WorkoutService:
         if not s:
             return False
         # delete exercises in this session first (cascade not assumed)
-        self.db.query(ExerciseEntry).filter(ExerciseEntry.session_id == session_id).delete()
+        exercises = self.db.query(ExerciseEntry).filter(ExerciseEntry.session_id == session_id)
+        record_deletes(self.db, user_id, "exercise_entries", [e.entry_id for e in exercises.with_entities(ExerciseEntry.entry_id)])
+        exercises.delete()
+        record_deletes(self.db, user_id, "workout_sessions", [session_id])
         self.db.delete(s)
+        self._publish_changed(user_id)
         self.db.commit()
         return True
 
     # ---------- exercises CRUD ----------
-    def add_exercise(self, session_id: str, user_id: str, payload: dict, commit: bool = True) -> dict[str, Any]:
+    def add_exercise(
+        self, session_id: str, user_id: str, payload: dict, commit: bool = True, entry_id: str | None = None
+    ) -> dict[str, Any]:
+        """entry_id: client-generated id (sync only; callers check it is free first)."""
         # validation: ensure session exists and belongs to user
         s = self.db.query(WorkoutSession).filter(WorkoutSession.session_id == session_id, WorkoutSession.user_id == user_id).first()
         if not s:
@@ -168,7 +185,7 @@ class WorkoutService:
         raw_sets = payload.get("sets")
         validated_sets = _validate_sets(raw_sets)
         total_volume = _calculate_total_volume(validated_sets)
-        entry_id = _generate_id()
+        entry_id = entry_id or _generate_id()
         ex = ExerciseEntry(
             entry_id=entry_id,
             session_id=session_id,
@@ -181,6 +198,7 @@ class WorkoutService:
         self.db.add(ex)
         if commit:
             try:
+                self._publish_changed(user_id)
                 self.db.commit()
                 self.db.refresh(ex)
             except SQLAlchemyError:
@@ -289,6 +307,7 @@ class WorkoutService:
             )
 
         # 5️⃣ Single commit for atomicity
+        self._publish_changed(user_id)
         self.db.commit()
 
         return {
@@ -323,6 +342,7 @@ class WorkoutService:
                 )
                 results.append(ex)
 
+            self._publish_changed(user_id)
             self.db.commit()
 
         except Exception:
@@ -380,6 +400,7 @@ class WorkoutService:
         ex.updated_at = datetime.utcnow()
         self.db.add(ex)
         try:
+            self._publish_changed(user_id)
             self.db.commit()
             self.db.refresh(ex)
         except SQLAlchemyError:
@@ -392,6 +413,8 @@ class WorkoutService:
         if not ex:
             return False
         self.db.delete(ex)
+        record_deletes(self.db, user_id, "exercise_entries", [entry_id])
+        self._publish_changed(user_id)
         self.db.commit()
         return True
 
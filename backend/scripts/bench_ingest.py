@@ -0,0 +1,92 @@
+"""
+Food-entry ingestion throughput, reported as ms per 10k rows: the previous
+per-entry path (ORM add, commit, refresh each entry) vs FoodLogService.ingest_meals
+(multi-row INSERTs, no refreshes). Runs against --url (default: a temporary
+SQLite file; point it at a scratch MySQL database for real numbers). Tables
+are created if missing; rows are written under a throwaway user id.
+
+    cd backend
+    python -m scripts.bench_ingest [--rows 10000] [--url mysql+mysqlconnector://...]
+"""
+from datetime import date, timedelta
+from time import perf_counter
+import argparse
+import tempfile
+import uuid
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.sql_models import DailyNutritionTotal, FoodEntry
+from app.services import nutrition_rollup as rollup
+from app.services.food_log_service import FoodLogService, _entry_values
+
+MEALS = ("breakfast", "lunch", "dinner", "snack")
+FOODS_PER_MEAL = 5
+
+
+def synthetic_meals(rows: int) -> list[dict]:
+    start = date(2020, 1, 1)
+    meals = []
+    for i in range(rows // FOODS_PER_MEAL):
+        meals.append({
+            "date": start + timedelta(days=i // len(MEALS)),
+            "meal_type": MEALS[i % len(MEALS)],
+            "foods": [
+                {"name": f"food {j}", "quantity": 100, "unit": "g", "calories": 120 + j,
+                 "protein_g": 8.0, "carbs_g": 14.0, "fats_g": 3.5}
+                for j in range(FOODS_PER_MEAL)
+            ],
+        })
+    return meals
+
+def legacy_ingest(db, user_id: str, meals: list[dict]) -> None:
+    """add_food_entries before bulk inserts, once per meal."""
+    for m in meals:
+        created = [FoodEntry(**_entry_values(user_id, m["date"], m["meal_type"], f)) for f in m["foods"]]
+        db.add_all(created)
+        rollup.apply_deltas(db, user_id, rollup.deltas_for(created))
+        db.commit()
+        for e in created:
+            db.refresh(e)
+
+def cleanup(db, user_id: str) -> None:
+    db.execute(delete(FoodEntry).where(FoodEntry.user_id == user_id))
+    db.execute(delete(DailyNutritionTotal).where(DailyNutritionTotal.user_id == user_id))
+    db.commit()
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--url", default=None)
+    args = parser.parse_args(argv)
+
+    url = args.url or f"sqlite:///{tempfile.mktemp(suffix='.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[FoodEntry.__table__, DailyNutritionTotal.__table__])
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    meals = synthetic_meals(args.rows)
+    rows = len(meals) * FOODS_PER_MEAL
+
+    from app.events.bus import InMemoryEventBus, set_event_bus
+    set_event_bus(InMemoryEventBus())
+
+    results = {}
+    for name in ("per-entry (legacy)", "bulk ingest"):
+        user_id = f"bench-{uuid.uuid4().hex[:12]}"
+        with session_factory() as db:
+            started = perf_counter()
+            if name == "bulk ingest":
+                FoodLogService(db).ingest_meals(user_id, meals)
+            else:
+                legacy_ingest(db, user_id, meals)
+            results[name] = (perf_counter() - started) * 1000.0
+            cleanup(db, user_id)
+
+    print(f"{rows} rows, {len(meals)} meals on {engine.dialect.name}")
+    for name, ms in results.items():
+        print(f"{name:>20}: {ms:9.1f} ms total  {ms * 10_000 / rows:9.1f} ms per 10k rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Time-series builder timings: the previous per-day Python builder vs the
+NumPy engine (app.services.timeseries), "rows" and "columns" layouts, for
+30 / 365 / 1825-day ranges. Query rows are synthetic (no database): this
+measures building + JSON encoding, the part that grows with the range.
+
+    cd backend
+    python -m scripts.bench_timeseries [--runs 50] [--fill 0.8]
+"""
+from datetime import date, timedelta
+from statistics import median
+from time import perf_counter
+from types import SimpleNamespace
+import argparse
+import json
+import random
+
+from app.services import timeseries
+
+
+def legacy_build(start: date, end: date, food_q, weight_q, vol_q) -> dict:
+    """_build_time_series before the NumPy engine (kept here for comparison)."""
+    food_rows = {r.d: {"calories": int(r.calories), "protein_g": float(r.protein_g),
+                       "carbs_g": float(r.carbs_g), "fats_g": float(r.fats_g)} for r in food_q}
+    weight_rows = {r.d: float(r.weight_kg) for r in weight_q}
+    vol_rows = {r.d: float(r.volume) for r in vol_q}
+
+    series = []
+    for i in range((end - start).days + 1):
+        d = start + timedelta(days=i)
+        fd = food_rows.get(d, {"calories": 0, "protein_g": 0.0, "carbs_g": 0.0, "fats_g": 0.0})
+        series.append({
+            "date": d.isoformat(),
+            "calories": int(fd["calories"]),
+            "protein_g": float(fd["protein_g"]),
+            "carbs_g": float(fd["carbs_g"]),
+            "fats_g": float(fd["fats_g"]),
+            "weight_kg": weight_rows.get(d),
+            "workout_volume": vol_rows.get(d, 0.0),
+        })
+
+    totals = {"calories": sum(s["calories"] for s in series),
+              "protein_g": sum(s["protein_g"] for s in series),
+              "carbs_g": sum(s["carbs_g"] for s in series),
+              "fats_g": sum(s["fats_g"] for s in series)}
+    avg = {k: (totals[k] / len(series) if series else 0) for k in totals}
+    return {"start": start.isoformat(), "end": end.isoformat(), "series": series, "totals": totals, "average": avg}
+
+
+def synthetic_rows(start: date, days: int, fill: float, rng: random.Random):
+    """Per-day rows shaped like _food_by_day_stmt / _weight_by_day_stmt / _volume_by_day_stmt results."""
+    food, weight, vol = [], [], []
+    kg = 85.0
+    for i in range(days):
+        d = start + timedelta(days=i)
+        kg += rng.uniform(-0.3, 0.25)
+        if rng.random() < fill:
+            food.append(SimpleNamespace(d=d, calories=rng.randint(1400, 2800), protein_g=rng.uniform(60, 180),
+                                        carbs_g=rng.uniform(100, 320), fats_g=rng.uniform(40, 110)))
+        if rng.random() < fill / 2:
+            weight.append(SimpleNamespace(d=d, weight_kg=round(kg, 1)))
+        if rng.random() < 0.4:
+            vol.append(SimpleNamespace(d=d, volume=rng.uniform(2000, 12000)))
+    return food, weight, vol
+
+def timed(fn, runs: int) -> tuple[float, float, int]:
+    """(median build ms, median json.dumps ms, encoded bytes)."""
+    build, encode = [], []
+    size = 0
+    for _ in range(runs):
+        started = perf_counter()
+        payload = fn()
+        built = perf_counter()
+        size = len(json.dumps(payload))
+        build.append((built - started) * 1000.0)
+        encode.append((perf_counter() - built) * 1000.0)
+    return median(build), median(encode), size
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--fill", type=float, default=0.8, help="share of days with food logged")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    header = ("legacy rows", "numpy rows", "numpy columns")
+    print(f"{'days':>6}  " + "  ".join(f"{h:>27}" for h in header))
+    print(f"{'':>6}  " + "  ".join(f"{'build + encode ms, size':>27}" for _ in header))
+    for days in (30, 365, 1825):
+        start = date(2020, 1, 1)
+        end = start + timedelta(days=days - 1)
+        food, weight, vol = synthetic_rows(start, days, args.fill, rng)
+
+        legacy = legacy_build(start, end, food, weight, vol)
+        rows = timeseries.rows_payload(timeseries.dense_columns(start, end, food, weight, vol))
+        assert legacy["series"] == rows["series"], "rows layout differs from the legacy builder"
+
+        results = [
+            timed(lambda: legacy_build(start, end, food, weight, vol), args.runs),
+            timed(lambda: timeseries.rows_payload(timeseries.dense_columns(start, end, food, weight, vol)), args.runs),
+            timed(lambda: timeseries.columns_payload(timeseries.dense_columns(start, end, food, weight, vol)), args.runs),
+        ]
+        cells = [f"{b:6.2f} + {e:6.2f}  {size / 1024:6.1f} KB" for b, e, size in results]
+        print(f"{days:>6}  " + "  ".join(f"{c:>27}" for c in cells))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""GET /api/dashboard/home through the full app, for both read sources and cache backends."""
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.sql_models  # noqa: F401  (registers the tables)
+from app.api import deps
+from app.auth.deps import Principal, get_current_user
+from app.core.database import Base, get_async_db, get_db
+from app.events.bus import InMemoryEventBus, set_event_bus
+from app.main import app
+from app.services import response_cache as rc
+from app.services.user_service import UserService
+
+UID = "u1"
+PROJECTED = {"date": date.today().isoformat(), "calories": {"consumed": 0}}
+
+
+class StubReadModel:
+    def __init__(self, doc):
+        self.doc = doc
+
+    def get_home(self, user_id):
+        return self.doc
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "app.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    set_event_bus(InMemoryEventBus())
+    with SessionLocal() as db:
+        UserService(db).ensure_user_exists(UID, "u1@example.com", "U")
+
+    def _db():
+        with SessionLocal() as db:
+            yield db
+
+    async def _async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_current_user] = lambda: Principal({"uid": UID})
+    app.dependency_overrides[get_db] = _db
+    app.dependency_overrides[get_async_db] = _async_db
+    yield TestClient(app)
+
+    app.dependency_overrides.clear()
+    rc.set_response_cache(None)
+    set_event_bus(None)
+    engine.dispose()
+
+
+def _use(read_model_doc, shared: bool):
+    app.dependency_overrides[deps.get_dashboard_read_model] = lambda: StubReadModel(read_model_doc)
+    backend = rc.RedisBackend(rc.FakeRedis()) if shared else rc.LocalBackend(100)
+    rc.set_response_cache(rc.ResponseCache(backend, 3600))
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_home_from_projection(client, shared):
+    _use(PROJECTED, shared)
+    r = client.get("/api/dashboard/home")
+    assert r.status_code == 200
+    assert r.json() == PROJECTED
+    assert r.headers["X-Read-Source"] == "projection"
+    # the projection may trail other workers' writes: never conditional
+    assert "etag" not in r.headers
+    assert "cache-control" not in r.headers
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_home_from_mysql(client, shared):
+    _use(None, shared)
+    r = client.get("/api/dashboard/home")
+    assert r.status_code == 200
+    assert r.headers["X-Read-Source"] == "mysql"
+    assert "Server-Timing" in r.headers
+    if not shared:
+        assert "etag" not in r.headers
+        return
+    etag = r.headers["etag"]
+    again = client.get("/api/dashboard/home", headers={"If-None-Match": etag})
+    assert again.status_code == 304